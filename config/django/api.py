@@ -0,0 +1,45 @@
+from .prod import *  # noqa
+
+# API-only profile for workers that serve token-authenticated JSON traffic.
+# The admin, sessions, messages, static files and the browsable API are left
+# out, so workers import and initialise less on boot. Run the admin and other
+# HTML pages from a separate process on config.django.prod.
+
+DJANGO_APPS = [
+    "django.contrib.auth",
+    "django.contrib.contenttypes",
+    "django.contrib.postgres",
+]
+
+THIRD_PARTY_APPS = [
+    "rest_framework",
+    "rest_framework.authtoken",
+    # Kept: browser clients on other origins call the API.
+    "corsheaders",
+]
+
+INSTALLED_APPS = [*DJANGO_APPS, *THIRD_PARTY_APPS, *TRAVEL_PROJECT_APPS]  # noqa: F405
+
+MIDDLEWARE = [
+    "travelproject.common.middleware.RequestIdMiddleware",
+    "travelproject.common.middleware.RequestMetricsMiddleware",
+    "travelproject.common.middleware.ProfilingMiddleware",
+    "django.middleware.security.SecurityMiddleware",
+    "corsheaders.middleware.CorsMiddleware",
+    "django.middleware.common.CommonMiddleware",
+]
+
+TEMPLATES[0]["OPTIONS"]["context_processors"] = [  # noqa: F405
+    "django.template.context_processors.debug",
+    "django.template.context_processors.request",
+]
+
+REST_FRAMEWORK = {
+    **REST_FRAMEWORK,  # noqa: F405
+    "DEFAULT_FILTER_BACKENDS": [],
+    "DEFAULT_RENDERER_CLASSES": ["travelproject.common.renderers.FastJSONRenderer"],
+    "DEFAULT_AUTHENTICATION_CLASSES": [
+        "travelproject.common.authentication.SignedTokenAuthentication",
+        "travelproject.common.authentication.CachedTokenAuthentication",
+    ],
+}
@@ -35,6 +35,7 @@ DJANGO_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
 ]
 
 THIRD_PARTY_APPS = [
@@ -45,12 +46,17 @@ THIRD_PARTY_APPS = [
 ]
 
 TRAVEL_PROJECT_APPS = [
+    "travelproject.common.apps.CommonConfig",
     "travelproject.users.apps.UsersConfig",
+    "travelproject.emails.apps.EmailsConfig",
 ]
 
 INSTALLED_APPS = [*DJANGO_APPS, *THIRD_PARTY_APPS, *TRAVEL_PROJECT_APPS]
 
 MIDDLEWARE = [
+    "travelproject.common.middleware.RequestIdMiddleware",
+    "travelproject.common.middleware.RequestMetricsMiddleware",
+    "travelproject.common.middleware.ProfilingMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "corsheaders.middleware.CorsMiddleware",
@@ -63,6 +69,9 @@ MIDDLEWARE = [
 
 ROOT_URLCONF = "config.urls"
 
+# Recent path resolutions kept by travelproject.common.routing.TrieURLResolver.
+URL_RESOLVE_CACHE_SIZE = env.int("URL_RESOLVE_CACHE_SIZE", default=1024)
+
 TEMPLATES = [
     {
         "BACKEND": "django.template.backends.django.DjangoTemplates",
@@ -88,7 +97,42 @@ WSGI_APPLICATION = "config.wsgi.application"
 DATABASES = {
     "default": env.db("DATABASE_URL", default="postgres:///postgres"),
 }
-DATABASES["default"]["ATOMIC_REQUESTS"] = True
+DATABASES["default"]["CONN_MAX_AGE"] = env.int("DATABASE_CONN_MAX_AGE", default=60)
+
+# Requests run in autocommit; mutating APIs opt into a transaction with
+# travelproject.common.transactions.AtomicMutationsMixin.
+
+# Read replicas. Only reads explicitly opted into with
+# travelproject.common.db.routers.replica_reads are sent to them.
+DATABASE_REPLICAS = []
+
+for index, url in enumerate(env.list("DATABASE_REPLICA_URLS", default=[])):
+    alias = f"replica_{index}"
+
+    DATABASES[alias] = {
+        **env.db_url_config(url),
+        "CONN_MAX_AGE": DATABASES["default"]["CONN_MAX_AGE"],
+        "TEST": {"MIRROR": "default"},
+    }
+    DATABASE_REPLICAS.append(alias)
+
+DATABASE_ROUTERS = ["travelproject.common.db.routers.ReplicaRouter"]
+DATABASE_REPLICA_PIN_SECONDS = env.int("DATABASE_REPLICA_PIN_SECONDS", default=5)
+DATABASE_REPLICA_RETRY_AFTER = env.int("DATABASE_REPLICA_RETRY_AFTER", default=30)
+
+# In-process connection pool. Connections go back to the pool at the end of
+# every request, so persistent connections are turned off when it is used.
+if env.bool("DATABASE_POOL", default=False):
+    for database in DATABASES.values():
+        database["ENGINE"] = "travelproject.common.db"
+        database["CONN_MAX_AGE"] = 0
+        database["POOL"] = {
+            "MAX_SIZE": env.int("DATABASE_POOL_MAX_SIZE", default=10),
+            "TIMEOUT": env.float("DATABASE_POOL_TIMEOUT", default=5.0),
+            "HEALTH_CHECK_AFTER": env.float(
+                "DATABASE_POOL_HEALTH_CHECK_AFTER", default=30.0
+            ),
+        }
 
 
 # Password validation
@@ -109,6 +153,9 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+PASSWORD_HASHING_EXECUTOR = env.str("PASSWORD_HASHING_EXECUTOR", default="thread")
+PASSWORD_HASHING_WORKERS = env.int("PASSWORD_HASHING_WORKERS", default=4)
+
 
 # Internationalization
 # https://docs.djangoproject.com/en/3.1/topics/i18n/
@@ -124,30 +171,32 @@ USE_TZ = True
 LOGGING = {
     "version": 1,
     "disable_existing_loggers": False,
+    "formatters": {
+        "json": {
+            "()": "travelproject.common.log.JSONFormatter",
+        },
+        "simple": {
+            "format": "%(levelname)s %(asctime)s [%(request_id)s] %(name)s.%(funcName)s:%(lineno)s- %(message)s",
+        },
+    },
     "handlers": {
+        # Records are queued on the request thread and formatted and written
+        # by a background listener; see travelproject.common.log.
         "console": {
-            "class": "logging.StreamHandler",
+            "class": "travelproject.common.log.QueueLogHandler",
+            "formatter": env.str("LOG_FORMAT", default="json"),
+            "queue_size": env.int("LOG_QUEUE_SIZE", default=10000),
         },
     },
     "root": {
         "handlers": ["console"],
         "level": "INFO",
-        "formatters": {
-            "simple": {
-                "format": "%(levelname)s %(asctime)s %(name)s.%(funcName)s:%(lineno)s- %(message)s\n"
-            },
-        },
     },
     "loggers": {
         "django": {
             "handlers": ["console"],
             "level": "INFO",
             "propagate": False,
-            "formatters": {
-                "simple": {
-                    "format": "%(levelname)s %(asctime)s %(name)s.%(funcName)s:%(lineno)s- %(message)s\n"
-                },
-            },
         },
     },
 }
@@ -168,21 +217,136 @@ AUTH_USER_MODEL = "users.User"
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 # SMTP Mail service with decouple
-# EMAIL_BACKEND = "django.core.mail.backends.smtp.EmailBackend"
-# EMAIL_HOST = env.str("EMAIL_HOST", default="localhost")
-# EMAIL_USE_TLS = env.bool("EMAIL_USE_TLS", default=False)
-# EMAIL_PORT = env.int("EMAIL_PORT", default=1024)
-# EMAIL_HOST_USER = env.str("EMAIL_HOST_USER", default="travel_project")
-# EMAIL_HOST_PASSWORD = env.str("EMAIL_HOST_PASSWORD", default="1234")
+EMAIL_BACKEND = env.str(
+    "EMAIL_BACKEND", default="django.core.mail.backends.console.EmailBackend"
+)
+EMAIL_HOST = env.str("EMAIL_HOST", default="localhost")
+EMAIL_USE_TLS = env.bool("EMAIL_USE_TLS", default=False)
+EMAIL_PORT = env.int("EMAIL_PORT", default=1024)
+EMAIL_HOST_USER = env.str("EMAIL_HOST_USER", default="travel_project")
+EMAIL_HOST_PASSWORD = env.str("EMAIL_HOST_PASSWORD", default="1234")
+DEFAULT_FROM_EMAIL = env.str("DEFAULT_FROM_EMAIL", default="webmaster@localhost")
+
+# Outbox worker (manage.py emails_send). Failed sends are retried after
+# EMAIL_OUTBOX_RETRY_DELAY seconds, doubling on every attempt.
+EMAIL_OUTBOX_BATCH_SIZE = env.int("EMAIL_OUTBOX_BATCH_SIZE", default=100)
+EMAIL_OUTBOX_POLL_INTERVAL = env.float("EMAIL_OUTBOX_POLL_INTERVAL", default=5)
+EMAIL_OUTBOX_MAX_ATTEMPTS = env.int("EMAIL_OUTBOX_MAX_ATTEMPTS", default=5)
+EMAIL_OUTBOX_RETRY_DELAY = env.int("EMAIL_OUTBOX_RETRY_DELAY", default=60)
+EMAIL_OUTBOX_CLAIM_TIMEOUT = env.int("EMAIL_OUTBOX_CLAIM_TIMEOUT", default=300)
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    "tokens": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "tokens",
+        "OPTIONS": {
+            "MAX_ENTRIES": env.int("AUTH_TOKEN_CACHE_MAX_ENTRIES", default=10000)
+        },
+    },
+}
+
+AUTH_TOKEN_CACHE_ALIAS = "tokens"
+AUTH_TOKEN_CACHE_TIMEOUT = env.int("AUTH_TOKEN_CACHE_TIMEOUT", default=300)
+
+# Lifetimes in seconds of the tokens issued by users:user_login. Access tokens
+# are checked against SECRET_KEY and the cached user's token_version only, so
+# keep them short; refresh tokens are stored and single use.
+ACCESS_TOKEN_LIFETIME = env.int("ACCESS_TOKEN_LIFETIME", default=300)
+REFRESH_TOKEN_LIFETIME = env.int("REFRESH_TOKEN_LIFETIME", default=60 * 60 * 24 * 30)
+
+# Page linked from the signup email; it POSTs its ?token= to
+# /api/users/activate/, which activates the account.
+USER_ACTIVATION_URL = env.str(
+    "USER_ACTIVATION_URL", default="http://localhost:8000/activate/"
+)
+USER_ACTIVATION_TOKEN_LIFETIME = env.int(
+    "USER_ACTIVATION_TOKEN_LIFETIME", default=60 * 60 * 24 * 3
+)
+
+USER_PAYLOAD_CACHE_TIMEOUT = env.int("USER_PAYLOAD_CACHE_TIMEOUT", default=600)
+
+USER_BULK_CREATE_BATCH_SIZE = env.int("USER_BULK_CREATE_BATCH_SIZE", default=1000)
+USER_BULK_CREATE_WORKERS = env.int("USER_BULK_CREATE_WORKERS", default=None)
+# At ~0.15s of CPU per password hash, what the shared hashing pool gets
+# through well within gunicorn's 30s timeout.
+USER_BULK_CREATE_API_MAX_ROWS = env.int("USER_BULK_CREATE_API_MAX_ROWS", default=100)
+
+# Admin changelists show the planner's row estimate above this many rows.
+ADMIN_ESTIMATED_COUNT_THRESHOLD = env.int(
+    "ADMIN_ESTIMATED_COUNT_THRESHOLD", default=10000
+)
+
+SERVER_TIMING_HEADER = env.bool("SERVER_TIMING_HEADER", default=True)
+
+# Sampling profiler (travelproject.common.middleware.ProfilingMiddleware).
+# One request in PROFILING_SAMPLE_RATE (0 to disable) is profiled, plus those
+# sending "X-Profile: <PROFILING_TOKEN>" when a token is set. Samples are
+# taken every PROFILING_INTERVAL seconds; pure Python code only yields the
+# GIL to the sampler every sys.getswitchinterval() (5ms).
+PROFILING_ENABLED = env.bool("PROFILING_ENABLED", default=False)
+PROFILING_SAMPLE_RATE = env.int("PROFILING_SAMPLE_RATE", default=100)
+PROFILING_TOKEN = env.str("PROFILING_TOKEN", default="")
+PROFILING_INTERVAL = env.float("PROFILING_INTERVAL", default=0.005)
+PROFILING_DIR = env.str("PROFILING_DIR", default=os.path.join(BASE_DIR, "profiles"))
+PROFILING_TOP = env.int("PROFILING_TOP", default=25)
+
+# Max SQL queries per request, keyed by URL name. Counts cover cold caches.
+QUERY_BUDGETS = {
+    "users:user_create": 6,
+    "users:user_me": 1,
+    "users:user_detail": 2,
+    "users:user_list": 3,
+    "users:user_search": 4,
+    # The export streams its rows after the response is returned; this only
+    # covers authentication.
+    "users:user_export": 1,
+    "users:user_update": 5,
+    "users:user_delete": 5,
+    "users:user_change_passord": 5,
+    "users:user_login": 5,
+    "users:user_token_refresh": 5,
+    "users:user_activate": 4,
+}
 
 REST_FRAMEWORK = {
     "DEFAULT_FILTER_BACKENDS": ["django_filters.rest_framework.DjangoFilterBackend"],
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.LimitOffsetPagination",
     "PAGE_SIZE": 10,
+    "DEFAULT_RENDERER_CLASSES": [
+        "travelproject.common.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework.authentication.TokenAuthentication",
+        "travelproject.common.authentication.SignedTokenAuthentication",
+        "travelproject.common.authentication.CachedTokenAuthentication",
         "rest_framework.authentication.SessionAuthentication",
     ],
+    # Scopes for travelproject.common.throttling.ScopedSlidingWindowThrottle.
+    # The throttled views hash a password on every request.
+    "DEFAULT_THROTTLE_RATES": {
+        "user_create": env.str("THROTTLE_RATE_USER_CREATE", default="20/hour"),
+        "user_change_password": env.str(
+            "THROTTLE_RATE_USER_CHANGE_PASSWORD", default="5/min"
+        ),
+        "login": env.str("THROTTLE_RATE_LOGIN", default="10/min"),
+    },
+    # Reverse proxies in front of the app, used to read the client IP from
+    # X-Forwarded-For. With none the socket address is used, since clients
+    # can send any X-Forwarded-For they like.
+    "NUM_PROXIES": env.int("NUM_PROXIES", default=0),
 }
 
+# Counters need atomic incr shared by all workers, i.e. Redis in production.
+THROTTLE_CACHE_ALIAS = "default"
+
+# Responses kept for Idempotency-Key retries (travelproject.common.idempotency).
+# Like the throttle counters, keys are claimed with an atomic add.
+IDEMPOTENCY_CACHE_ALIAS = "default"
+IDEMPOTENCY_KEY_TTL = env.int("IDEMPOTENCY_KEY_TTL", default=60 * 60 * 24)
+# How long a key stays claimed by a request that is still running.
+IDEMPOTENCY_LOCK_TIMEOUT = env.int("IDEMPOTENCY_LOCK_TIMEOUT", default=60)
+
 from config.settings.cors import *  # noqa
@@ -5,3 +5,22 @@ from config.env import env
 DEBUG = False
 
 SECRET_KEY = env("SECRET_KEY")
+
+EMAIL_BACKEND = env.str(
+    "EMAIL_BACKEND", default="django.core.mail.backends.smtp.EmailBackend"
+)
+
+REDIS_URL = env("REDIS_URL", default=None)
+
+if REDIS_URL:
+    # Shared across workers, so payload versions and replica pins are
+    # consistent for every process.
+    CACHES["default"] = {  # noqa: F405
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": REDIS_URL,
+    }
+    CACHES["tokens"] = {  # noqa: F405
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": REDIS_URL,
+        "KEY_PREFIX": "tokens",
+    }
@@ -2,8 +2,14 @@ from .base import *  # noqa
 
 DEBUG = False
 
+EMAIL_BACKEND = "django.core.mail.backends.locmem.EmailBackend"
+
 CACHES = {
     "default": {
         "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
-    }
+    },
+    "tokens": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "tokens",
+    },
 }
@@ -0,0 +1,27 @@
+"""
+gunicorn settings: ``gunicorn -c config/gunicorn.py config.wsgi:application``.
+
+With GUNICORN_PRELOAD (the default) the application is imported and warmed
+up once in the master and shared with every forked worker, instead of each
+worker repeating the work on boot or on its first request.
+"""
+
+import os
+
+preload_app = os.environ.get("GUNICORN_PRELOAD", "1") == "1"
+
+
+def _warmup():
+    from travelproject.common.warmup import warmup
+
+    warmup()
+
+
+def when_ready(server):
+    if server.cfg.preload_app:
+        _warmup()
+
+
+def post_worker_init(worker):
+    if not worker.cfg.preload_app:
+        _warmup()
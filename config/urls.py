@@ -13,20 +13,31 @@ Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
-from django.contrib import admin
+from django.apps import apps
 from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
 
 from rest_framework import permissions
 
+from travelproject.common.routing import trie_path
 
-api_urls = [path("users/", include("travelproject.users.urls"))]
+
+api_urls = [
+    path("users/", include("travelproject.users.urls")),
+    path("async/users/", include("travelproject.users.async_urls")),
+    path("internal/", include("travelproject.common.urls")),
+]
 
 urlpatterns = [
-    path("admin/", admin.site.urls),
-    path("api/", include(api_urls)),
+    trie_path("api/", include(api_urls)),
 ] + static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)
 
+# Not installed in the API-only settings profile (config.django.api).
+if apps.is_installed("django.contrib.admin"):
+    from django.contrib import admin
+
+    urlpatterns += [path("admin/", admin.site.urls)]
+
 if settings.DEBUG:
     urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
@@ -0,0 +1,29 @@
+import pytest
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from travelproject.users.tests.factories import UserFactory
+
+pytest_plugins = ["travelproject.common.testing"]
+
+
+@pytest.fixture
+def api_client():
+    return APIClient()
+
+
+@pytest.fixture
+def user(db):
+    return UserFactory()
+
+
+@pytest.fixture
+def user_client(api_client, user):
+    """
+    An ``APIClient`` authenticated with a DRF token of the ``user`` fixture,
+    which test modules override to pick the user.
+    """
+    token = Token.objects.create(user=user)
+    api_client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+
+    return api_client
@@ -0,0 +1,86 @@
+import csv
+from itertools import chain
+from typing import Optional, Sequence
+
+from django.conf import settings
+from django.contrib import admin
+from django.core.paginator import Paginator
+from django.db import connections
+from django.http import StreamingHttpResponse
+from django.utils.functional import cached_property
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator for admin changelists of large PostgreSQL tables. Instead of an
+    exact ``COUNT(*)`` it uses the planner's estimate: ``pg_class.reltuples``
+    for the whole table, otherwise the row estimate of the filtered query.
+
+    Below ADMIN_ESTIMATED_COUNT_THRESHOLD rows the estimate is too coarse and
+    cheap to replace, so the exact count is used.
+    """
+
+    @cached_property
+    def count(self) -> int:
+        estimate = self.estimate()
+
+        if estimate is None or estimate < settings.ADMIN_ESTIMATED_COUNT_THRESHOLD:
+            return super().count
+
+        return estimate
+
+    def estimate(self) -> Optional[int]:
+        queryset = self.object_list
+        connection = connections[queryset.db]
+
+        if connection.vendor != "postgresql":
+            return None
+
+        with connection.cursor() as cursor:
+            if not queryset.query.where:
+                cursor.execute(
+                    "SELECT reltuples FROM pg_class WHERE oid = %s::regclass",
+                    [queryset.model._meta.db_table],
+                )
+                row = cursor.fetchone()
+
+                # -1 until the table has been vacuumed or analyzed.
+                return int(row[0]) if row and row[0] >= 0 else None
+
+            sql, params = queryset.query.sql_with_params()
+            cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+            # psycopg2 decodes the json column.
+            plan = cursor.fetchone()[0]
+
+        return int(plan[0]["Plan"]["Plan Rows"])
+
+
+class Echo:
+    """
+    File-like object whose ``write`` hands the value back, so ``csv.writer``
+    can produce rows for a streaming response.
+    """
+
+    def write(self, value: str) -> str:
+        return value
+
+
+def csv_export_action(*, fields: Sequence[str], filename: str, chunk_size: int = 2000):
+    """
+    Admin action streaming the selected rows as CSV. Rows are read with
+    ``.iterator()`` (a server-side cursor on PostgreSQL), so memory use stays
+    flat however many rows are exported.
+    """
+
+    @admin.action(description="Export selected as CSV")
+    def export_as_csv(modeladmin, request, queryset):
+        writer = csv.writer(Echo())
+        rows = queryset.values_list(*fields).iterator(chunk_size=chunk_size)
+        lines = chain([writer.writerow(fields)], map(writer.writerow, rows))
+
+        response = StreamingHttpResponse(lines, content_type="text/csv")
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+
+        return response
+
+    return export_as_csv
@@ -0,0 +1,23 @@
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from travelproject.common.db.base import pool_stats
+from travelproject.common.metrics import metrics_render_prometheus
+from travelproject.common.permissions import IsSuperUser
+from travelproject.common.renderers import PrometheusRenderer
+
+
+class DatabasePoolStatsApi(APIView):
+    permission_classes = [IsAuthenticated, IsSuperUser]
+
+    def get(self, request, *args, **kwargs):
+        return Response(pool_stats())
+
+
+class MetricsApi(APIView):
+    permission_classes = [IsAuthenticated, IsSuperUser]
+    renderer_classes = [PrometheusRenderer]
+
+    def get(self, request, *args, **kwargs):
+        return Response(metrics_render_prometheus())
@@ -0,0 +1,8 @@
+from django.apps import AppConfig
+
+
+class CommonConfig(AppConfig):
+    name = "travelproject.common"
+
+    def ready(self):
+        from travelproject.common import signals  # noqa: F401
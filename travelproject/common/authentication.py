@@ -0,0 +1,296 @@
+from typing import Any, Dict
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core import signing
+from django.core.cache import caches
+from django.db import transaction
+from rest_framework.authentication import (
+    BaseAuthentication,
+    TokenAuthentication,
+    get_authorization_header,
+)
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.authtoken.models import Token
+
+from travelproject.common.db.routers import replica_pinned, replica_reads
+
+
+def token_cache_key(key: str) -> str:
+    # v2: entries hold a user projection instead of a pickled Token.
+    # v3: along with the database it was read from.
+    return f"auth:token:v3:{key}"
+
+
+def access_user_cache_key(user_id: int) -> str:
+    # v2: entries hold the database the user was read from.
+    return f"auth:user:v2:{user_id}"
+
+
+ACCESS_TOKEN_SALT = "travelproject.common.authentication.access"
+
+
+def access_token_issue(*, user) -> str:
+    return signing.dumps(
+        {"u": user.pk, "v": user.token_version}, salt=ACCESS_TOKEN_SALT
+    )
+
+
+def access_token_verify(token: str) -> Dict[str, Any]:
+    try:
+        return signing.loads(
+            token, salt=ACCESS_TOKEN_SALT, max_age=settings.ACCESS_TOKEN_LIFETIME
+        )
+    except signing.SignatureExpired:
+        raise AuthenticationFailed("Access token expired.")
+    except signing.BadSignature:
+        raise AuthenticationFailed("Invalid access token.")
+
+
+# Left out of cached users, so password hashes never reach the cache. Code
+# that needs it (user_check_password) loads it from the primary on access.
+USER_CACHE_EXCLUDE = ("password",)
+
+
+def user_cache_dump(user) -> Dict[str, Any]:
+    # The source database is kept, so code caching data derived from the
+    # user can still tell a replica read, which may be stale, from the
+    # primary's.
+    return {
+        "db": user._state.db,
+        "values": {
+            field.attname: getattr(user, field.attname)
+            for field in user._meta.concrete_fields
+            if field.attname not in USER_CACHE_EXCLUDE
+        },
+    }
+
+
+def user_cache_load(cached: Dict[str, Any]):
+    """
+    The user from ``user_cache_dump``, with the excluded columns deferred,
+    as read from its source database.
+    """
+    model = get_user_model()
+    values = cached["values"]
+    fields = [
+        field.attname
+        for field in model._meta.concrete_fields
+        if field.attname in values
+    ]
+
+    return model.from_db(cached["db"], fields, [values[field] for field in fields])
+
+
+def token_cache_invalidate(*, user) -> None:
+    keys = Token.objects.filter(user_id=user.pk).values_list("key", flat=True)
+    cache_keys = [token_cache_key(key) for key in keys]
+
+    if not cache_keys:
+        return
+
+    # Drop the entries once the change is visible to other requests,
+    # otherwise a concurrent request could re-cache the stale user.
+    transaction.on_commit(
+        lambda: caches[settings.AUTH_TOKEN_CACHE_ALIAS].delete_many(cache_keys)
+    )
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    ``TokenAuthentication`` that keeps resolved tokens (their user, without
+    the password hash) in the ``AUTH_TOKEN_CACHE_ALIAS`` cache, so a warm
+    token costs no queries.
+
+    Entries expire after ``AUTH_TOKEN_CACHE_TIMEOUT`` seconds and are dropped
+    explicitly by ``token_cache_invalidate`` whenever the user changes, and
+    by the ``Token`` post_delete receiver when the token is deleted.
+    """
+
+    def authenticate_credentials(self, key):
+        cache = caches[settings.AUTH_TOKEN_CACHE_ALIAS]
+        cache_key = token_cache_key(key)
+
+        cached = cache.get(cache_key)
+
+        if cached is None:
+            user, token = self.authenticate_credentials_from_replica(key)
+            cache.set(
+                cache_key, user_cache_dump(user), settings.AUTH_TOKEN_CACHE_TIMEOUT
+            )
+
+            return user, token
+
+        user = user_cache_load(cached)
+
+        if not user.is_active:
+            raise AuthenticationFailed("User inactive or deleted.")
+
+        return user, Token(key=key, user=user)
+
+    def authenticate_credentials_from_replica(self, key):
+        if not settings.DATABASE_REPLICAS:
+            return super().authenticate_credentials(key)
+
+        try:
+            with replica_reads():
+                user, token = super().authenticate_credentials(key)
+        except AuthenticationFailed:
+            # The token may be too new to have reached the replica yet.
+            pass
+        else:
+            # The replica may also still hold a token the user just revoked.
+            if not replica_pinned(user_id=user.pk):
+                return user, token
+
+        with replica_reads(False):
+            return super().authenticate_credentials(key)
+
+
+class SignedTokenAuthentication(BaseAuthentication):
+    """
+    ``Authorization: Bearer <access token>`` with HMAC-signed access tokens
+    from ``access_token_issue``. The signature and expiry are checked in
+    process with SECRET_KEY; the user comes from the ``AUTH_TOKEN_CACHE_ALIAS``
+    cache, so a warm request costs no queries.
+
+    A token is revoked when the user's ``token_version`` moves past the one
+    it was issued with.
+    """
+
+    keyword = "Bearer"
+
+    def authenticate(self, request):
+        auth = get_authorization_header(request).split()
+
+        if not auth or auth[0].lower() != self.keyword.lower().encode():
+            return None
+
+        if len(auth) != 2:
+            raise AuthenticationFailed("Invalid token header.")
+
+        try:
+            token = auth[1].decode()
+        except UnicodeError:
+            raise AuthenticationFailed("Invalid token header.")
+
+        payload = access_token_verify(token)
+
+        return self.authenticate_payload(payload), payload
+
+    def authenticate_payload(self, payload: Dict[str, Any]):
+        cache = caches[settings.AUTH_TOKEN_CACHE_ALIAS]
+        cache_key = access_user_cache_key(payload["u"])
+
+        cached = cache.get(cache_key)
+
+        if cached is not None:
+            user = user_cache_load(cached)
+
+            # A token issued right after a version bump can arrive before the
+            # bump's invalidation has run; only a newer version revokes it.
+            if user.token_version >= payload["v"]:
+                return self.check_user(user, payload=payload)
+
+            cache.delete(cache_key)
+
+        user = self.get_user(user_id=payload["u"], version=payload["v"])
+        cache.set(cache_key, user_cache_dump(user), settings.AUTH_TOKEN_CACHE_TIMEOUT)
+
+        return self.check_user(user, payload=payload)
+
+    @staticmethod
+    def check_user(user, *, payload: Dict[str, Any]):
+        if user.token_version != payload["v"] or not user.is_active:
+            raise AuthenticationFailed("Access token revoked.")
+
+        return user
+
+    def get_user(self, *, user_id: int, version: int):
+        users = get_user_model().objects
+
+        if settings.DATABASE_REPLICAS and not replica_pinned(user_id=user_id):
+            with replica_reads():
+                user = users.filter(pk=user_id).first()
+
+            # A lagging replica may not have the user or its latest version.
+            if user is not None and user.token_version == version:
+                return user
+
+        with replica_reads(False):
+            user = users.filter(pk=user_id).first()
+
+        if user is None:
+            raise AuthenticationFailed("User inactive or deleted.")
+
+        return user
+
+    def authenticate_header(self, request):
+        return self.keyword
+
+
+async def _authenticate_signed_async(token: str):
+    try:
+        payload = access_token_verify(token)
+    except AuthenticationFailed:
+        return None
+
+    cached = await caches[settings.AUTH_TOKEN_CACHE_ALIAS].aget(
+        access_user_cache_key(payload["u"])
+    )
+
+    if cached is not None:
+        user = user_cache_load(cached)
+
+        # An older cached version is reloaded by authenticate_payload.
+        if user.token_version >= payload["v"]:
+            try:
+                return SignedTokenAuthentication.check_user(user, payload=payload)
+            except AuthenticationFailed:
+                return None
+
+    authenticate_payload = SignedTokenAuthentication().authenticate_payload
+
+    try:
+        return await sync_to_async(authenticate_payload)(payload)
+    except AuthenticationFailed:
+        return None
+
+
+async def authenticate_async(request):
+    """
+    Signed access token and token authentication for plain async Django
+    views, which can't go through DRF's sync authentication pipeline.
+    """
+    auth = get_authorization_header(request).split()
+
+    if len(auth) != 2:
+        return None
+
+    try:
+        key = auth[1].decode()
+    except UnicodeError:
+        return None
+
+    if auth[0].lower() == SignedTokenAuthentication.keyword.lower().encode():
+        return await _authenticate_signed_async(key)
+
+    if auth[0].lower() != CachedTokenAuthentication.keyword.lower().encode():
+        return None
+
+    cached = await caches[settings.AUTH_TOKEN_CACHE_ALIAS].aget(token_cache_key(key))
+
+    if cached is not None:
+        user = user_cache_load(cached)
+
+        return user if user.is_active else None
+
+    authenticate_credentials = CachedTokenAuthentication().authenticate_credentials
+
+    try:
+        user, _ = await sync_to_async(authenticate_credentials)(key)
+    except AuthenticationFailed:
+        return None
+
+    return user
@@ -0,0 +1,82 @@
+import threading
+from typing import Any, Dict
+
+import psycopg2
+from django.db.backends.postgresql.base import (
+    DatabaseWrapper as PostgresDatabaseWrapper,
+)
+from psycopg2.extensions import STATUS_READY
+
+from travelproject.common.db.pool import ConnectionPool
+
+# PostgreSQL backend that hands out connections from a process-wide pool
+# instead of opening a new one per request. Enable it with
+# ENGINE = "travelproject.common.db" and tune it through the "POOL" key of
+# the database settings.
+
+_pools: Dict[str, ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def pool_stats() -> Dict[str, Dict[str, Any]]:
+    return {alias: pool.stats() for alias, pool in list(_pools.items())}
+
+
+def _is_usable(connection) -> bool:
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1")
+    except psycopg2.Error:
+        return False
+
+    return True
+
+
+class DatabaseWrapper(PostgresDatabaseWrapper):
+    def get_pool(self, conn_params) -> ConnectionPool:
+        pool = _pools.get(self.alias)
+        if pool is not None:
+            return pool
+
+        with _pools_lock:
+            if self.alias not in _pools:
+                options = self.settings_dict.get("POOL", {})
+
+                _pools[self.alias] = ConnectionPool(
+                    connect=lambda: super(DatabaseWrapper, self).get_new_connection(
+                        conn_params
+                    ),
+                    is_usable=_is_usable,
+                    max_size=options.get("MAX_SIZE", 10),
+                    timeout=options.get("TIMEOUT", 5.0),
+                    health_check_after=options.get("HEALTH_CHECK_AFTER", 30.0),
+                )
+
+        return _pools[self.alias]
+
+    def get_new_connection(self, conn_params):
+        connection = self.get_pool(conn_params).getconn()
+
+        # Mirrors the parent: isolation_level must be known before Django
+        # toggles autocommit on the connection.
+        options = self.settings_dict["OPTIONS"]
+        self.isolation_level = options.get(
+            "isolation_level", connection.isolation_level
+        )
+
+        return connection
+
+    def _close(self):
+        if self.connection is None:
+            return
+
+        connection = self.connection
+        discard = bool(connection.closed)
+
+        if not discard and connection.status != STATUS_READY:
+            try:
+                connection.rollback()
+            except psycopg2.Error:
+                discard = True
+
+        _pools[self.alias].putconn(connection, discard=discard)
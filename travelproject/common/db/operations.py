@@ -0,0 +1,26 @@
+from django.contrib.postgres import operations
+from django.db.migrations import AddIndex
+
+# Builds the index without locking writes to the table on PostgreSQL. Other
+# databases, such as SQLite in local test runs, get a plain AddIndex.
+# Migrations using it need atomic = False.
+
+
+class AddIndexConcurrently(operations.AddIndexConcurrently):
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor != "postgresql":
+            return AddIndex.database_forwards(
+                self, app_label, schema_editor, from_state, to_state
+            )
+
+        return super().database_forwards(app_label, schema_editor, from_state, to_state)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor != "postgresql":
+            return AddIndex.database_backwards(
+                self, app_label, schema_editor, from_state, to_state
+            )
+
+        return super().database_backwards(
+            app_label, schema_editor, from_state, to_state
+        )
@@ -0,0 +1,171 @@
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Tuple
+
+
+class PoolTimeout(Exception):
+    pass
+
+
+class ConnectionPool:
+    """
+    Thread-safe pool of DB-API connections.
+
+    Idle connections are reused LIFO so the pool shrinks naturally under low
+    traffic. A connection idle for longer than ``health_check_after`` seconds
+    is pinged with ``is_usable`` before being handed out.
+
+    A forked child starts with an empty pool. The connections it inherited
+    share their sockets with the parent, so they are kept open but never
+    used, nor closed, which would end the parent's sessions.
+    """
+
+    def __init__(
+        self,
+        *,
+        connect: Callable[[], Any],
+        is_usable: Callable[[Any], bool],
+        max_size: int,
+        timeout: float,
+        health_check_after: float,
+    ):
+        self._connect = connect
+        self._is_usable = is_usable
+        self.max_size = max_size
+        self.timeout = timeout
+        self.health_check_after = health_check_after
+
+        self._idle: Deque[Tuple[Any, float]] = deque()
+        self._in_use: Dict[int, Any] = {}
+        self._inherited: List[Any] = []
+        self._size = 0
+        self._condition = threading.Condition()
+        self._pid = os.getpid()
+
+        self._checked_out = 0
+        self._connects = 0
+        self._discarded = 0
+        self._timeouts = 0
+        self._waits = 0
+        self._wait_time = 0.0
+
+    def getconn(self) -> Any:
+        self._check_fork()
+
+        started = time.monotonic()
+        connection, last_used = None, 0.0
+
+        with self._condition:
+            while True:
+                if self._idle:
+                    connection, last_used = self._idle.pop()
+                    break
+
+                if self._size < self.max_size:
+                    self._size += 1
+                    break
+
+                remaining = self.timeout - (time.monotonic() - started)
+                if remaining <= 0:
+                    self._timeouts += 1
+                    raise PoolTimeout(
+                        f"No database connection available after {self.timeout}s."
+                    )
+
+                self._condition.wait(remaining)
+
+            waited = time.monotonic() - started
+            if waited > 0.001:
+                self._waits += 1
+                self._wait_time += waited
+
+            self._checked_out += 1
+
+        if connection is not None:
+            idle_for = time.monotonic() - last_used
+
+            if idle_for > self.health_check_after and not self._is_usable(connection):
+                self._close(connection)
+                connection = None
+
+        if connection is None:
+            try:
+                connection = self._connect()
+            except Exception:
+                self._release_slot()
+                raise
+
+            with self._condition:
+                self._connects += 1
+
+        with self._condition:
+            self._in_use[id(connection)] = connection
+
+        return connection
+
+    def putconn(self, connection: Any, *, discard: bool = False) -> None:
+        self._check_fork()
+
+        with self._condition:
+            if self._in_use.pop(id(connection), None) is None:
+                # Checked out before a fork, by the parent process.
+                self._inherited.append(connection)
+                return
+
+        if discard or getattr(connection, "closed", False):
+            self._close(connection)
+            self._release_slot()
+            return
+
+        with self._condition:
+            self._checked_out -= 1
+            self._idle.append((connection, time.monotonic()))
+            self._condition.notify()
+
+    def stats(self) -> Dict[str, Any]:
+        self._check_fork()
+
+        with self._condition:
+            return {
+                "max_size": self.max_size,
+                "size": self._size,
+                "checked_out": self._checked_out,
+                "idle": len(self._idle),
+                "connects": self._connects,
+                "discarded": self._discarded,
+                "timeouts": self._timeouts,
+                "waits": self._waits,
+                "wait_time": self._wait_time,
+            }
+
+    def _check_fork(self) -> None:
+        if self._pid == os.getpid():
+            return
+
+        # Only the forking thread exists in the child, and the condition may
+        # have been held by another thread of the parent, so it is replaced.
+        self._pid = os.getpid()
+        self._condition = threading.Condition()
+        self._inherited.extend(connection for connection, _ in self._idle)
+        self._inherited.extend(self._in_use.values())
+        self._idle.clear()
+        self._in_use.clear()
+        self._size = 0
+        self._checked_out = 0
+
+    def _release_slot(self) -> None:
+        with self._condition:
+            self._size -= 1
+            self._checked_out -= 1
+            self._condition.notify()
+
+    def _close(self, connection: Any) -> None:
+        with self._condition:
+            self._discarded += 1
+
+        try:
+            connection.close()
+        except Exception:
+            pass
@@ -0,0 +1,128 @@
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+from rest_framework.permissions import SAFE_METHODS
+
+_replica_reads: ContextVar[bool] = ContextVar("replica_reads", default=False)
+
+_round_robin = itertools.count()
+_unhealthy: Dict[str, float] = {}
+_unhealthy_lock = threading.Lock()
+
+
+@contextmanager
+def replica_reads(enabled: bool = True):
+    """
+    Lets ``ReplicaRouter`` send the reads evaluated inside the block to a
+    replica. Reads elsewhere stay on the primary.
+    """
+    token = _replica_reads.set(enabled)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+def replica_reads_disable() -> None:
+    _replica_reads.set(False)
+
+
+def replica_pin_key(user_id: int) -> str:
+    return f"replica:pin:{user_id}"
+
+
+def replica_pin(*, user_id: int) -> None:
+    """
+    Sends the user's reads to the primary for ``DATABASE_REPLICA_PIN_SECONDS``
+    so they see their own writes while the replicas catch up.
+    """
+    if settings.DATABASE_REPLICAS:
+        cache.set(replica_pin_key(user_id), True, settings.DATABASE_REPLICA_PIN_SECONDS)
+
+
+def replica_pinned(*, user_id: int) -> bool:
+    if not settings.DATABASE_REPLICAS:
+        return False
+
+    return bool(cache.get(replica_pin_key(user_id)))
+
+
+def _replica_healthy(alias: str) -> bool:
+    with _unhealthy_lock:
+        if _unhealthy.get(alias, 0) > time.monotonic():
+            return False
+
+    try:
+        connections[alias].ensure_connection()
+    except DatabaseError:
+        with _unhealthy_lock:
+            _unhealthy[alias] = time.monotonic() + settings.DATABASE_REPLICA_RETRY_AFTER
+
+        return False
+
+    return True
+
+
+def replica_choose() -> Optional[str]:
+    replicas = settings.DATABASE_REPLICAS
+    if not replicas:
+        return None
+
+    start = next(_round_robin)
+
+    for offset in range(len(replicas)):
+        alias = replicas[(start + offset) % len(replicas)]
+
+        if _replica_healthy(alias):
+            return alias
+
+    return None
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if not _replica_reads.get():
+            return None
+
+        # Reads inside a transaction have to see its own writes.
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return None
+
+        return replica_choose()
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db not in settings.DATABASE_REPLICAS
+
+
+class ReplicaReadsMixin:
+    """
+    Serves safe methods from a replica, unless the requesting user has
+    written recently and is pinned to the primary.
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method not in SAFE_METHODS:
+            return super().dispatch(request, *args, **kwargs)
+
+        with replica_reads():
+            return super().dispatch(request, *args, **kwargs)
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+
+        user = request.user
+        if user.is_authenticated and replica_pinned(user_id=user.pk):
+            replica_reads_disable()
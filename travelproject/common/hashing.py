@@ -0,0 +1,129 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, Optional, Tuple
+
+import django
+from django.conf import settings
+from django.contrib.auth.hashers import check_password, make_password
+
+_executor: Optional[Executor] = None
+_executor_lock = threading.Lock()
+
+_stats: Dict[str, Dict[str, float]] = {}
+_stats_lock = threading.Lock()
+
+
+def get_hashing_executor() -> Executor:
+    """
+    The async variants and bulk imports hash passwords on a dedicated pool
+    selected by ``PASSWORD_HASHING_EXECUTOR``: "thread" (hashlib's PBKDF2
+    releases the GIL) or "process" (for hashers that don't).
+    """
+    global _executor
+
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                workers = settings.PASSWORD_HASHING_WORKERS
+
+                if settings.PASSWORD_HASHING_EXECUTOR == "process":
+                    _executor = ProcessPoolExecutor(
+                        max_workers=workers, initializer=django.setup
+                    )
+                else:
+                    _executor = ThreadPoolExecutor(
+                        max_workers=workers, thread_name_prefix="password-hashing"
+                    )
+
+    return _executor
+
+
+def _algorithm(encoded: str) -> str:
+    return encoded.split("$", 1)[0] if "$" in encoded else "unknown"
+
+
+def _record(algorithm: str, duration: float) -> None:
+    with _stats_lock:
+        stats = _stats.setdefault(algorithm, {"count": 0, "total": 0.0, "max": 0.0})
+        stats["count"] += 1
+        stats["total"] += duration
+        stats["max"] = max(stats["max"], duration)
+
+
+def password_hashing_stats() -> Dict[str, Dict[str, float]]:
+    with _stats_lock:
+        return {algorithm: dict(stats) for algorithm, stats in _stats.items()}
+
+
+# The two functions below run inside the executor, so they have to stay
+# top-level and picklable for the process pool.
+
+
+def _make_password(password: str) -> Tuple[str, float]:
+    started = time.perf_counter()
+    encoded = make_password(password)
+
+    return encoded, time.perf_counter() - started
+
+
+def _check_password(password: str, encoded: str) -> Tuple[bool, bool, float]:
+    must_update = []
+
+    started = time.perf_counter()
+    is_valid = check_password(
+        password, encoded, setter=lambda raw: must_update.append(True)
+    )
+
+    return is_valid, bool(must_update), time.perf_counter() - started
+
+
+def _hash_result(future: Future) -> str:
+    encoded, duration = future.result()
+    _record(_algorithm(encoded), duration)
+
+    return encoded
+
+
+def _verify_result(future: Future, encoded: str) -> Tuple[bool, bool]:
+    is_valid, must_update, duration = future.result()
+    _record(_algorithm(encoded), duration)
+
+    return is_valid, must_update
+
+
+# Sync callers hash on their own thread: they would block on the pool
+# anyway, and handing the work over only adds a round trip.
+
+
+def password_hash(password: str) -> str:
+    encoded, duration = _make_password(password)
+    _record(_algorithm(encoded), duration)
+
+    return encoded
+
+
+def password_verify(password: str, encoded: str) -> Tuple[bool, bool]:
+    """
+    Returns ``(is_valid, must_update)``; ``must_update`` is set when the
+    password is correct but was hashed with outdated hasher parameters.
+    """
+    is_valid, must_update, duration = _check_password(password, encoded)
+    _record(_algorithm(encoded), duration)
+
+    return is_valid, must_update
+
+
+async def password_hash_async(password: str) -> str:
+    future = get_hashing_executor().submit(_make_password, password)
+    await asyncio.wrap_future(future)
+
+    return _hash_result(future)
+
+
+async def password_verify_async(password: str, encoded: str) -> Tuple[bool, bool]:
+    future = get_hashing_executor().submit(_check_password, password, encoded)
+    await asyncio.wrap_future(future)
+
+    return _verify_result(future, encoded)
@@ -0,0 +1,121 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse, JsonResponse
+
+IDEMPOTENCY_KEY_INVALID = "Idempotency-Key must be 1 to 255 characters."
+IDEMPOTENCY_KEY_IN_PROGRESS = "A request with this Idempotency-Key is in progress."
+IDEMPOTENCY_KEY_REUSED = "Idempotency-Key was already used with a different request."
+
+# Outcomes a retry could change, so they are not replayed.
+NOT_STORED_STATUSES = (409, 429)
+
+
+def idempotency_cache_key(path: str, key: str, scope: str) -> str:
+    digest = hashlib.sha256(f"{scope}\n{path}\n{key}".encode()).hexdigest()
+
+    return f"idempotency:{digest}"
+
+
+def idempotency_scope(request) -> str:
+    """
+    Whose keys a request's key is checked against: the session user, else
+    the credentials, else the client address. DRF hasn't authenticated the
+    request yet, so token users are told apart by their Authorization header.
+    """
+    user = getattr(request, "user", None)
+
+    if user is not None and user.is_authenticated:
+        return f"user:{user.pk}"
+
+    authorization = request.headers.get("Authorization")
+
+    if authorization:
+        return f"auth:{hashlib.sha256(authorization.encode()).hexdigest()}"
+
+    return f"addr:{request.META.get('REMOTE_ADDR', '')}"
+
+
+class IdempotencyMixin:
+    """
+    Replays the stored response of an earlier request with the same
+    ``Idempotency-Key`` header from the same client, for
+    IDEMPOTENCY_KEY_TTL seconds, without running the view (nor its
+    throttles) again.
+
+    The key is claimed with an atomic cache ``add`` before the view runs, so
+    a concurrent duplicate gets a 409 instead of running in parallel. The
+    response is stored once rendered, after AtomicMutationsMixin committed.
+    Server errors release the key so the client can retry.
+    """
+
+    idempotency_header = "Idempotency-Key"
+    idempotent_methods = ("POST",)
+
+    def dispatch(self, request, *args, **kwargs):
+        key = request.headers.get(self.idempotency_header)
+
+        if request.method not in self.idempotent_methods or key is None:
+            return super().dispatch(request, *args, **kwargs)
+
+        if not 0 < len(key) <= 255:
+            return JsonResponse({"detail": IDEMPOTENCY_KEY_INVALID}, status=400)
+
+        cache = caches[settings.IDEMPOTENCY_CACHE_ALIAS]
+        cache_key = idempotency_cache_key(request.path, key, idempotency_scope(request))
+        fingerprint = hashlib.sha256(request.body).hexdigest()
+
+        claimed = cache.add(
+            cache_key,
+            {"fingerprint": fingerprint, "response": None},
+            settings.IDEMPOTENCY_LOCK_TIMEOUT,
+        )
+
+        if not claimed:
+            return self.idempotent_replay(cache.get(cache_key), fingerprint)
+
+        try:
+            response = super().dispatch(request, *args, **kwargs)
+        except Exception:
+            cache.delete(cache_key)
+            raise
+
+        def store(response):
+            status_code = response.status_code
+
+            if status_code >= 500 or status_code in NOT_STORED_STATUSES:
+                cache.delete(cache_key)
+                return
+
+            stored = {
+                "fingerprint": fingerprint,
+                "response": (
+                    status_code,
+                    response["Content-Type"],
+                    response.content,
+                ),
+            }
+            cache.set(cache_key, stored, settings.IDEMPOTENCY_KEY_TTL)
+
+        if hasattr(response, "add_post_render_callback"):
+            response.add_post_render_callback(store)
+        else:
+            store(response)
+
+        return response
+
+    def idempotent_replay(self, stored, fingerprint: str) -> HttpResponse:
+        if stored is None or stored["response"] is None:
+            # Still running, or its claim expired a moment ago.
+            return JsonResponse({"detail": IDEMPOTENCY_KEY_IN_PROGRESS}, status=409)
+
+        if stored["fingerprint"] != fingerprint:
+            return JsonResponse({"detail": IDEMPOTENCY_KEY_REUSED}, status=422)
+
+        status_code, content_type, content = stored["response"]
+
+        response = HttpResponse(content, status=status_code, content_type=content_type)
+        response["Idempotent-Replayed"] = "true"
+
+        return response
@@ -0,0 +1,157 @@
+import copy
+import json
+import logging
+import os
+import queue
+import threading
+import uuid
+import weakref
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, Optional
+
+request_id: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+# LogRecord attributes that aren't ``extra=`` fields.
+RECORD_ATTRIBUTES = frozenset(
+    vars(logging.LogRecord("", logging.INFO, "", 0, "", None, None))
+) | {"message", "request_id"}
+
+
+def request_id_new() -> str:
+    return uuid.uuid4().hex
+
+
+class JSONFormatter(logging.Formatter):
+    """
+    One JSON object per line, including the request id and any ``extra=``
+    fields.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "location": f"{record.module}.{record.funcName}:{record.lineno}",
+            "message": record.getMessage(),
+            "request_id": getattr(record, "request_id", None),
+        }
+
+        entry.update(
+            (key, value)
+            for key, value in vars(record).items()
+            if key not in RECORD_ATTRIBUTES
+        )
+
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+
+        if record.stack_info:
+            entry["stack_info"] = self.formatStack(record.stack_info)
+
+        return json.dumps(entry, default=str)
+
+
+_handlers: "weakref.WeakSet[QueueLogHandler]" = weakref.WeakSet()
+
+
+class QueueLogHandler(QueueHandler):
+    """
+    Hands records to a bounded queue that a ``QueueListener`` thread formats
+    and writes to ``stream``, so slow stdout never blocks a request.
+
+    When the queue is full the record is dropped and counted per level (see
+    ``log_stats``) instead of waiting. The listener is restarted in forked
+    children, e.g. gunicorn workers of a preloaded app.
+    """
+
+    def __init__(self, stream=None, queue_size: int = 10000):
+        super().__init__(queue.Queue(maxsize=queue_size))
+        self.queue_size = queue_size
+        self.target = logging.StreamHandler(stream)
+        self.dropped: Dict[str, int] = {}
+        self.dropped_lock = threading.Lock()
+        self.listener: Optional[QueueListener] = None
+
+        self.listener_start()
+        _handlers.add(self)
+
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=_listener_restart(weakref.ref(self)))
+
+    def listener_start(self) -> None:
+        self.listener = QueueListener(self.queue, self.target)
+        self.listener.start()
+
+    def listener_restart(self) -> None:
+        if self.listener is None:
+            # Closed.
+            return
+
+        # The parent's listener thread and queue locks don't survive fork.
+        self.queue = queue.Queue(maxsize=self.queue_size)
+        self.dropped_lock = threading.Lock()
+        self.listener_start()
+
+    def setFormatter(self, fmt) -> None:
+        # Records are formatted by the target, on the listener thread.
+        self.target.setFormatter(fmt)
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Only resolves what can change after this call returns: the message
+        # arguments and the request id. Formatting is left to the listener.
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        # django.request logs the response after the middleware has returned,
+        # but passes the request along.
+        record.request_id = request_id.get() or getattr(
+            getattr(record, "request", None), "id", None
+        )
+
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self.dropped_lock:
+                self.dropped[record.levelname] = (
+                    self.dropped.get(record.levelname, 0) + 1
+                )
+
+    def close(self) -> None:
+        # Drains the queue before closing the stream.
+        if self.listener is not None:
+            self.listener.stop()
+            self.listener = None
+
+        self.target.close()
+        super().close()
+
+
+def _listener_restart(handler: "weakref.ref[QueueLogHandler]"):
+    def restart():
+        if handler() is not None:
+            handler().listener_restart()
+
+    return restart
+
+
+def log_stats() -> Dict[str, Any]:
+    """
+    Records dropped per level and currently queued, over all queue handlers.
+    """
+    dropped: Dict[str, int] = {}
+    queued = 0
+
+    for handler in list(_handlers):
+        with handler.dropped_lock:
+            for level, count in handler.dropped.items():
+                dropped[level] = dropped.get(level, 0) + count
+
+        queued += handler.queue.qsize()
+
+    return {"dropped": dropped, "queued": queued}
@@ -0,0 +1,94 @@
+import json
+import timeit
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext, setup_databases, teardown_databases
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+from rest_framework.request import Request
+
+from travelproject.common.authentication import (
+    CachedTokenAuthentication,
+    SignedTokenAuthentication,
+    access_token_issue,
+)
+from travelproject.users.models import User
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure one authentication per scheme against a throwaway test "
+        "database: DRF's TokenAuthentication, and the cached token and signed "
+        "token schemes with a warm cache."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--number", type=int, default=5000)
+        parser.add_argument("--output", help="Write the JSON report to this path.")
+
+    def handle(self, *args, **options):
+        if settings.SETTINGS_MODULE != "config.django.test":
+            raise CommandError(
+                "Run the benchmark with DJANGO_SETTINGS_MODULE=config.django.test."
+            )
+
+        old_config = setup_databases(verbosity=0, interactive=False)
+
+        try:
+            report = self.benchmark(number=options["number"])
+        finally:
+            teardown_databases(old_config, verbosity=0)
+
+        rendered = json.dumps(report, indent=2)
+
+        if options["output"]:
+            with open(options["output"], "w") as output:
+                output.write(rendered + "\n")
+
+        self.stdout.write(rendered)
+
+    def measure(self, authentication, header: str, number: int):
+        request = Request(RequestFactory().get("/", HTTP_AUTHORIZATION=header))
+
+        # Warms the cache of the cached schemes.
+        authentication.authenticate(request)
+
+        with CaptureQueriesContext(connection) as queries:
+            authentication.authenticate(request)
+
+        elapsed = timeit.timeit(
+            lambda: authentication.authenticate(request), number=number
+        )
+
+        return {
+            "queries": len(queries),
+            "us": round(elapsed / number * 1_000_000, 2),
+        }
+
+    def benchmark(self, *, number: int):
+        caches[settings.AUTH_TOKEN_CACHE_ALIAS].clear()
+
+        user = User.objects.create(
+            email="auth-benchmark@example.com",
+            first_name="Auth",
+            last_name="Benchmark",
+            is_active=True,
+        )
+        token = Token.objects.create(user=user)
+        access = access_token_issue(user=user)
+
+        return {
+            "database": connection.vendor,
+            "cache": settings.CACHES[settings.AUTH_TOKEN_CACHE_ALIAS]["BACKEND"],
+            "token": self.measure(TokenAuthentication(), f"Token {token.key}", number),
+            "cached_token": self.measure(
+                CachedTokenAuthentication(), f"Token {token.key}", number
+            ),
+            "signed_token": self.measure(
+                SignedTokenAuthentication(), f"Bearer {access}", number
+            ),
+        }
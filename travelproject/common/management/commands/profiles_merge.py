@@ -0,0 +1,91 @@
+import json
+import os
+from collections import Counter
+from typing import Dict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from travelproject.common.profiling import (
+    COLLAPSED_SUFFIX,
+    collapsed_read,
+    collapsed_write,
+    profile_file_view,
+    profile_top,
+)
+
+
+def profiles_load(directory: str) -> Dict[str, Counter]:
+    """
+    Stacks per view name, summed over the files of every worker process.
+    """
+    if not os.path.isdir(directory):
+        raise CommandError(f"{directory} is not a directory.")
+
+    profiles: Dict[str, Counter] = {}
+
+    for filename in sorted(os.listdir(directory)):
+        view_name = profile_file_view(filename)
+        if view_name is None:
+            continue
+
+        stacks = collapsed_read(os.path.join(directory, filename))
+        profiles.setdefault(view_name, Counter()).update(stacks)
+
+    return profiles
+
+
+class Command(BaseCommand):
+    help = (
+        "Merge the per-process profiles written by ProfilingMiddleware into one "
+        "collapsed-stack file per URL name, and optionally compare the top "
+        "functions by self time against a baseline run."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("directory", nargs="?", default=settings.PROFILING_DIR)
+        parser.add_argument(
+            "--output", help="Write <view name>.collapsed files to this directory."
+        )
+        parser.add_argument(
+            "--baseline", help="Directory with the profiles of an earlier run."
+        )
+        parser.add_argument("--top", type=int, default=settings.PROFILING_TOP)
+
+    def handle(self, *args, **options):
+        profiles = profiles_load(options["directory"])
+        baseline = profiles_load(options["baseline"]) if options["baseline"] else {}
+        top = options["top"]
+
+        if options["output"]:
+            os.makedirs(options["output"], exist_ok=True)
+
+            for view_name, stacks in profiles.items():
+                collapsed_write(
+                    os.path.join(options["output"], view_name + COLLAPSED_SUFFIX),
+                    stacks,
+                )
+
+        report = {}
+
+        for view_name, stacks in sorted(profiles.items()):
+            functions = profile_top(stacks, top=top)
+            entry = {"samples": sum(stacks.values()), "functions": functions}
+
+            if view_name in baseline:
+                before = {
+                    row["function"]: row
+                    for row in profile_top(baseline[view_name], top=None)
+                }
+
+                entry["baseline_samples"] = sum(baseline[view_name].values())
+
+                # Shares of samples, so runs of different length compare.
+                for row in functions:
+                    baseline_pct = before.get(row["function"], {}).get("self_pct", 0.0)
+                    row["baseline_self_pct"] = baseline_pct
+                    row["delta_pct"] = round(row["self_pct"] - baseline_pct, 2)
+
+            report[view_name] = entry
+
+        self.stdout.write(json.dumps(report, indent=2))
@@ -0,0 +1,100 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+BOOT_CODE = (
+    "import config.wsgi\n"
+    "from travelproject.common.warmup import warmup\n"
+    "warmup()\n"
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure worker cold start (import config.wsgi plus warmup) for settings "
+        "profiles in fresh interpreters, with a python -X importtime breakdown."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--settings-modules",
+            nargs="+",
+            default=["config.django.prod", "config.django.api"],
+        )
+        parser.add_argument("--runs", type=int, default=5)
+        parser.add_argument("--top", type=int, default=10)
+        parser.add_argument("--output", help="Write the JSON report to this path.")
+
+    def boot(self, settings_module: str, *extra_args: str):
+        env = {
+            **os.environ,
+            "DJANGO_SETTINGS_MODULE": settings_module,
+            # prod-based profiles require it; nothing is signed at boot.
+            "SECRET_KEY": os.environ.get("SECRET_KEY", "startup-benchmark"),
+        }
+
+        started = time.perf_counter()
+        result = subprocess.run(
+            [sys.executable, *extra_args, "-c", BOOT_CODE],
+            cwd=settings.BASE_DIR,
+            env=env,
+            capture_output=True,
+            text=True,
+        )
+        elapsed = time.perf_counter() - started
+
+        if result.returncode:
+            raise CommandError(f"{settings_module} failed to boot:\n{result.stderr}")
+
+        return elapsed, result.stderr
+
+    def profile(self, settings_module: str, *, runs: int, top: int):
+        wall_times = [self.boot(settings_module)[0] for _ in range(runs)]
+
+        _, importtime = self.boot(settings_module, "-X", "importtime")
+
+        packages = defaultdict(int)
+        modules = 0
+
+        # Lines look like "import time:       123 |       456 |   package.module".
+        for line in importtime.splitlines():
+            if not line.startswith("import time:") or "self [us]" in line:
+                continue
+
+            self_us, _, name = line[len("import time:") :].split("|")
+            packages[name.strip().split(".")[0]] += int(self_us)
+            modules += 1
+
+        top_packages = sorted(packages.items(), key=lambda item: -item[1])[:top]
+
+        return {
+            "wall_ms": round(statistics.median(wall_times) * 1000, 1),
+            "import_ms": round(sum(packages.values()) / 1000, 1),
+            "modules": modules,
+            "top_packages": {
+                name: round(self_us / 1000, 1) for name, self_us in top_packages
+            },
+        }
+
+    def handle(self, *args, **options):
+        report = {
+            settings_module: self.profile(
+                settings_module, runs=options["runs"], top=options["top"]
+            )
+            for settings_module in options["settings_modules"]
+        }
+
+        rendered = json.dumps(report, indent=2)
+
+        if options["output"]:
+            with open(options["output"], "w") as output:
+                output.write(rendered + "\n")
+
+        self.stdout.write(rendered)
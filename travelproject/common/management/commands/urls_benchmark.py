@@ -0,0 +1,110 @@
+import json
+import timeit
+from types import ModuleType
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.urls import include, path
+from django.urls.resolvers import RegexPattern, URLResolver
+
+from travelproject.common.routing import trie_path
+
+# Shaped like travelproject.users.urls: static routes plus an id route.
+APP_ROUTES = (
+    "create/",
+    "me/",
+    "<int:pk>/",
+    "list/",
+    "list/export/",
+    "search/",
+    "delete/",
+    "update/",
+    "password/",
+)
+
+
+def view(request, **kwargs):  # pragma: no cover
+    pass
+
+
+def build_urlconf(*, apps: int, use_trie: bool) -> URLResolver:
+    """
+    A root resolver with ``apps`` travel-domain-like apps under ``api/``.
+    """
+    api_urls = []
+
+    for index in range(apps):
+        module = ModuleType(f"app{index}_urls")
+        module.app_name = f"app{index}"
+        module.urlpatterns = [
+            path(route, view, name=f"route{position}")
+            for position, route in enumerate(APP_ROUTES)
+        ]
+        api_urls.append(path(f"app{index}/", include(module)))
+
+    root = ModuleType("benchmark_urls")
+    api_path = trie_path if use_trie else path
+    root.urlpatterns = [api_path("api/", include(api_urls))]
+
+    return URLResolver(RegexPattern(r"^/"), root)
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark resolve() for the api/ prefix with Django's resolver and the "
+        "trie resolver as the number of apps under api/ grows."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--apps", type=int, nargs="+", default=[1, 5, 10, 25, 50])
+        parser.add_argument("--number", type=int, default=2000)
+        parser.add_argument("--output", help="Write the JSON report to this path.")
+
+    def measure(self, resolver: URLResolver, paths, number: int) -> float:
+        for url in paths:
+            resolver.resolve(url)
+
+        elapsed = timeit.timeit(
+            lambda: [resolver.resolve(url) for url in paths], number=number
+        )
+
+        return round(elapsed / (number * len(paths)) * 1_000_000, 2)
+
+    def handle(self, *args, **options):
+        report = {}
+
+        for apps in options["apps"]:
+            last = apps - 1
+            # Worst case for Django's resolver: routes of the last app. Twice
+            # as many ids as the LRU holds, so every id lookup misses it.
+            paths = [f"/api/app{last}/list/", f"/api/app{last}/me/"] + [
+                f"/api/app{last}/{pk}/"
+                for pk in range(1, 1 + settings.URL_RESOLVE_CACHE_SIZE * 2)
+            ]
+
+            report[apps] = {
+                "django_us": self.measure(
+                    build_urlconf(apps=apps, use_trie=False),
+                    paths[:2],
+                    options["number"],
+                ),
+                "trie_cached_us": self.measure(
+                    build_urlconf(apps=apps, use_trie=True),
+                    paths[:2],
+                    options["number"],
+                ),
+                "django_ids_us": self.measure(
+                    build_urlconf(apps=apps, use_trie=False), paths[2:], 1
+                ),
+                "trie_ids_us": self.measure(
+                    build_urlconf(apps=apps, use_trie=True), paths[2:], 1
+                ),
+            }
+
+        rendered = json.dumps(report, indent=2)
+
+        if options["output"]:
+            with open(options["output"], "w") as output:
+                output.write(rendered + "\n")
+
+        self.stdout.write(rendered)
@@ -0,0 +1,190 @@
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+request_timings: ContextVar[Optional[Dict[str, float]]] = ContextVar(
+    "request_timings", default=None
+)
+
+
+class RequestSample(NamedTuple):
+    view_name: str
+    queries: int
+    db_time: float
+    serialize_time: float
+    total_time: float
+
+
+@contextmanager
+def record_timing(name: str):
+    """
+    Adds the time spent in the block to the current request's ``name``
+    timing. Outside of a request it is a no-op.
+    """
+    timings = request_timings.get()
+    if timings is None:
+        yield
+        return
+
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[name] = timings.get(name, 0.0) + time.perf_counter() - started
+
+
+def query_timer(execute, sql, params, many, context):
+    """
+    Execute wrapper installed on every connection (see common.signals) that
+    adds each query to the current request's "db" time and "queries" count.
+    It finds the request through the ``request_timings`` context variable,
+    which sync_to_async carries into its threads, so queries are counted
+    under ASGI too.
+    """
+    timings = request_timings.get()
+    if timings is None:
+        return execute(sql, params, many, context)
+
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timings["db"] += time.perf_counter() - started
+        timings["queries"] += 1
+
+
+class EndpointMetrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._endpoints: Dict[str, Dict[str, float]] = {}
+        self._observers: List[Callable[[RequestSample], None]] = []
+
+    def record(self, sample: RequestSample, *, over_budget: bool) -> None:
+        with self._lock:
+            stats = self._endpoints.setdefault(
+                sample.view_name,
+                {
+                    "requests": 0,
+                    "queries": 0,
+                    "max_queries": 0,
+                    "over_budget": 0,
+                    "db_time": 0.0,
+                    "serialize_time": 0.0,
+                    "total_time": 0.0,
+                },
+            )
+            stats["requests"] += 1
+            stats["queries"] += sample.queries
+            stats["max_queries"] = max(stats["max_queries"], sample.queries)
+            stats["over_budget"] += int(over_budget)
+            stats["db_time"] += sample.db_time
+            stats["serialize_time"] += sample.serialize_time
+            stats["total_time"] += sample.total_time
+
+            observers = list(self._observers)
+
+        for observer in observers:
+            observer(sample)
+
+    def observe(self, observer: Callable[[RequestSample], None]) -> None:
+        with self._lock:
+            self._observers.append(observer)
+
+    def unobserve(self, observer: Callable[[RequestSample], None]) -> None:
+        with self._lock:
+            self._observers.remove(observer)
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {name: dict(stats) for name, stats in self._endpoints.items()}
+
+
+endpoint_metrics = EndpointMetrics()
+
+
+def _prometheus_lines(metric: str, kind: str, help_text: str, samples) -> List[str]:
+    lines = [f"# HELP {metric} {help_text}", f"# TYPE {metric} {kind}"]
+
+    for labels, value in samples:
+        rendered = ",".join(f'{key}="{val}"' for key, val in labels.items())
+        lines.append(f"{metric}{{{rendered}}} {value}")
+
+    return lines
+
+
+def metrics_render_prometheus() -> str:
+    # Imported here to keep this module free of DB backend imports.
+    from travelproject.common.db.base import pool_stats
+    from travelproject.common.hashing import password_hashing_stats
+    from travelproject.common.log import log_stats
+
+    endpoints = endpoint_metrics.snapshot()
+    lines: List[str] = []
+
+    endpoint_series = [
+        ("requests_total", "counter", "requests", "Handled requests."),
+        ("request_queries_total", "counter", "queries", "SQL queries executed."),
+        ("request_queries_max", "gauge", "max_queries", "Most queries in a request."),
+        (
+            "request_over_query_budget_total",
+            "counter",
+            "over_budget",
+            "Requests that exceeded QUERY_BUDGETS.",
+        ),
+        ("request_db_seconds_total", "counter", "db_time", "Time spent in SQL."),
+        (
+            "request_serialize_seconds_total",
+            "counter",
+            "serialize_time",
+            "Time spent serializing and rendering.",
+        ),
+        ("request_seconds_total", "counter", "total_time", "Total request time."),
+    ]
+
+    for suffix, kind, key, help_text in endpoint_series:
+        lines += _prometheus_lines(
+            f"travelproject_{suffix}",
+            kind,
+            help_text,
+            [({"view": name}, stats[key]) for name, stats in sorted(endpoints.items())],
+        )
+
+    hashing = password_hashing_stats()
+    lines += _prometheus_lines(
+        "travelproject_password_hash_seconds_total",
+        "counter",
+        "Time spent hashing and verifying passwords.",
+        [({"algorithm": name}, stats["total"]) for name, stats in hashing.items()],
+    )
+    lines += _prometheus_lines(
+        "travelproject_password_hash_total",
+        "counter",
+        "Password hash and verify operations.",
+        [({"algorithm": name}, stats["count"]) for name, stats in hashing.items()],
+    )
+
+    for key in ("checked_out", "idle", "size", "wait_time"):
+        lines += _prometheus_lines(
+            f"travelproject_db_pool_{key}",
+            "gauge" if key != "wait_time" else "counter",
+            f"Connection pool {key.replace('_', ' ')}.",
+            [({"alias": alias}, stats[key]) for alias, stats in pool_stats().items()],
+        )
+
+    logs = log_stats()
+    lines += _prometheus_lines(
+        "travelproject_log_records_dropped_total",
+        "counter",
+        "Log records dropped because the log queue was full.",
+        [({"level": level}, count) for level, count in sorted(logs["dropped"].items())],
+    )
+    lines += _prometheus_lines(
+        "travelproject_log_queue_size",
+        "gauge",
+        "Log records waiting to be written.",
+        [({}, logs["queued"])],
+    )
+
+    return "\n".join(lines) + "\n"
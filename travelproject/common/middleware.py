@@ -0,0 +1,244 @@
+import asyncio
+import itertools
+import logging
+import re
+import sys
+import time
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.utils.crypto import constant_time_compare
+
+from travelproject.common.log import request_id, request_id_new
+from travelproject.common.metrics import (
+    RequestSample,
+    request_timings,
+    endpoint_metrics,
+)
+from travelproject.common.profiling import ProfileStore, StackSampler
+
+logger = logging.getLogger(__name__)
+
+REQUEST_ID_FORMAT = re.compile(r"[A-Za-z0-9._-]{1,64}")
+
+
+class AsyncCapableMiddleware:
+    """
+    Base for middleware that runs in the handler's mode: under ASGI Django
+    awaits ``__call__`` instead of running the chain on a thread pool.
+    Subclasses implement ``__call__`` and ``__acall__``.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = asyncio.iscoroutinefunction(get_response)
+
+        if self.is_async:
+            # Same marker Django's MiddlewareMixin sets, so the handler
+            # treats the instance as a coroutine function.
+            self._is_coroutine = asyncio.coroutines._is_coroutine  # type: ignore[attr-defined]
+
+
+class RequestIdMiddleware(AsyncCapableMiddleware):
+    """
+    Binds a request id to every log record of the request and returns it in
+    ``X-Request-ID``. An id sent by the client or a proxy is kept when it is
+    well-formed, so log lines can be matched across services.
+    """
+
+    header = "X-Request-ID"
+
+    def request_id_bind(self, request):
+        incoming = request.headers.get(self.header, "")
+        if REQUEST_ID_FORMAT.fullmatch(incoming) is None:
+            incoming = request_id_new()
+
+        request.id = incoming
+
+        return request_id.set(incoming)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+
+        token = self.request_id_bind(request)
+
+        try:
+            response = self.get_response(request)
+        finally:
+            request_id.reset(token)
+
+        response[self.header] = request.id
+
+        return response
+
+    async def __acall__(self, request):
+        token = self.request_id_bind(request)
+
+        try:
+            response = await self.get_response(request)
+        finally:
+            request_id.reset(token)
+
+        response[self.header] = request.id
+
+        return response
+
+
+class RequestMetricsMiddleware(AsyncCapableMiddleware):
+    """
+    Records query count, DB time, serializer time and total time per resolved
+    URL name, exposes them as a ``Server-Timing`` header and flags requests
+    that exceed their ``QUERY_BUDGETS`` entry.
+    """
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+
+        timings = {"db": 0.0, "serialize": 0.0, "queries": 0}
+        token = request_timings.set(timings)
+        started = time.perf_counter()
+
+        try:
+            response = self.get_response(request)
+        finally:
+            request_timings.reset(token)
+
+        return self.record(request, response, timings=timings, started=started)
+
+    async def __acall__(self, request):
+        timings = {"db": 0.0, "serialize": 0.0, "queries": 0}
+        token = request_timings.set(timings)
+        started = time.perf_counter()
+
+        try:
+            response = await self.get_response(request)
+        finally:
+            request_timings.reset(token)
+
+        return self.record(request, response, timings=timings, started=started)
+
+    def record(self, request, response, *, timings, started: float):
+        total_time = time.perf_counter() - started
+
+        match = request.resolver_match
+        sample = RequestSample(
+            view_name=match.view_name if match else "unresolved",
+            queries=int(timings["queries"]),
+            db_time=timings["db"],
+            serialize_time=timings["serialize"],
+            total_time=total_time,
+        )
+
+        budget = settings.QUERY_BUDGETS.get(sample.view_name)
+        over_budget = budget is not None and sample.queries > budget
+        if over_budget:
+            logger.warning(
+                "%s ran %s queries, over its budget of %s.",
+                sample.view_name,
+                sample.queries,
+                budget,
+            )
+
+        endpoint_metrics.record(sample, over_budget=over_budget)
+
+        if settings.SERVER_TIMING_HEADER:
+            response["Server-Timing"] = (
+                f'db;dur={sample.db_time * 1000:.2f};desc="{sample.queries} queries", '
+                f"serialize;dur={sample.serialize_time * 1000:.2f}, "
+                f"total;dur={sample.total_time * 1000:.2f}"
+            )
+
+        return response
+
+    def process_template_response(self, request, response):
+        # DRF responses are rendered right after this hook returns.
+        timings = request_timings.get()
+        if timings is None:
+            return response
+
+        started = time.perf_counter()
+
+        def rendered(response):
+            timings["serialize"] += time.perf_counter() - started
+
+        response.add_post_render_callback(rendered)
+
+        return response
+
+
+class ProfilingMiddleware(AsyncCapableMiddleware):
+    """
+    Opt-in (PROFILING_ENABLED) sampling profiler. Profiles one request in
+    PROFILING_SAMPLE_RATE, and every request sending ``X-Profile`` with the
+    PROFILING_TOKEN, aggregating their stacks by URL name into PROFILING_DIR.
+    Merge and compare the files with ``manage.py profiles_merge``.
+
+    Under ASGI only the event loop's work for the request is sampled; what
+    its views run in sync_to_async threads is not.
+    """
+
+    header = "X-Profile"
+
+    def __init__(self, get_response):
+        if not settings.PROFILING_ENABLED:
+            raise MiddlewareNotUsed
+
+        super().__init__(get_response)
+        self.requests = itertools.count(1)
+        self.store = ProfileStore(
+            directory=settings.PROFILING_DIR, top=settings.PROFILING_TOP
+        )
+
+    def should_profile(self, request) -> bool:
+        token = settings.PROFILING_TOKEN
+        if token and constant_time_compare(request.headers.get(self.header, ""), token):
+            return True
+
+        rate = settings.PROFILING_SAMPLE_RATE
+
+        return rate > 0 and next(self.requests) % rate == 0
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+
+        if not self.should_profile(request):
+            return self.get_response(request)
+
+        # Stacks stop short of this frame, so they start at the next middleware.
+        sampler = StackSampler(
+            interval=settings.PROFILING_INTERVAL, stop_frame=sys._getframe()
+        )
+
+        with sampler:
+            response = self.get_response(request)
+
+        self.store_add(request, sampler)
+
+        return response
+
+    async def __acall__(self, request):
+        if not self.should_profile(request):
+            return await self.get_response(request)
+
+        # The loop also runs other requests; the sampler drops stacks that
+        # don't pass through this coroutine's frame.
+        sampler = StackSampler(
+            interval=settings.PROFILING_INTERVAL, stop_frame=sys._getframe()
+        )
+
+        with sampler:
+            response = await self.get_response(request)
+
+        self.store_add(request, sampler)
+
+        return response
+
+    def store_add(self, request, sampler: StackSampler) -> None:
+        match = request.resolver_match
+        self.store.add(match.view_name if match else "unresolved", sampler.stacks)
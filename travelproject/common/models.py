@@ -8,3 +8,21 @@ class BaseModel(models.Model):
 
     class Meta:
         abstract = True
+
+
+class SoftDeleteModel(models.Model):
+    deleted_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        abstract = True
+
+
+class SoftDeleteManagerMixin:
+    """
+    Leaves soft-deleted rows out. Mix into the manager exposed as
+    ``objects`` and keep an unfiltered manager as the model's default one,
+    so uniqueness validation and the auth backends still see every row.
+    """
+
+    def get_queryset(self):
+        return super().get_queryset().filter(deleted_at__isnull=True)
@@ -0,0 +1,127 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from typing import Any, Optional, Tuple, Type
+
+from django.db.models import Q
+from django.db.models.query import QuerySet
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.serializers import BaseSerializer
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+from rest_framework.views import APIView
+
+from travelproject.common.metrics import record_timing
+
+
+class KeysetPagination(BasePagination):
+    """
+    Seek pagination on ``(created_at, id)``.
+
+    Unlike ``LimitOffsetPagination`` each page is a range scan on the
+    ``created_at`` index starting right after the last row of the previous
+    page, so page N costs the same as page 1. The position is exposed to
+    clients as an opaque ``cursor`` query parameter.
+    """
+
+    cursor_query_param = "cursor"
+    limit_query_param = "limit"
+    max_limit = 100
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.limit = self.get_limit(request)
+
+        position = self.decode_cursor(request)
+        queryset = queryset.order_by("created_at", "id")
+
+        if position is not None:
+            created_at, pk = position
+            queryset = queryset.filter(
+                Q(created_at__gt=created_at) | Q(created_at=created_at, id__gt=pk)
+            )
+
+        # Fetch one extra row to know whether there is a next page
+        # without issuing a COUNT.
+        results = list(queryset[: self.limit + 1])
+        self.has_next = len(results) > self.limit
+        self.page = results[: self.limit]
+
+        return self.page
+
+    def get_paginated_response(self, data):
+        return Response({"next": self.get_next_link(), "results": data})
+
+    def get_limit(self, request: Request) -> int:
+        try:
+            limit = int(request.query_params[self.limit_query_param])
+        except (KeyError, ValueError):
+            return api_settings.PAGE_SIZE
+
+        return max(1, min(limit, self.max_limit))
+
+    def get_next_link(self) -> Optional[str]:
+        if not self.has_next:
+            return None
+
+        last = self.page[-1]
+        if isinstance(last, dict):
+            position = last["created_at"], last["id"]
+        else:
+            position = last.created_at, last.id
+
+        url = self.request.build_absolute_uri()
+
+        return replace_query_param(
+            url, self.cursor_query_param, self.encode_cursor(*position)
+        )
+
+    def encode_cursor(self, created_at, pk: int) -> str:
+        raw = json.dumps([created_at.isoformat(), pk]).encode()
+        return urlsafe_b64encode(raw).decode().rstrip("=")
+
+    def decode_cursor(self, request: Request) -> Optional[Tuple[Any, int]]:
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+
+        try:
+            padded = encoded + "=" * (-len(encoded) % 4)
+            raw_created_at, pk = json.loads(urlsafe_b64decode(padded))
+            created_at = parse_datetime(raw_created_at)
+            pk = int(pk)
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+
+        if created_at is None:
+            raise NotFound(self.invalid_cursor_message)
+
+        return created_at, pk
+
+
+def get_paginated_response(
+    *,
+    pagination_class: Type[BasePagination],
+    serializer_class: Type[BaseSerializer],
+    queryset: QuerySet,
+    request: Request,
+    view: APIView
+) -> Response:
+    paginator = pagination_class()
+
+    page = paginator.paginate_queryset(queryset, request, view=view)
+
+    if page is not None:
+        with record_timing("serialize"):
+            data = serializer_class(page, many=True).data
+
+        return paginator.get_paginated_response(data)
+
+    with record_timing("serialize"):
+        data = serializer_class(queryset, many=True).data
+
+    return Response(data=data)
@@ -0,0 +1,190 @@
+import os
+import sys
+import threading
+from collections import Counter
+from types import FrameType
+from typing import Any, Dict, List, Optional
+
+# Files are named "<view name>.<pid>.collapsed", with ":" in the view name
+# replaced by ".", so every worker process writes its own files.
+COLLAPSED_SUFFIX = ".collapsed"
+TOP_SUFFIX = ".top.txt"
+
+
+def frame_label(frame: FrameType) -> str:
+    return f"{frame.f_globals.get('__name__', '?')}:{frame.f_code.co_name}"
+
+
+class StackSampler:
+    """
+    Wall-clock statistical profiler for one thread: a background thread
+    records the thread's stack every ``interval`` seconds, up to (excluding)
+    ``stop_frame``. Stacks not passing through ``stop_frame`` are dropped.
+
+    Wall-clock means waiting shows up too, e.g. a request blocked on a slow
+    query is attributed to the code that ran it.
+    """
+
+    def __init__(self, *, interval: float, stop_frame: Optional[FrameType] = None):
+        self.interval = interval
+        self.stop_frame = stop_frame
+        self.thread_id = threading.get_ident()
+        self.stacks: Counter = Counter()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="stack-sampler", daemon=True
+        )
+
+    def _sample(self) -> None:
+        frame = sys._current_frames().get(self.thread_id)
+        labels = []
+        outermost = None
+
+        while frame is not None and frame is not self.stop_frame:
+            labels.append(frame_label(frame))
+            outermost = frame
+            frame = frame.f_back
+
+        # Skip the profiled thread waiting for this sampler to stop.
+        if outermost is None or outermost.f_code is StackSampler.__exit__.__code__:
+            return
+
+        # The thread was running something else, e.g. an event loop running
+        # another request's coroutine.
+        if self.stop_frame is not None and frame is None:
+            return
+
+        self.stacks[";".join(reversed(labels))] += 1
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            self._sample()
+
+    def __enter__(self) -> "StackSampler":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._stopped.set()
+        self._thread.join()
+
+
+def profile_top(stacks: Counter, *, top: Optional[int]) -> List[Dict[str, Any]]:
+    """
+    The ``top`` functions (all when None) by self samples, i.e. the function
+    was running, with total samples (it was on the stack) alongside.
+    """
+    samples = sum(stacks.values()) or 1
+    own: Counter = Counter()
+    total: Counter = Counter()
+
+    for stack, count in stacks.items():
+        labels = stack.split(";")
+        own[labels[-1]] += count
+
+        for label in set(labels):
+            total[label] += count
+
+    return [
+        {
+            "function": label,
+            "self_pct": round(count / samples * 100, 2),
+            "total_pct": round(total[label] / samples * 100, 2),
+            "samples": count,
+        }
+        for label, count in own.most_common(top)
+    ]
+
+
+def profile_top_render(stacks: Counter, *, top: int, requests: int) -> str:
+    lines = [
+        f"{requests} requests, {sum(stacks.values())} samples",
+        f"{'self%':>7} {'total%':>7} {'samples':>8}  function",
+    ]
+
+    for row in profile_top(stacks, top=top):
+        lines.append(
+            f"{row['self_pct']:>7.2f} {row['total_pct']:>7.2f} "
+            f"{row['samples']:>8}  {row['function']}"
+        )
+
+    return "\n".join(lines) + "\n"
+
+
+def collapsed_read(path: str) -> Counter:
+    stacks: Counter = Counter()
+
+    with open(path) as collapsed:
+        for line in collapsed:
+            stack, _, count = line.rstrip("\n").rpartition(" ")
+            if stack:
+                stacks[stack] += int(count)
+
+    return stacks
+
+
+def collapsed_write(path: str, stacks: Counter) -> None:
+    # Written aside and renamed, so readers never see a partial file.
+    partial = f"{path}.partial"
+
+    with open(partial, "w") as collapsed:
+        for stack, count in sorted(stacks.items()):
+            collapsed.write(f"{stack} {count}\n")
+
+    os.replace(partial, path)
+
+
+def profile_file_view(filename: str) -> Optional[str]:
+    """
+    The view name a worker's ``<view name>.<pid>.collapsed`` profile file was
+    written for, or None for other files, such as merged output.
+    """
+    if not filename.endswith(COLLAPSED_SUFFIX):
+        return None
+
+    view_name, _, pid = filename[: -len(COLLAPSED_SUFFIX)].rpartition(".")
+
+    if not view_name or not pid.isdigit():
+        return None
+
+    return view_name
+
+
+class ProfileStore:
+    """
+    Stacks sampled in this process, aggregated by URL name and written to
+    ``directory`` as collapsed stacks (flamegraph.pl / speedscope input) plus
+    a top-N summary after every profiled request.
+    """
+
+    def __init__(self, *, directory: str, top: int):
+        self.directory = directory
+        self.top = top
+        self._lock = threading.Lock()
+        self._stacks: Dict[str, Counter] = {}
+        self._requests: Dict[str, int] = {}
+
+    def add(self, view_name: str, stacks: Counter) -> None:
+        with self._lock:
+            aggregated = self._stacks.setdefault(view_name, Counter())
+            aggregated.update(stacks)
+            self._requests[view_name] = self._requests.get(view_name, 0) + 1
+
+            self.write(view_name)
+
+    def write(self, view_name: str) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+
+        base = os.path.join(
+            self.directory, f"{view_name.replace(':', '.')}.{os.getpid()}"
+        )
+        stacks = self._stacks[view_name]
+
+        collapsed_write(base + COLLAPSED_SUFFIX, stacks)
+
+        with open(base + TOP_SUFFIX, "w") as summary:
+            summary.write(
+                profile_top_render(
+                    stacks, top=self.top, requests=self._requests[view_name]
+                )
+            )
@@ -0,0 +1,225 @@
+import re
+import threading
+from functools import lru_cache
+from typing import Any, Dict, List, NamedTuple, Optional, Pattern, Tuple
+
+from django.conf import settings
+from django.urls import URLPattern, URLResolver, path
+from django.urls.converters import (
+    IntConverter,
+    SlugConverter,
+    StringConverter,
+    UUIDConverter,
+    get_converter,
+)
+from django.urls.resolvers import ResolverMatch, RoutePattern
+
+# Converters that match exactly one path segment.
+SEGMENT_CONVERTERS = (IntConverter, SlugConverter, StringConverter, UUIDConverter)
+
+PARAMETER_SEGMENT = re.compile(r"<(?:(?P<converter>[^>:]+):)?(?P<name>[^>]+)>")
+
+
+class RouteLeaf(NamedTuple):
+    order: int
+    pattern: URLPattern
+    route: str
+    default_kwargs: Dict[str, Any]
+    app_names: List[Optional[str]]
+    namespaces: List[Optional[str]]
+
+
+class RouteNode:
+    __slots__ = ("static", "parameters", "leaves")
+
+    def __init__(self):
+        self.static: Dict[str, "RouteNode"] = {}
+        self.parameters: List[Tuple[str, Any, Pattern, "RouteNode"]] = []
+        self.leaves: List[RouteLeaf] = []
+
+
+class UnsupportedRoute(Exception):
+    pass
+
+
+class TrieURLResolver(URLResolver):
+    """
+    ``URLResolver`` that resolves its routes through a trie of path
+    segments instead of trying every pattern in turn, with an LRU cache of
+    recent resolutions (URL_RESOLVE_CACHE_SIZE).
+
+    Only ``path()`` routes whose parameters each fill a whole segment are
+    supported. If any route under it is a regex or uses the ``path``
+    converter, or the trie has no match (e.g. a 404), it falls back to
+    Django's resolution, so reverse(), 404 debug pages and APPEND_SLASH are
+    unaffected.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._trie_lock = threading.Lock()
+        self._trie: Optional[RouteNode] = None
+        self._trie_supported = True
+        self._dispatch_cached = lru_cache(maxsize=settings.URL_RESOLVE_CACHE_SIZE)(
+            self._dispatch
+        )
+
+    def _leaves(self, patterns, *, prefix, default_kwargs, app_names, namespaces):
+        for pattern in patterns:
+            if not isinstance(pattern.pattern, RoutePattern):
+                raise UnsupportedRoute(pattern)
+
+            route = prefix + str(pattern.pattern)
+
+            if isinstance(pattern, URLResolver):
+                yield from self._leaves(
+                    pattern.url_patterns,
+                    prefix=route,
+                    default_kwargs={**default_kwargs, **pattern.default_kwargs},
+                    app_names=[*app_names, pattern.app_name],
+                    namespaces=[*namespaces, pattern.namespace],
+                )
+            else:
+                yield route, pattern, default_kwargs, app_names, namespaces
+
+    def _build_trie(self) -> RouteNode:
+        root = RouteNode()
+
+        leaves = self._leaves(
+            self.url_patterns,
+            prefix="",
+            default_kwargs={},
+            app_names=[],
+            namespaces=[],
+        )
+
+        for order, (route, pattern, default_kwargs, app_names, namespaces) in enumerate(
+            leaves
+        ):
+            node = root
+
+            for segment in route.split("/"):
+                parameter = PARAMETER_SEGMENT.fullmatch(segment)
+
+                if parameter is None:
+                    if "<" in segment or ">" in segment:
+                        raise UnsupportedRoute(pattern)
+
+                    node = node.static.setdefault(segment, RouteNode())
+                    continue
+
+                converter = get_converter(parameter["converter"] or "str")
+                if not isinstance(converter, SEGMENT_CONVERTERS):
+                    raise UnsupportedRoute(pattern)
+
+                child = RouteNode()
+                node.parameters.append(
+                    (parameter["name"], converter, re.compile(converter.regex), child)
+                )
+                node = child
+
+            node.leaves.append(
+                RouteLeaf(
+                    order=order,
+                    pattern=pattern,
+                    route=route,
+                    default_kwargs=default_kwargs,
+                    app_names=app_names,
+                    namespaces=namespaces,
+                )
+            )
+
+        return root
+
+    def get_trie(self) -> Optional[RouteNode]:
+        if self._trie is None and self._trie_supported:
+            with self._trie_lock:
+                if self._trie is None and self._trie_supported:
+                    try:
+                        self._trie = self._build_trie()
+                    except UnsupportedRoute:
+                        self._trie_supported = False
+
+        return self._trie
+
+    def _match(self, node: RouteNode, segments: List[str], index: int, kwargs):
+        if index == len(segments):
+            for leaf in node.leaves:
+                yield leaf, kwargs
+            return
+
+        segment = segments[index]
+
+        child = node.static.get(segment)
+        if child is not None:
+            yield from self._match(child, segments, index + 1, kwargs)
+
+        for name, converter, regex, child in node.parameters:
+            if not regex.fullmatch(segment):
+                continue
+
+            try:
+                value = converter.to_python(segment)
+            except ValueError:
+                continue
+
+            yield from self._match(child, segments, index + 1, {**kwargs, name: value})
+
+    def _dispatch(self, path: str) -> Optional[Tuple[RouteLeaf, Dict[str, Any]]]:
+        trie = self.get_trie()
+        if trie is None:
+            return None
+
+        matches = list(self._match(trie, path.split("/"), 0, {}))
+        if not matches:
+            return None
+
+        # Several routes can match; Django picks the first declared one.
+        return min(matches, key=lambda match: match[0].order)
+
+    def resolve(self, path):
+        path = str(path)
+        match = self.pattern.match(path)
+
+        if match:
+            new_path, args, kwargs = match
+            dispatched = self._dispatch_cached(new_path)
+
+            if dispatched is not None:
+                leaf, captured = dispatched
+
+                return ResolverMatch(
+                    leaf.pattern.callback,
+                    (),
+                    {
+                        **kwargs,
+                        **self.default_kwargs,
+                        **leaf.default_kwargs,
+                        **captured,
+                        **leaf.pattern.default_args,
+                    },
+                    leaf.pattern.name,
+                    [self.app_name, *leaf.app_names],
+                    [self.namespace, *leaf.namespaces],
+                    leaf.route,
+                )
+
+        return super().resolve(path)
+
+
+def trie_path(route: str, view, kwargs=None, name=None) -> TrieURLResolver:
+    """
+    ``path(route, include(...))`` resolved through ``TrieURLResolver``.
+    """
+    resolver = path(route, view, kwargs, name)
+
+    if not isinstance(resolver, URLResolver):
+        raise TypeError("trie_path() only supports include().")
+
+    return TrieURLResolver(
+        resolver.pattern,
+        resolver.urlconf_name,
+        resolver.default_kwargs,
+        resolver.app_name,
+        resolver.namespace,
+    )
@@ -0,0 +1,45 @@
+from operator import attrgetter, itemgetter
+from typing import Any, Callable, Dict, Tuple
+
+
+class ValuesSerializer:
+    """
+    Read-only output serializer with DRF's ``Serializer(instance, many=...)
+    .data`` interface, for flat payloads that need no field conversion.
+
+    The field getters are built once per subclass. Rows may be ``.values()``
+    dicts, so list endpoints can skip model instantiation entirely, or model
+    instances.
+    """
+
+    fields: Tuple[str, ...] = ()
+
+    _item_getter: Callable[[Any], Tuple[Any, ...]]
+    _attr_getter: Callable[[Any], Tuple[Any, ...]]
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+
+        if len(cls.fields) == 1:
+            item, attr = itemgetter(*cls.fields), attrgetter(*cls.fields)
+            cls._item_getter = staticmethod(lambda row: (item(row),))
+            cls._attr_getter = staticmethod(lambda row: (attr(row),))
+        else:
+            cls._item_getter = staticmethod(itemgetter(*cls.fields))
+            cls._attr_getter = staticmethod(attrgetter(*cls.fields))
+
+    def __init__(self, instance=None, many: bool = False, **kwargs):
+        self.instance = instance
+        self.many = many
+
+    @classmethod
+    def to_representation(cls, row) -> Dict[str, Any]:
+        getter = cls._item_getter if isinstance(row, dict) else cls._attr_getter
+        return dict(zip(cls.fields, getter(row)))
+
+    @property
+    def data(self):
+        if self.many:
+            return [self.to_representation(row) for row in self.instance]
+
+        return self.to_representation(self.instance)
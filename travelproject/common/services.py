@@ -1,16 +1,18 @@
-from typing import List, Dict, Any, Tuple
+from collections import defaultdict
+from typing import List, Dict, Any, Optional, Sequence, Tuple
 
-from travelproject.common.types import DjangoModelType
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models.signals import post_save
+from django.utils import timezone
 
+from travelproject.common.types import DjangoModelType
 
-def model_update(
-    *, instance: DjangoModelType, fields: List[str], data: Dict[str, Any], **kwargs
-) -> Tuple[DjangoModelType, bool]:
-    has_updated = False
 
-    exclude = None
-    if kwargs.get("exclude"):
-        exclude = kwargs.get("exclude")
+def _model_apply_changes(
+    *, instance: DjangoModelType, fields: List[str], data: Dict[str, Any]
+) -> List[str]:
+    changed = []
 
     for field in fields:
 
@@ -18,11 +20,156 @@ def model_update(
             continue
 
         if getattr(instance, field) != data[field]:
-            has_updated = True
+            changed.append(field)
             setattr(instance, field, data[field])
 
+    return changed
+
+
+def _model_clean_exclude(
+    *, instance: DjangoModelType, changed: List[str], exclude: Optional[List[str]]
+) -> List[str]:
+    # Unchanged fields were valid already; excluding them also skips the
+    # uniqueness query for unique fields that kept their value.
+    unchanged = [
+        field.name
+        for field in instance._meta.concrete_fields
+        if field.name not in changed
+    ]
+
+    return [*unchanged, *(exclude or [])]
+
+
+def _model_has_updated_at(instance: DjangoModelType) -> bool:
+    return any(field.name == "updated_at" for field in instance._meta.concrete_fields)
+
+
+def model_update(
+    *, instance: DjangoModelType, fields: List[str], data: Dict[str, Any], **kwargs
+) -> Tuple[DjangoModelType, bool]:
+    changed = _model_apply_changes(instance=instance, fields=fields, data=data)
+    has_updated = bool(changed)
+
     if has_updated:
-        instance.full_clean(exclude)
-        instance.save(update_fields=fields)
+        update_fields = list(changed)
+
+        # auto_now fields are only written when they are in update_fields
+        if _model_has_updated_at(instance):
+            update_fields.append("updated_at")
+
+        instance.full_clean(
+            _model_clean_exclude(
+                instance=instance, changed=changed, exclude=kwargs.get("exclude")
+            )
+        )
+        instance.save(update_fields=update_fields)
 
     return instance, has_updated
+
+
+def _model_bulk_validate_unique(
+    *, instances: Sequence[DjangoModelType], changed: Dict[int, List[str]]
+) -> None:
+    model = type(instances[0])
+    unique_fields = [
+        field.name
+        for field in model._meta.concrete_fields
+        if field.unique and not field.primary_key
+    ]
+
+    for name in unique_fields:
+        touched = [instance for instance in instances if name in changed[id(instance)]]
+        if not touched:
+            continue
+
+        values = [getattr(instance, name) for instance in touched]
+
+        owners = dict(
+            model._default_manager.filter(**{f"{name}__in": values}).values_list(
+                name, "pk"
+            )
+        )
+
+        seen = set()
+        for instance, value in zip(touched, values):
+            if owners.get(value, instance.pk) != instance.pk or value in seen:
+                raise ValidationError(
+                    {name: [instance.unique_error_message(model, (name,))]}
+                )
+
+            seen.add(value)
+
+
+def model_bulk_update(
+    *,
+    updates: Sequence[Tuple[DjangoModelType, Dict[str, Any]]],
+    fields: List[str],
+    batch_size: Optional[int] = None,
+    **kwargs,
+) -> List[DjangoModelType]:
+    """
+    Applies per-instance ``data`` diffs like ``model_update`` and writes them
+    with one ``bulk_update`` per distinct set of changed fields. Uniqueness
+    is validated with one query per changed unique field.
+
+    ``bulk_update`` itself doesn't send ``post_save``, so it is sent here for
+    every updated instance, with its ``update_fields``, so receivers such as
+    cache invalidation still run.
+    """
+    changed: Dict[int, List[str]] = {}
+    groups: Dict[Tuple[str, ...], List[DjangoModelType]] = defaultdict(list)
+
+    for instance, data in updates:
+        instance_changed = _model_apply_changes(
+            instance=instance, fields=fields, data=data
+        )
+        if not instance_changed:
+            continue
+
+        instance.full_clean(
+            _model_clean_exclude(
+                instance=instance,
+                changed=instance_changed,
+                exclude=kwargs.get("exclude"),
+            ),
+            validate_unique=False,
+        )
+
+        changed[id(instance)] = instance_changed
+        groups[tuple(instance_changed)].append(instance)
+
+    updated = [instance for group in groups.values() for instance in group]
+    if not updated:
+        return updated
+
+    _model_bulk_validate_unique(instances=updated, changed=changed)
+
+    model = type(updated[0])
+    has_updated_at = _model_has_updated_at(updated[0])
+    now = timezone.now()
+
+    with transaction.atomic():
+        for field_set, group in groups.items():
+            update_fields = list(field_set)
+
+            # bulk_update skips auto_now, so the timestamp is set by hand.
+            if has_updated_at:
+                update_fields.append("updated_at")
+                for instance in group:
+                    instance.updated_at = now
+
+            model._default_manager.bulk_update(
+                group, update_fields, batch_size=batch_size
+            )
+
+            for instance in group:
+                post_save.send(
+                    sender=model,
+                    instance=instance,
+                    created=False,
+                    update_fields=frozenset(update_fields),
+                    raw=False,
+                    using=instance._state.db,
+                )
+
+    return updated
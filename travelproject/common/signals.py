@@ -0,0 +1,29 @@
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+
+from travelproject.common.authentication import token_cache_key
+from travelproject.common.metrics import query_timer
+
+
+@receiver(post_delete, sender=Token)
+def token_deleted(sender, instance: Token, **kwargs):
+    # Logout, rotation or deletion in the admin revoke the token right away
+    # instead of after AUTH_TOKEN_CACHE_TIMEOUT.
+    cache_key = token_cache_key(instance.key)
+
+    transaction.on_commit(
+        lambda: caches[settings.AUTH_TOKEN_CACHE_ALIAS].delete(cache_key)
+    )
+
+
+@receiver(connection_created)
+def query_timer_install(sender, connection, **kwargs):
+    # Fires again when a persistent connection reconnects. Inserted first,
+    # so connection.execute_wrapper() blocks still pop their own wrapper.
+    if query_timer not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, query_timer)
@@ -0,0 +1,52 @@
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+import pytest
+from django.conf import settings
+from django.core.cache import caches
+
+from travelproject.common.metrics import RequestSample, endpoint_metrics
+
+
+@contextmanager
+def query_budget(budgets: Optional[Dict[str, int]] = None):
+    """
+    Collects a ``RequestSample`` for every request made in the block and
+    fails if any of them ran more queries than its endpoint's budget.
+    ``budgets`` overrides ``settings.QUERY_BUDGETS`` per URL name.
+    """
+    budgets = {**settings.QUERY_BUDGETS, **(budgets or {})}
+    samples: List[RequestSample] = []
+
+    endpoint_metrics.observe(samples.append)
+    try:
+        yield samples
+    finally:
+        endpoint_metrics.unobserve(samples.append)
+
+    over = [
+        f"{sample.view_name}: {sample.queries} queries (budget {budgets[sample.view_name]})"
+        for sample in samples
+        if sample.view_name in budgets and sample.queries > budgets[sample.view_name]
+    ]
+
+    if over:
+        raise AssertionError("Query budget exceeded:\n" + "\n".join(over))
+
+
+@pytest.fixture(autouse=True)
+def caches_clear():
+    # Primary keys are reused after rollbacks, so cached payloads, tokens and
+    # throttle counters of an earlier test would match rows of the next one.
+    for cache in caches.all():
+        cache.clear()
+
+
+@pytest.fixture
+def query_budgets():
+    """
+    Available to every test through the root conftest; a test requesting it
+    fails when any request it makes goes over its endpoint's query budget.
+    """
+    with query_budget() as samples:
+        yield samples
@@ -0,0 +1,74 @@
+import pytest
+from django.conf import settings
+from django.core.cache import cache, caches
+from rest_framework.exceptions import AuthenticationFailed
+
+from travelproject.common.authentication import (
+    SignedTokenAuthentication,
+    access_user_cache_key,
+    user_cache_dump,
+    user_cache_load,
+)
+from travelproject.users.cache import user_payload_from_user, user_version_key
+from travelproject.users.models import User
+from travelproject.users.tests.factories import UserFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def authenticate(user_id: int, version: int):
+    return SignedTokenAuthentication().authenticate_payload(
+        {"u": user_id, "v": version}
+    )
+
+
+def cached_version(user_id: int) -> int:
+    cache = caches[settings.AUTH_TOKEN_CACHE_ALIAS]
+
+    return cache.get(access_user_cache_key(user_id))["values"]["token_version"]
+
+
+def test_cached_user_older_than_the_token_is_reloaded():
+    user = UserFactory()
+    authenticate(user.pk, 0)
+
+    # The version moved on, but the invalidation hasn't dropped the entry.
+    User.objects.filter(pk=user.pk).update(token_version=1)
+
+    assert authenticate(user.pk, 1).pk == user.pk
+    assert cached_version(user.pk) == 1
+
+
+def test_cached_user_newer_than_the_token_revokes_it():
+    user = UserFactory(token_version=1)
+    caches[settings.AUTH_TOKEN_CACHE_ALIAS].set(
+        access_user_cache_key(user.pk), user_cache_dump(user)
+    )
+
+    with pytest.raises(AuthenticationFailed):
+        authenticate(user.pk, 0)
+
+    assert cached_version(user.pk) == 1
+
+
+@pytest.mark.parametrize("alias", ["default", "replica_1"])
+def test_cached_users_keep_their_source_database(alias):
+    user = UserFactory()
+    user._state.db = alias
+
+    loaded = user_cache_load(user_cache_dump(user))
+
+    assert loaded._state.db == alias
+    assert loaded.email == user.email
+    assert "password" in loaded.get_deferred_fields()
+
+
+def test_replica_users_from_the_cache_dont_set_the_payload_version():
+    user = UserFactory()
+    user._state.db = "replica_1"
+
+    user_payload_from_user(
+        user=user_cache_load(user_cache_dump(user)), render=lambda user: b"{}"
+    )
+
+    assert cache.get(user_version_key(user.pk)) is None
@@ -0,0 +1,103 @@
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.contrib.auth.hashers import check_password, make_password
+
+from travelproject.common import hashing
+from travelproject.common.metrics import metrics_render_prometheus
+
+FAST_HASHERS = [
+    "django.contrib.auth.hashers.MD5PasswordHasher",
+    "django.contrib.auth.hashers.SHA1PasswordHasher",
+]
+
+
+class CountingExecutor(ThreadPoolExecutor):
+    def __init__(self):
+        super().__init__(max_workers=1)
+        self.submitted = 0
+
+    def submit(self, *args, **kwargs):
+        self.submitted += 1
+
+        return super().submit(*args, **kwargs)
+
+
+@pytest.fixture(autouse=True)
+def fast_hashers(settings):
+    settings.PASSWORD_HASHERS = FAST_HASHERS
+
+
+@pytest.fixture(autouse=True)
+def stats(monkeypatch):
+    stats = {}
+    monkeypatch.setattr(hashing, "_stats", stats)
+
+    return stats
+
+
+@pytest.fixture
+def executor(monkeypatch):
+    with CountingExecutor() as executor:
+        monkeypatch.setattr(hashing, "_executor", executor)
+        yield executor
+
+
+def test_sync_hashing_runs_on_the_calling_thread(executor, stats):
+    encoded = hashing.password_hash("secret")
+
+    assert hashing.password_verify("secret", encoded) == (True, False)
+    assert hashing.password_verify("wrong", encoded) == (False, False)
+    assert executor.submitted == 0
+    assert stats["md5"]["count"] == 3
+
+
+def test_async_hashing_runs_on_the_executor(executor, stats):
+    encoded = async_to_sync(hashing.password_hash_async)("secret")
+    verified = async_to_sync(hashing.password_verify_async)("secret", encoded)
+
+    assert check_password("secret", encoded)
+    assert verified == (True, False)
+    assert executor.submitted == 2
+    assert stats["md5"]["count"] == 2
+
+
+@pytest.mark.parametrize(
+    "verify",
+    [hashing.password_verify, async_to_sync(hashing.password_verify_async)],
+)
+def test_outdated_hashes_must_be_updated(executor, verify):
+    outdated = make_password("secret", hasher="sha1")
+
+    assert verify("secret", outdated) == (True, True)
+
+
+def test_process_executor(settings, monkeypatch):
+    settings.PASSWORD_HASHING_EXECUTOR = "process"
+    settings.PASSWORD_HASHING_WORKERS = 1
+    monkeypatch.setattr(hashing, "_executor", None)
+
+    executor = hashing.get_hashing_executor()
+
+    try:
+        assert isinstance(executor, ProcessPoolExecutor)
+
+        encoded = async_to_sync(hashing.password_hash_async)("secret")
+        assert hashing.password_verify("secret", encoded) == (True, False)
+    finally:
+        executor.shutdown()
+
+
+def test_stats_are_exposed_as_metrics(stats):
+    hashing.password_hash("secret")
+    hashing.password_verify("secret", make_password("secret", hasher="sha1"))
+
+    assert stats["md5"]["count"] == 1
+    assert stats["sha1"]["count"] == 1
+    assert 0 < stats["md5"]["max"] <= stats["md5"]["total"]
+
+    rendered = metrics_render_prometheus()
+    assert 'travelproject_password_hash_total{algorithm="md5"} 1' in rendered
+    assert 'travelproject_password_hash_total{algorithm="sha1"} 1' in rendered
+    assert 'travelproject_password_hash_seconds_total{algorithm="md5"}' in rendered
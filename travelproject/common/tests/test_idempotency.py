@@ -0,0 +1,104 @@
+import pytest
+from rest_framework.response import Response
+from rest_framework.test import APIRequestFactory
+from rest_framework.views import APIView
+
+from travelproject.common.idempotency import IdempotencyMixin
+
+
+class CounterApi(IdempotencyMixin, APIView):
+    authentication_classes = []
+    permission_classes = []
+
+    calls = []
+    status = 201
+    hooks = []
+
+    def post(self, request, *args, **kwargs):
+        self.calls.append(request.data)
+
+        for hook in self.hooks:
+            hook()
+
+        return Response({"call": len(self.calls)}, status=self.status)
+
+
+@pytest.fixture(autouse=True)
+def counter_api(monkeypatch):
+    monkeypatch.setattr(CounterApi, "calls", [])
+
+    return CounterApi
+
+
+def post(data=None, key="key-1", **extra):
+    request = APIRequestFactory().post(
+        "/counter/",
+        data or {"name": "a"},
+        format="json",
+        HTTP_IDEMPOTENCY_KEY=key,
+        **extra
+    )
+    response = CounterApi.as_view()(request)
+
+    if hasattr(response, "render"):
+        response.render()
+
+    return response
+
+
+def test_retry_replays_the_stored_response(counter_api):
+    first = post()
+    retry = post()
+
+    assert len(counter_api.calls) == 1
+    assert retry.status_code == 201
+    assert retry.content == first.content
+    assert retry["Idempotent-Replayed"] == "true"
+
+
+def test_key_reused_with_another_body_is_rejected(counter_api):
+    post({"name": "a"})
+
+    assert post({"name": "b"}).status_code == 422
+    assert len(counter_api.calls) == 1
+
+
+def test_keys_are_scoped_to_the_client(counter_api):
+    post(HTTP_AUTHORIZATION="Bearer one")
+    post(HTTP_AUTHORIZATION="Bearer two")
+    post(REMOTE_ADDR="192.0.2.1")
+    post(REMOTE_ADDR="192.0.2.2")
+
+    assert len(counter_api.calls) == 4
+    assert post(HTTP_AUTHORIZATION="Bearer one")["Idempotent-Replayed"] == "true"
+
+
+def test_duplicate_in_flight_gets_a_conflict(counter_api, monkeypatch):
+    duplicates = []
+    monkeypatch.setattr(counter_api, "hooks", [lambda: duplicates.append(post())])
+
+    assert post().status_code == 201
+    assert [response.status_code for response in duplicates] == [409]
+    assert len(counter_api.calls) == 1
+
+
+def test_server_error_releases_the_key(counter_api, monkeypatch):
+    monkeypatch.setattr(counter_api, "status", 503)
+    assert post().status_code == 503
+
+    monkeypatch.setattr(counter_api, "status", 201)
+    assert post().status_code == 201
+    assert len(counter_api.calls) == 2
+
+
+def test_exception_releases_the_key(counter_api, monkeypatch):
+    def fail():
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(counter_api, "hooks", [fail])
+    with pytest.raises(RuntimeError):
+        post()
+
+    monkeypatch.setattr(counter_api, "hooks", [])
+    assert post().status_code == 201
+    assert len(counter_api.calls) == 2
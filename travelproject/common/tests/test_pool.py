@@ -0,0 +1,153 @@
+import itertools
+import json
+import os
+import threading
+import time
+
+import pytest
+
+from travelproject.common.db.pool import ConnectionPool, PoolTimeout
+
+
+class FakeConnection:
+    ids = itertools.count(1)
+
+    def __init__(self):
+        self.id = next(self.ids)
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+def make_pool(**options) -> ConnectionPool:
+    return ConnectionPool(
+        **{
+            "connect": FakeConnection,
+            "is_usable": lambda connection: True,
+            "max_size": 2,
+            "timeout": 1.0,
+            "health_check_after": 60.0,
+            **options,
+        }
+    )
+
+
+def test_returned_connections_are_reused():
+    pool = make_pool()
+
+    first = pool.getconn()
+    second = pool.getconn()
+    pool.putconn(first)
+    pool.putconn(second)
+
+    # The most recently returned connection is handed out first.
+    assert pool.getconn() is second
+
+    stats = pool.stats()
+    assert (stats["size"], stats["checked_out"], stats["idle"]) == (2, 1, 1)
+    assert stats["connects"] == 2
+
+
+def test_checkout_waits_for_a_returned_connection():
+    pool = make_pool(max_size=1)
+    connection = pool.getconn()
+    checked_out = []
+
+    waiter = threading.Thread(target=lambda: checked_out.append(pool.getconn()))
+    waiter.start()
+
+    time.sleep(0.05)
+    assert checked_out == []
+
+    pool.putconn(connection)
+    waiter.join(timeout=1)
+
+    assert checked_out == [connection]
+    assert pool.stats()["waits"] == 1
+
+
+def test_checkout_times_out_when_the_pool_is_full():
+    pool = make_pool(max_size=1, timeout=0.05)
+    pool.getconn()
+
+    with pytest.raises(PoolTimeout):
+        pool.getconn()
+
+    assert pool.stats()["timeouts"] == 1
+
+
+def test_broken_connections_are_discarded():
+    pool = make_pool(max_size=1)
+
+    discarded = pool.getconn()
+    pool.putconn(discarded, discard=True)
+
+    closed = pool.getconn()
+    closed.closed = True
+    pool.putconn(closed)
+
+    assert discarded.closed
+    assert pool.getconn() not in (discarded, closed)
+    assert pool.stats()["discarded"] == 2
+
+
+def test_idle_connections_are_checked_before_reuse():
+    pool = make_pool(health_check_after=0, is_usable=lambda connection: False)
+
+    stale = pool.getconn()
+    pool.putconn(stale)
+
+    assert pool.getconn() is not stale
+    assert stale.closed
+
+
+def test_failed_connect_frees_its_slot():
+    def connect():
+        raise ConnectionError("refused")
+
+    pool = make_pool(max_size=1, connect=connect)
+
+    for _ in range(2):
+        with pytest.raises(ConnectionError):
+            pool.getconn()
+
+    assert pool.stats()["size"] == 0
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="Needs os.fork().")
+def test_forked_child_opens_its_own_connections():
+    pool = make_pool()
+    idle = pool.getconn()
+    in_use = pool.getconn()
+    pool.putconn(idle)
+
+    read_end, write_end = os.pipe()
+    pid = os.fork()
+
+    if pid == 0:
+        try:
+            connection = pool.getconn()
+            pool.putconn(in_use)
+            result = {
+                "inherited": connection.id in (idle.id, in_use.id),
+                "closed": idle.closed or in_use.closed,
+                "stats": pool.stats(),
+            }
+            os.write(write_end, json.dumps(result).encode())
+        finally:
+            os._exit(0)
+
+    os.close(write_end)
+    with os.fdopen(read_end) as pipe:
+        result = json.load(pipe)
+    os.waitpid(pid, 0)
+
+    assert not result["inherited"]
+    assert not result["closed"]
+    assert result["stats"]["size"] == 1
+    assert result["stats"]["checked_out"] == 1
+
+    # The parent's pool is untouched.
+    pool.putconn(in_use)
+    assert pool.stats()["idle"] == 2
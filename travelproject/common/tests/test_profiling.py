@@ -0,0 +1,21 @@
+import pytest
+
+from travelproject.common.profiling import profile_file_view
+
+
+@pytest.mark.parametrize(
+    "filename, view_name",
+    [
+        ("users.user_list.1234.collapsed", "users.user_list"),
+        ("index.7.collapsed", "index"),
+        # Merged output, and files that aren't profiles.
+        ("users.user_list.collapsed", None),
+        ("x.collapsed", None),
+        (".collapsed", None),
+        ("1234.collapsed", None),
+        ("users.user_list.1234.top.txt", None),
+        ("users.user_list.1234.collapsed.partial", None),
+    ],
+)
+def test_profile_file_view(filename, view_name):
+    assert profile_file_view(filename) == view_name
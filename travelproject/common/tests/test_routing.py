@@ -0,0 +1,133 @@
+import re
+
+import pytest
+from django.http import HttpResponse
+from django.urls import Resolver404, URLResolver, get_resolver, include, path
+
+from travelproject.common.routing import TrieURLResolver, trie_path
+
+SAMPLE_VALUES = {
+    "int": ["7", "0"],
+    "slug": ["a-slug"],
+    "str": ["value"],
+    "uuid": ["12345678-1234-5678-1234-567812345678"],
+}
+
+NOT_FOUND_SUFFIXES = ["missing/", "7x/", "-1/", "a/b/c/", "", "//"]
+
+
+def view(request, **kwargs):
+    return HttpResponse()
+
+
+def other_view(request, **kwargs):
+    return HttpResponse()
+
+
+# Overlapping routes, where Django's first-declared-wins order matters, and
+# nested namespaces with default kwargs.
+inner_patterns = [
+    path("<int:pk>/", view, {"source": "inner"}, name="detail"),
+    path("<slug:slug>/", other_view, name="by_slug"),
+]
+
+synthetic_patterns = [
+    path("items/<str:name>/", view, name="item_by_name"),
+    path("items/<int:pk>/", other_view, name="item_by_pk"),
+    path("items/new/", view, name="item_new"),
+    path("files/<uuid:file_id>/", view, name="file"),
+    path("nested/", include((inner_patterns, "inner"), namespace="inner")),
+    path("scoped/", include((inner_patterns, "inner"), namespace="scoped"), {"a": 1}),
+    path("<int:year>/<int:month>/", view, name="archive"),
+    path("", view, name="index"),
+]
+
+
+def django_resolver(trie: TrieURLResolver) -> URLResolver:
+    return URLResolver(
+        trie.pattern,
+        trie.urlconf_name,
+        trie.default_kwargs,
+        trie.app_name,
+        trie.namespace,
+    )
+
+
+def routes(patterns, prefix=""):
+    for pattern in patterns:
+        route = prefix + str(pattern.pattern)
+
+        if isinstance(pattern, URLResolver):
+            yield from routes(pattern.url_patterns, route)
+        else:
+            yield route
+
+
+def sample_paths(route: str):
+    urls = [""]
+
+    for part in re.split(r"(<[^>]+>)", route):
+        if part.startswith("<"):
+            converter = part[1:-1].split(":")[0] if ":" in part else "str"
+            values = SAMPLE_VALUES[converter]
+        else:
+            values = [part]
+
+        urls = [url + value for url in urls for value in values]
+
+    return urls
+
+
+def trie_resolvers():
+    resolvers = [
+        pattern
+        for pattern in get_resolver().url_patterns
+        if isinstance(pattern, TrieURLResolver)
+    ]
+
+    return [
+        *resolvers,
+        trie_path("synthetic/", include(synthetic_patterns)),
+    ]
+
+
+def resolve(resolver, url):
+    try:
+        match = resolver.resolve(url)
+    except Resolver404:
+        return None
+
+    return {
+        "func": match.func,
+        "args": match.args,
+        "kwargs": match.kwargs,
+        "view_name": match.view_name,
+        "route": match.route,
+        "app_names": match.app_names,
+        "namespaces": match.namespaces,
+    }
+
+
+@pytest.mark.parametrize("trie", trie_resolvers(), ids=str)
+def test_trie_resolves_like_django(trie):
+    django = django_resolver(trie)
+    prefix = str(trie.pattern)
+
+    urls = [
+        prefix + sample
+        for route in routes(trie.url_patterns)
+        for sample in sample_paths(route)
+    ]
+    not_found = [
+        url + suffix for url in {prefix, *urls} for suffix in NOT_FOUND_SUFFIXES
+    ]
+
+    # Resolved by the trie rather than by the fallback to Django.
+    assert trie.get_trie() is not None
+
+    for url in [*urls, *not_found]:
+        assert resolve(trie, url) == resolve(django, url), url
+
+    # Every declared route is reachable, and the 404s really are 404s.
+    assert all(resolve(trie, url) is not None for url in urls)
+    assert any(resolve(trie, url) is None for url in not_found)
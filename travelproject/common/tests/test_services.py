@@ -0,0 +1,103 @@
+import pytest
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import ValidationError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from travelproject.common.authentication import access_user_cache_key
+from travelproject.common.services import model_bulk_update, model_update
+from travelproject.users.models import User
+from travelproject.users.tests.factories import UserFactory
+
+pytestmark = pytest.mark.django_db
+
+FIELDS = ["first_name", "last_name", "email"]
+
+
+def test_update_writes_only_changed_fields():
+    user = UserFactory(first_name="Before", last_name="Same")
+    updated_at = user.updated_at
+
+    with CaptureQueriesContext(connection) as queries:
+        user, has_updated = model_update(
+            instance=user,
+            fields=FIELDS,
+            data={"first_name": "After", "last_name": "Same", "email": user.email},
+            exclude=["password"],
+        )
+
+    assert has_updated
+    assert user.updated_at > updated_at
+
+    # No uniqueness query for the unchanged email, and only the changed
+    # column plus updated_at is written.
+    [update] = [query["sql"] for query in queries if "UPDATE" in query["sql"]]
+    assert len([query for query in queries if "SELECT" in query["sql"]]) == 0
+    assert '"first_name"' in update and '"updated_at"' in update
+    assert '"last_name"' not in update and '"email"' not in update
+
+
+def test_update_without_changes_writes_nothing():
+    user = UserFactory()
+    updated_at = user.updated_at
+
+    with CaptureQueriesContext(connection) as queries:
+        user, has_updated = model_update(
+            instance=user, fields=FIELDS, data={"first_name": user.first_name}
+        )
+
+    assert not has_updated
+    assert len(queries) == 0
+    assert user.updated_at == updated_at
+
+
+def test_update_validates_changed_unique_fields():
+    taken = UserFactory()
+
+    with pytest.raises(ValidationError):
+        model_update(
+            instance=UserFactory(),
+            fields=FIELDS,
+            data={"email": taken.email},
+            exclude=["password"],
+        )
+
+
+def test_bulk_update_writes_diffs_and_sends_post_save(
+    django_capture_on_commit_callbacks,
+):
+    users = UserFactory.create_batch(3, first_name="Before")
+    updated_at = users[2].updated_at
+    cache = caches[settings.AUTH_TOKEN_CACHE_ALIAS]
+    cache.set(access_user_cache_key(users[0].pk), {"first_name": "Before"})
+
+    with django_capture_on_commit_callbacks(execute=True):
+        updated = model_bulk_update(
+            updates=[
+                (users[0], {"first_name": "After"}),
+                (users[1], {"first_name": "Before"}),
+                (users[2], {"last_name": "Changed"}),
+            ],
+            fields=FIELDS,
+            exclude=["password"],
+        )
+
+    assert updated == [users[0], users[2]]
+    assert User.objects.get(pk=users[0].pk).first_name == "After"
+    assert User.objects.get(pk=users[2].pk).last_name == "Changed"
+    assert User.objects.get(pk=users[2].pk).updated_at > updated_at
+
+    # The users' post_save receiver dropped their cached copies.
+    assert cache.get(access_user_cache_key(users[0].pk)) is None
+
+
+def test_bulk_update_rejects_duplicated_unique_values():
+    users = UserFactory.create_batch(2)
+
+    with pytest.raises(ValidationError):
+        model_bulk_update(
+            updates=[(user, {"email": "same@example.com"}) for user in users],
+            fields=FIELDS,
+            exclude=["password"],
+        )
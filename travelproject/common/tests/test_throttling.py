@@ -0,0 +1,78 @@
+import pytest
+from django.contrib.auth.models import AnonymousUser
+from django.test import RequestFactory
+
+from travelproject.common.throttling import (
+    ScopedSlidingWindowThrottle,
+    SlidingWindowThrottle,
+)
+
+
+class MinuteThrottle(SlidingWindowThrottle):
+    rate = "3/min"
+    scope = "test"
+
+    def __init__(self, now):
+        super().__init__()
+        self.now = now
+
+    def timer(self):
+        return self.now
+
+    def get_cache_key(self, request, view):
+        return "throttle_test_client"
+
+
+def attempt(now: float) -> bool:
+    return MinuteThrottle(now).allow_request(RequestFactory().get("/"), None)
+
+
+def test_limits_within_a_window():
+    assert [attempt(600 + second) for second in range(5)] == [
+        True,
+        True,
+        True,
+        False,
+        False,
+    ]
+
+
+def test_rejected_requests_are_not_counted():
+    for second in range(3):
+        assert attempt(600 + second)
+
+    # A client hammering the endpoint while throttled...
+    for second in range(3, 60):
+        assert not attempt(600 + second)
+
+    # ...only has the three allowed requests count against it in the next
+    # window, whose weight has decayed enough after a third of it.
+    assert not attempt(660 + 19)
+    assert attempt(660 + 21)
+
+
+def test_wait_until_the_previous_window_decays():
+    for second in range(3):
+        attempt(600 + second)
+
+    throttle = MinuteThrottle(660)
+    assert not throttle.allow_request(RequestFactory().get("/"), None)
+    assert throttle.wait() == pytest.approx(20)
+
+
+def test_spoofed_forwarded_for_shares_the_client_limit():
+    class LoginView:
+        throttle_scope = "login"
+
+    def login_attempt(forwarded_for: str) -> bool:
+        request = RequestFactory().post(
+            "/", HTTP_X_FORWARDED_FOR=forwarded_for, REMOTE_ADDR="203.0.113.7"
+        )
+        request.user = AnonymousUser()
+
+        return ScopedSlidingWindowThrottle().allow_request(request, LoginView())
+
+    # Every request claims another origin, but all come from one socket.
+    allowed = [login_attempt(f"198.51.100.{n}") for n in range(15)]
+
+    assert allowed == [True] * 10 + [False] * 5
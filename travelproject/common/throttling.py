@@ -0,0 +1,125 @@
+from typing import Optional
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework.settings import api_settings
+from rest_framework.throttling import SimpleRateThrottle
+
+
+class SlidingWindowThrottle(SimpleRateThrottle):
+    """
+    Sliding window counter: the current fixed window's count plus the previous
+    window's count weighted by how much of it still overlaps the sliding
+    window. Counters are bumped with the cache's atomic ``incr``, so the
+    limit holds across workers when THROTTLE_CACHE_ALIAS points to Redis.
+
+    Unlike ``SimpleRateThrottle`` it keeps two integers per client instead of
+    a list of timestamps that is read and rewritten on every request. Only
+    allowed requests are counted, so a client retrying while throttled is
+    let through again once the window has moved on.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.cache = caches[settings.THROTTLE_CACHE_ALIAS]
+        self.estimate = 0.0
+        self.window_elapsed = 0.0
+
+    def increment(self, key: str) -> int:
+        timeout = self.duration * 2
+
+        self.cache.add(key, 0, timeout)
+
+        try:
+            return self.cache.incr(key)
+        except ValueError:
+            # The counter expired between ``add`` and ``incr``.
+            self.cache.add(key, 1, timeout)
+            return 1
+
+    def decrement(self, key: str) -> None:
+        try:
+            self.cache.decr(key)
+        except ValueError:
+            # The counter expired in the meantime; nothing to take back.
+            pass
+
+    def allow_request(self, request, view) -> bool:
+        if self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        now = self.timer()
+        window = int(now // self.duration)
+        self.window_elapsed = (now % self.duration) / self.duration
+
+        # Counted before checking, so concurrent requests can't all slip in
+        # under the limit, and taken back below when rejected.
+        counter_key = f"{self.key}:{window}"
+        self.current = self.increment(counter_key)
+        self.previous = self.cache.get(f"{self.key}:{window - 1}", 0)
+        self.estimate = self.previous * (1 - self.window_elapsed) + self.current
+
+        if self.estimate <= self.num_requests:
+            return True
+
+        self.decrement(counter_key)
+
+        return False
+
+    def wait(self) -> Optional[float]:
+        if self.current > self.num_requests:
+            # Only the next window resets the current count.
+            return (1 - self.window_elapsed) * self.duration
+
+        # Wait until the previous window's weight has decayed enough.
+        needed = 1 - (self.num_requests - self.current) / self.previous
+
+        return max(needed - self.window_elapsed, 0) * self.duration
+
+
+class ScopedSlidingWindowThrottle(SlidingWindowThrottle):
+    """
+    Limits by ``view.throttle_scope`` with the rate from
+    ``DEFAULT_THROTTLE_RATES``, per user when authenticated, otherwise per IP.
+    """
+
+    scope_attr = "throttle_scope"
+
+    def __init__(self):
+        # The scope and rate are only known once the view is available.
+        pass
+
+    def allow_request(self, request, view) -> bool:
+        self.scope = getattr(view, self.scope_attr, None)
+
+        if not self.scope:
+            return True
+
+        self.rate = self.get_rate()
+        self.num_requests, self.duration = self.parse_rate(self.rate)
+        self.cache = caches[settings.THROTTLE_CACHE_ALIAS]
+
+        return super().allow_request(request, view)
+
+    def get_rate(self) -> Optional[str]:
+        # Read at request time, unlike ``THROTTLE_RATES`` which is bound at
+        # import, so rates follow ``override_settings``.
+        try:
+            return api_settings.DEFAULT_THROTTLE_RATES[self.scope]
+        except KeyError:
+            raise ImproperlyConfigured(
+                f"No default throttle rate set for '{self.scope}' scope"
+            )
+
+    def get_cache_key(self, request, view) -> str:
+        if request.user and request.user.is_authenticated:
+            ident = request.user.pk
+        else:
+            ident = self.get_ident(request)
+
+        return self.cache_format % {"scope": self.scope, "ident": ident}
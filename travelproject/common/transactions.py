@@ -0,0 +1,23 @@
+from django.db import transaction
+
+
+class AtomicMutationsMixin:
+    """
+    Runs unsafe HTTP methods in a single transaction, leaving reads in
+    autocommit. Error responses roll back, since DRF turns exceptions into
+    responses before they could reach ``transaction.atomic``.
+    """
+
+    atomic_methods = ("POST", "PUT", "PATCH", "DELETE")
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method not in self.atomic_methods:
+            return super().dispatch(request, *args, **kwargs)
+
+        with transaction.atomic():
+            response = super().dispatch(request, *args, **kwargs)
+
+            if response.status_code >= 400:
+                transaction.set_rollback(True)
+
+        return response
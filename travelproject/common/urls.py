@@ -0,0 +1,9 @@
+from django.urls import path
+from travelproject.common.apis import DatabasePoolStatsApi, MetricsApi
+
+app_name = "common"
+
+urlpatterns = [
+    path("db-pool/", DatabasePoolStatsApi.as_view(), name="db_pool_stats"),
+    path("metrics/", MetricsApi.as_view(), name="metrics"),
+]
@@ -0,0 +1,45 @@
+from typing import Iterator
+
+from django.urls import URLPattern, URLResolver, get_resolver
+from rest_framework import serializers
+
+from travelproject.common.routing import TrieURLResolver
+
+SERIALIZER_ATTRS = ("InputSerializer", "OutputSerializer", "FilterSerializer")
+
+
+def _view_classes(patterns) -> Iterator[type]:
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            yield from _view_classes(pattern.url_patterns)
+        elif isinstance(pattern, URLPattern):
+            view_class = getattr(pattern.callback, "view_class", None)
+            if view_class is not None:
+                yield view_class
+
+
+def warmup() -> None:
+    """
+    Does the work Django and DRF otherwise leave to the first request:
+    imports every view through the URLconf, populates the resolver's reverse
+    lookups and route tries and builds the fields of each view's nested
+    serializers.
+
+    It does not touch the database, so it can run in the gunicorn master
+    before workers fork.
+    """
+    resolver = get_resolver()
+    resolver.reverse_dict
+
+    for pattern in resolver.url_patterns:
+        if isinstance(pattern, TrieURLResolver):
+            pattern.get_trie()
+
+    for view_class in _view_classes(resolver.url_patterns):
+        for attr in SERIALIZER_ATTRS:
+            serializer_class = getattr(view_class, attr, None)
+
+            if isinstance(serializer_class, type) and issubclass(
+                serializer_class, serializers.Serializer
+            ):
+                serializer_class().fields
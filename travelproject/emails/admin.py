@@ -0,0 +1,11 @@
+from django.contrib import admin
+
+from travelproject.emails.models import Email
+
+
+@admin.register(Email)
+class EmailAdmin(admin.ModelAdmin):
+    list_display = ("id", "to", "subject", "status", "attempts", "sent_at")
+    list_filter = ("status",)
+    search_fields = ("to", "subject")
+    readonly_fields = ("attempts", "next_attempt_at", "last_error", "sent_at")
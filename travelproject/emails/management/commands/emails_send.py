@@ -0,0 +1,39 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from travelproject.emails.services import email_claim, email_send_batch
+
+
+class Command(BaseCommand):
+    help = "Send queued outbox emails in batches, retrying failures with backoff."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size", type=int, default=settings.EMAIL_OUTBOX_BATCH_SIZE
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=settings.EMAIL_OUTBOX_POLL_INTERVAL,
+            help="Seconds to sleep when the outbox is empty.",
+        )
+        parser.add_argument(
+            "--once", action="store_true", help="Exit once the outbox is drained."
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            emails = email_claim(batch_size=options["batch_size"])
+
+            if not emails:
+                if options["once"]:
+                    return
+
+                time.sleep(options["poll_interval"])
+                continue
+
+            sent = email_send_batch(emails=emails)
+
+            self.stdout.write(f"Sent {sent} of {len(emails)} emails.")
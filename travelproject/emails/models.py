@@ -0,0 +1,41 @@
+from django.db import models
+from django.utils import timezone
+
+from travelproject.common.models import BaseModel
+
+
+class Email(BaseModel):
+    class Status(models.TextChoices):
+        READY = "READY", "Ready"
+        SENDING = "SENDING", "Sending"
+        SENT = "SENT", "Sent"
+        FAILED = "FAILED", "Failed"
+
+    status = models.CharField(
+        max_length=255, choices=Status.choices, default=Status.READY
+    )
+
+    to = models.EmailField()
+    subject = models.CharField(max_length=255)
+
+    plain_text = models.TextField()
+    html = models.TextField(blank=True)
+
+    attempts = models.PositiveSmallIntegerField(default=0)
+    # For READY rows: when to retry. For SENDING rows: when the worker's
+    # claim expires and another worker may pick the row up.
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+
+    sent_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["status", "next_attempt_at"],
+                name="emails_status_next_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.subject} -> {self.to}"
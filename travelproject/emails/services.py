@@ -0,0 +1,146 @@
+import logging
+from datetime import timedelta
+from typing import Dict, List
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from travelproject.emails.models import Email
+
+logger = logging.getLogger(__name__)
+
+
+def email_queue(*, to: str, subject: str, plain_text: str, html: str = "") -> Email:
+    """
+    Stores the email in the outbox. Called inside the caller's transaction,
+    the email is only sent if that transaction commits.
+    """
+    email = Email(to=to, subject=subject, plain_text=plain_text, html=html)
+    email.full_clean()
+    email.save()
+    logger.info("Queued email %s.", email.pk, extra={"email_id": email.pk})
+
+    return email
+
+
+def email_queue_many(*, emails: List[Dict[str, str]]) -> List[Email]:
+    """
+    ``email_queue`` for many emails, each a dict of its arguments, stored
+    with a single INSERT.
+    """
+    queued = [Email(**fields) for fields in emails]
+
+    for email in queued:
+        email.full_clean()
+
+    Email.objects.bulk_create(queued)
+    logger.info("Queued %s emails.", len(queued))
+
+    return queued
+
+
+def email_claim(*, batch_size: int) -> List[Email]:
+    """
+    Marks up to ``batch_size`` due emails as SENDING for this worker. Claims
+    expire after EMAIL_OUTBOX_CLAIM_TIMEOUT, so emails of a crashed worker
+    are picked up again, unless that was their last attempt.
+    """
+    now = timezone.now()
+
+    with transaction.atomic():
+        # Claims that expired on the last attempt aren't retried.
+        Email.objects.filter(
+            status=Email.Status.SENDING,
+            next_attempt_at__lte=now,
+            attempts__gte=settings.EMAIL_OUTBOX_MAX_ATTEMPTS,
+        ).update(status=Email.Status.FAILED, updated_at=now)
+
+        emails = list(
+            Email.objects.select_for_update(skip_locked=True)
+            .filter(
+                status__in=[Email.Status.READY, Email.Status.SENDING],
+                next_attempt_at__lte=now,
+            )
+            .order_by("next_attempt_at")[:batch_size]
+        )
+
+        if emails:
+            Email.objects.filter(id__in=[email.id for email in emails]).update(
+                status=Email.Status.SENDING,
+                attempts=F("attempts") + 1,
+                next_attempt_at=now
+                + timedelta(seconds=settings.EMAIL_OUTBOX_CLAIM_TIMEOUT),
+                updated_at=now,
+            )
+
+    for email in emails:
+        email.attempts += 1
+
+    return emails
+
+
+def email_sent(*, email: Email) -> None:
+    email.status = Email.Status.SENT
+    email.sent_at = timezone.now()
+    email.last_error = ""
+    email.save(update_fields=["status", "sent_at", "last_error", "updated_at"])
+
+
+def email_failed(*, email: Email, error: str) -> None:
+    if email.attempts >= settings.EMAIL_OUTBOX_MAX_ATTEMPTS:
+        email.status = Email.Status.FAILED
+    else:
+        # 1x, 2x, 4x, ... the base delay between attempts.
+        delay = settings.EMAIL_OUTBOX_RETRY_DELAY * 2 ** (email.attempts - 1)
+
+        email.status = Email.Status.READY
+        email.next_attempt_at = timezone.now() + timedelta(seconds=delay)
+
+    email.last_error = error
+    email.save(update_fields=["status", "next_attempt_at", "last_error", "updated_at"])
+
+
+def email_send_batch(*, emails: List[Email]) -> int:
+    """
+    Sends the claimed emails over a single backend connection and records the
+    outcome of each. Returns the number of emails sent.
+    """
+    sent = 0
+    connection = get_connection()
+
+    try:
+        connection.open()
+    except Exception as exc:
+        for email in emails:
+            email_failed(email=email, error=repr(exc))
+
+        return 0
+
+    try:
+        for email in emails:
+            message = EmailMultiAlternatives(
+                subject=email.subject,
+                body=email.plain_text,
+                to=[email.to],
+                connection=connection,
+            )
+
+            if email.html:
+                message.attach_alternative(email.html, "text/html")
+
+            try:
+                message.send()
+            except Exception as exc:
+                email_failed(email=email, error=repr(exc))
+            else:
+                # Recorded right away, so an email isn't sent again if the
+                # worker dies before the end of the batch.
+                email_sent(email=email)
+                sent += 1
+    finally:
+        connection.close()
+
+    return sent
@@ -0,0 +1,141 @@
+from datetime import timedelta
+
+import pytest
+from django.core.mail.backends.locmem import EmailBackend
+from django.utils import timezone
+
+from travelproject.emails.models import Email
+from travelproject.emails.services import (
+    email_claim,
+    email_failed,
+    email_queue,
+    email_send_batch,
+)
+
+pytestmark = pytest.mark.django_db
+
+
+class RefusingBackend(EmailBackend):
+    """Refuses addresses at refused.example.com, like a rejecting relay."""
+
+    def send_messages(self, messages):
+        for message in messages:
+            if message.to[0].endswith("@refused.example.com"):
+                raise ConnectionRefusedError(message.to[0])
+
+        return super().send_messages(messages)
+
+
+class CrashingBackend(EmailBackend):
+    """Kills the worker on addresses at crash.example.com."""
+
+    def send_messages(self, messages):
+        for message in messages:
+            if message.to[0].endswith("@crash.example.com"):
+                raise SystemExit(1)
+
+        return super().send_messages(messages)
+
+
+def queue(to: str, **fields) -> Email:
+    email = email_queue(to=to, subject="Hello", plain_text=f"Hi {to}")
+
+    if fields:
+        Email.objects.filter(pk=email.pk).update(**fields)
+
+    return email
+
+
+def status(email: Email) -> str:
+    return Email.objects.get(pk=email.pk).status
+
+
+def test_claim_takes_due_emails():
+    due = queue("due@example.com")
+    queue("later@example.com", next_attempt_at=timezone.now() + timedelta(hours=1))
+    queue("sent@example.com", status=Email.Status.SENT)
+
+    assert email_claim(batch_size=10) == [due]
+
+    claimed = Email.objects.get(pk=due.pk)
+    assert claimed.status == Email.Status.SENDING
+    assert claimed.attempts == 1
+    assert claimed.next_attempt_at > timezone.now()
+
+    # Claimed rows belong to their worker until the claim expires.
+    assert email_claim(batch_size=10) == []
+
+
+def test_expired_claims_are_taken_until_the_last_attempt(settings):
+    expired = timezone.now() - timedelta(seconds=1)
+    retry = queue(
+        "retry@example.com",
+        status=Email.Status.SENDING,
+        attempts=settings.EMAIL_OUTBOX_MAX_ATTEMPTS - 1,
+        next_attempt_at=expired,
+    )
+    last = queue(
+        "last@example.com",
+        status=Email.Status.SENDING,
+        attempts=settings.EMAIL_OUTBOX_MAX_ATTEMPTS,
+        next_attempt_at=expired,
+    )
+
+    assert email_claim(batch_size=10) == [retry]
+    assert status(last) == Email.Status.FAILED
+
+
+def test_send_batch_sends_and_marks_emails(settings, mailoutbox):
+    settings.EMAIL_BACKEND = f"{__name__}.RefusingBackend"
+    ok = queue("ok@example.com")
+    refused = queue("no@refused.example.com")
+
+    assert email_send_batch(emails=email_claim(batch_size=10)) == 1
+
+    assert [message.to for message in mailoutbox] == [["ok@example.com"]]
+    assert mailoutbox[0].body == "Hi ok@example.com"
+
+    ok = Email.objects.get(pk=ok.pk)
+    assert ok.status == Email.Status.SENT
+    assert ok.sent_at is not None
+
+    refused = Email.objects.get(pk=refused.pk)
+    assert refused.status == Email.Status.READY
+    assert "ConnectionRefusedError" in refused.last_error
+
+
+def test_sent_emails_are_recorded_before_the_batch_ends(settings, mailoutbox):
+    settings.EMAIL_BACKEND = f"{__name__}.CrashingBackend"
+    first = queue("first@example.com")
+    queue("boom@crash.example.com", next_attempt_at=timezone.now())
+
+    with pytest.raises(SystemExit):
+        email_send_batch(emails=email_claim(batch_size=10))
+
+    assert len(mailoutbox) == 1
+    assert status(first) == Email.Status.SENT
+
+
+def test_failed_attempts_back_off_then_fail(settings):
+    settings.EMAIL_OUTBOX_RETRY_DELAY = 60
+    email = queue("retry@example.com")
+
+    for attempts, delay in [(1, 60), (2, 120), (3, 240)]:
+        email.attempts = attempts
+        before = timezone.now()
+
+        email_failed(email=email, error="timeout")
+
+        email = Email.objects.get(pk=email.pk)
+        assert email.status == Email.Status.READY
+        assert email.last_error == "timeout"
+        assert (
+            timedelta(seconds=delay)
+            <= email.next_attempt_at - before
+            < timedelta(seconds=delay + 5)
+        )
+
+    email.attempts = settings.EMAIL_OUTBOX_MAX_ATTEMPTS
+    email_failed(email=email, error="timeout")
+
+    assert status(email) == Email.Status.FAILED
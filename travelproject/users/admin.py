@@ -1,13 +1,33 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 
+from travelproject.common.admin import EstimatedCountPaginator, csv_export_action
 from travelproject.users.models import User
+from travelproject.users.services import user_search
 
 
 @admin.register(User)
 class UserAdmin(BaseUserAdmin):
     ordering = ["-id"]
 
+    # One estimated count per page instead of two exact COUNT(*)s.
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    actions = [
+        csv_export_action(
+            fields=(
+                "id",
+                "email",
+                "first_name",
+                "last_name",
+                "is_active",
+                "created_at",
+            ),
+            filename="users.csv",
+        )
+    ]
+
     list_display = (
         "email",
         "first_name",
@@ -18,15 +38,25 @@ class UserAdmin(BaseUserAdmin):
         "updated_at",
     )
 
-    search_fields = ("email",)
+    search_fields = ("email", "first_name", "last_name")
 
     list_filter = ("is_active", "is_superuser")
 
     fieldsets = (
         ("Personal Info", {"fields": ("first_name", "last_name", "email")}),
         ("Booleans", {"fields": ("is_active", "is_superuser")}),
-        ("Timestamps", {"fields": ("last_login", "created_at", "updated_at")}),
+        (
+            "Timestamps",
+            {"fields": ("last_login", "created_at", "updated_at", "deleted_at")},
+        ),
         ("Password", {"fields": ("password",)}),
     )
 
-    readonly_fields = ("last_login", "created_at", "updated_at")
+    readonly_fields = ("last_login", "created_at", "updated_at", "deleted_at")
+
+    def get_search_results(self, request, queryset, search_term):
+        search_term = search_term.strip()
+        if not search_term:
+            return queryset, False
+
+        return user_search(query=search_term, queryset=queryset), False
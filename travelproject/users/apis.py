@@ -1,21 +1,55 @@
-from django.shortcuts import get_object_or_404
+import json
+
+from django.conf import settings
+from django.http import HttpResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
 
 from rest_framework import serializers, status
+from rest_framework.pagination import LimitOffsetPagination
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from travelproject.users.models import User
+from travelproject.common.authentication import SignedTokenAuthentication
+from travelproject.common.db.routers import ReplicaReadsMixin
+from travelproject.common.idempotency import IdempotencyMixin
+from travelproject.common.metrics import record_timing
+from travelproject.common.pagination import KeysetPagination, get_paginated_response
+from travelproject.common.permissions import IsSuperUser
+from travelproject.common.renderers import FastJSONRenderer
+from travelproject.common.serializers import ValuesSerializer
+from travelproject.common.throttling import ScopedSlidingWindowThrottle
+from travelproject.common.transactions import AtomicMutationsMixin
+from travelproject.users.cache import (
+    UserPayload,
+    user_payload_etag,
+    user_payload_from_user,
+    user_payload_get,
+)
 from travelproject.users.services import (
+    user_activate,
+    user_bulk_create,
     user_change_password,
     user_create,
     user_delete,
+    user_export,
     user_list,
+    user_login,
+    user_search,
+    user_token_refresh,
     user_update,
 )
 
 
-class UserAddApi(APIView):
+class UserOutputSerializer(ValuesSerializer):
+    fields = ("id", "email", "first_name", "last_name")
+
+
+class UserAddApi(IdempotencyMixin, AtomicMutationsMixin, APIView):
+    throttle_classes = [ScopedSlidingWindowThrottle]
+    throttle_scope = "user_create"
+
     class InputSerializer(serializers.Serializer):
         first_name = serializers.CharField()
         last_name = serializers.CharField()
@@ -23,71 +57,144 @@ class UserAddApi(APIView):
         password = serializers.CharField()
         re_password = serializers.CharField()
 
-    class OutputSerializer(serializers.Serializer):
-        id = serializers.IntegerField()
-        email = serializers.CharField()
-        first_name = serializers.CharField()
-        last_name = serializers.CharField()
+    OutputSerializer = UserOutputSerializer
 
     def post(self, request, *args, **kwargs):
         serializer = self.InputSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
 
-        created_user = user_create(
-            email=serializer.get("email"),
-            first_name=serializer.get("first_name"),
-            last_name=serializer.get("last_name"),
-            password=serializer.get("password"),
-            re_password=serializer.get("re_password"),
-        )
+        created_user = user_create(**serializer.validated_data)
 
         return Response(self.OutputSerializer(created_user).data)
 
 
-class UserMeApi(APIView):
+class UserBulkAddApi(APIView):
+    # Not atomic: every batch commits on its own, after its passwords are
+    # hashed. Imports larger than USER_BULK_CREATE_API_MAX_ROWS, which must
+    # hash within the request timeout, go through manage.py users_import.
+    permission_classes = [IsAuthenticated, IsSuperUser]
+
+    class InputSerializer(serializers.Serializer):
+        users = serializers.ListField(
+            child=serializers.DictField(),
+            allow_empty=False,
+            max_length=settings.USER_BULK_CREATE_API_MAX_ROWS,
+        )
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.InputSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        result = user_bulk_create(
+            rows=serializer.validated_data["users"],
+            batch_size=settings.USER_BULK_CREATE_BATCH_SIZE,
+        )
+
+        return Response(data=result, status=status.HTTP_201_CREATED)
+
+
+class UserPayloadMixin:
+    """
+    Serves a user as pre-rendered JSON bytes from the versioned payload cache,
+    answering conditional requests with 304 Not Modified.
+    """
+
+    OutputSerializer = UserOutputSerializer
+
+    @classmethod
+    def render_user(cls, user) -> bytes:
+        with record_timing("serialize"):
+            return FastJSONRenderer().render(cls.OutputSerializer(user).data)
+
+    @classmethod
+    def payload_response(cls, request, user_id: int, payload: UserPayload):
+        content, version = payload
+
+        etag = user_payload_etag(user_id, version)
+        last_modified = int(version.timestamp())
+
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if response is None:
+            response = HttpResponse(content, content_type="application/json")
+
+        response["ETag"] = etag
+        response["Last-Modified"] = http_date(last_modified)
+
+        return response
+
+
+class UserMeApi(ReplicaReadsMixin, UserPayloadMixin, APIView):
     permission_classes = [IsAuthenticated]
 
-    class OutputSerializer(serializers.Serializer):
-        id = serializers.IntegerField()
-        email = serializers.CharField()
-        first_name = serializers.CharField()
-        last_name = serializers.CharField()
+    def get(self, request, *args, **kwargs):
+        payload = user_payload_from_user(user=request.user, render=self.render_user)
+        return self.payload_response(request, request.user.id, payload)
+
+
+class UserDetailApi(ReplicaReadsMixin, UserPayloadMixin, APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, user_id: int, *args, **kwargs):
+        payload = user_payload_get(user_id=user_id, render=self.render_user)
+        return self.payload_response(request, user_id, payload)
+
+
+class UserListApi(ReplicaReadsMixin, APIView):
+    permission_classes = [IsAuthenticated]
+
+    OutputSerializer = UserOutputSerializer
 
     def get(self, request, *args, **kwargs):
-        return Response(
-            self.OutputSerializer(request.user, context={"request": request}).data
+        pagination_class = LimitOffsetPagination
+        if request.query_params.get("pagination") == "keyset":
+            pagination_class = KeysetPagination
+
+        return get_paginated_response(
+            pagination_class=pagination_class,
+            serializer_class=self.OutputSerializer,
+            queryset=user_list().public_values("created_at"),
+            request=request,
+            view=self,
         )
 
 
-class UserDetailApi(APIView):
+class UserSearchApi(ReplicaReadsMixin, APIView):
     permission_classes = [IsAuthenticated]
 
-    class OutputSerializer(serializers.Serializer):
-        id = serializers.IntegerField()
-        email = serializers.CharField()
-        first_name = serializers.CharField()
-        last_name = serializers.CharField()
+    class FilterSerializer(serializers.Serializer):
+        q = serializers.CharField(min_length=2, max_length=128)
 
-    def get(self, request, user_id: int, *args, **kwargs):
-        user = get_object_or_404(User, id=user_id)
-        return Response(self.OutputSerializer(user).data)
+    OutputSerializer = UserOutputSerializer
+
+    def get(self, request, *args, **kwargs):
+        filters = self.FilterSerializer(data=request.query_params)
+        filters.is_valid(raise_exception=True)
+
+        return get_paginated_response(
+            pagination_class=LimitOffsetPagination,
+            serializer_class=self.OutputSerializer,
+            queryset=user_search(query=filters.validated_data["q"]).public_values(),
+            request=request,
+            view=self,
+        )
 
 
-class UserListApi(APIView):
+class UserExportApi(APIView):
     permission_classes = [IsAuthenticated]
 
-    class OutputSerializer(serializers.Serializer):
-        id = serializers.IntegerField()
-        email = serializers.CharField()
-        first_name = serializers.CharField()
-        last_name = serializers.CharField()
+    fields = UserOutputSerializer.fields
+    chunk_size = 2000
 
     def get(self, request, *args, **kwargs):
-        users = user_list()
-        return Response(self.OutputSerializer(users, many=True).data)
+        rows = user_export(chunk_size=self.chunk_size)
+        lines = (json.dumps(dict(zip(self.fields, row))) + "\n" for row in rows)
 
+        return StreamingHttpResponse(lines, content_type="application/x-ndjson")
 
-class UserUpdateApi(APIView):
+
+class UserUpdateApi(AtomicMutationsMixin, APIView):
     permission_classes = [IsAuthenticated]
 
     class InputSerializer(serializers.Serializer):
@@ -95,11 +202,7 @@ class UserUpdateApi(APIView):
         first_name = serializers.CharField()
         last_name = serializers.CharField()
 
-    class OutputSerializer(serializers.Serializer):
-        id = serializers.IntegerField()
-        email = serializers.CharField()
-        first_name = serializers.CharField()
-        last_name = serializers.CharField()
+    OutputSerializer = UserOutputSerializer
 
     def put(self, request, *args, **kwargs):
         serializer = self.InputSerializer(data=request.data)
@@ -108,7 +211,7 @@ class UserUpdateApi(APIView):
         return Response(data=self.OutputSerializer(user).data)
 
 
-class UserDeleteApi(APIView):
+class UserDeleteApi(AtomicMutationsMixin, APIView):
     permission_classes = [IsAuthenticated]
 
     def delete(self, request, *args, **kwargs):
@@ -116,13 +219,15 @@ class UserDeleteApi(APIView):
         return Response(status=status.HTTP_200_OK)
 
 
-class UserChangePasswordApi(APIView):
+class UserChangePasswordApi(AtomicMutationsMixin, APIView):
     permission_classes = [IsAuthenticated]
+    throttle_classes = [ScopedSlidingWindowThrottle]
+    throttle_scope = "user_change_password"
 
     class InputSerializer(serializers.Serializer):
         old_password = serializers.CharField()
         new_password = serializers.CharField()
-        re_password = serializers.EmailField()
+        re_password = serializers.CharField()
 
     def post(self, request, *args, **kwargs):
         serializer = self.InputSerializer(data=request.data)
@@ -136,3 +241,63 @@ class UserChangePasswordApi(APIView):
         )
 
         return Response(status=status.HTTP_200_OK)
+
+
+class UserTokenMixin:
+    """
+    Token endpoints take credentials in the body, so they skip authentication
+    but still answer failures with 401 and a ``Bearer`` challenge.
+    """
+
+    authentication_classes = []
+
+    def get_authenticate_header(self, request):
+        return SignedTokenAuthentication.keyword
+
+
+class UserLoginApi(UserTokenMixin, AtomicMutationsMixin, APIView):
+    throttle_classes = [ScopedSlidingWindowThrottle]
+    throttle_scope = "login"
+
+    class InputSerializer(serializers.Serializer):
+        email = serializers.EmailField()
+        password = serializers.CharField()
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.InputSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        tokens = user_login(**serializer.validated_data)
+
+        return Response(tokens)
+
+
+class UserActivateApi(UserTokenMixin, AtomicMutationsMixin, APIView):
+    class InputSerializer(serializers.Serializer):
+        token = serializers.CharField()
+
+    OutputSerializer = UserOutputSerializer
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.InputSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        user = user_activate(token=serializer.validated_data["token"])
+
+        return Response(self.OutputSerializer(user).data)
+
+
+class UserTokenRefreshApi(UserTokenMixin, AtomicMutationsMixin, APIView):
+    throttle_classes = [ScopedSlidingWindowThrottle]
+    throttle_scope = "login"
+
+    class InputSerializer(serializers.Serializer):
+        refresh = serializers.CharField()
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.InputSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        tokens = user_token_refresh(**serializer.validated_data)
+
+        return Response(tokens)
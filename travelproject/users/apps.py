@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class UsersConfig(AppConfig):
     name = "travelproject.users"
+
+    def ready(self):
+        from travelproject.users import signals  # noqa: F401
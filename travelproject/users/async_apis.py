@@ -0,0 +1,117 @@
+import json
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.http import Http404, HttpResponseNotAllowed, JsonResponse
+from rest_framework.exceptions import ValidationError
+
+from travelproject.common.authentication import authenticate_async
+from travelproject.users.apis import (
+    UserDetailApi,
+    UserListApi,
+    UserMeApi,
+    UserUpdateApi,
+)
+from travelproject.users.cache import user_payload_from_user, user_payload_get
+from travelproject.users.services import user_list, user_update
+
+# Async counterparts of the users APIs for ASGI deployments. Django 4.0 has
+# no async ORM yet, so each view does its database and cache work in a
+# single sync_to_async hop and keeps the event loop free for slow clients.
+
+
+def async_api(*, methods):
+    """
+    Method check, token authentication and CSRF exemption for async views.
+    Django's own view decorators wrap views in sync functions, which would
+    turn them back into sync views, so they can't be used here.
+    """
+
+    def decorator(view):
+        @wraps(view)
+        async def wrapper(request, *args, **kwargs):
+            if request.method not in methods:
+                return HttpResponseNotAllowed(methods)
+
+            user = await authenticate_async(request)
+
+            if user is None:
+                return JsonResponse(
+                    {"detail": "Authentication credentials were not provided."},
+                    status=401,
+                )
+
+            request.user = user
+
+            return await view(request, *args, **kwargs)
+
+        wrapper.csrf_exempt = True  # type: ignore[attr-defined]
+
+        return wrapper
+
+    return decorator
+
+
+@async_api(methods=["GET"])
+async def user_me_async(request):
+    payload = await sync_to_async(user_payload_from_user)(
+        user=request.user, render=UserMeApi.render_user
+    )
+
+    return UserMeApi.payload_response(request, request.user.id, payload)
+
+
+@async_api(methods=["GET"])
+async def user_detail_async(request, user_id: int):
+    try:
+        payload = await sync_to_async(user_payload_get)(
+            user_id=user_id, render=UserDetailApi.render_user
+        )
+    except Http404:
+        return JsonResponse({"detail": "Not found."}, status=404)
+
+    return UserDetailApi.payload_response(request, user_id, payload)
+
+
+def _user_list_page(offset: int, limit: int):
+    users = user_list().public_values()
+    serializer = UserListApi.OutputSerializer(users[offset : offset + limit], many=True)
+
+    return {"count": users.count(), "results": serializer.data}
+
+
+@async_api(methods=["GET"])
+async def user_list_async(request):
+    try:
+        offset = max(0, int(request.GET.get("offset", 0)))
+        limit = min(100, max(1, int(request.GET.get("limit", 10))))
+    except ValueError:
+        return JsonResponse({"detail": "Invalid offset or limit."}, status=400)
+
+    page = await sync_to_async(_user_list_page)(offset, limit)
+
+    return JsonResponse(page)
+
+
+@async_api(methods=["PUT"])
+async def user_update_async(request):
+    try:
+        data = json.loads(request.body or b"{}")
+    except ValueError:
+        return JsonResponse({"detail": "Malformed JSON."}, status=400)
+
+    serializer = UserUpdateApi.InputSerializer(data=data)
+    if not serializer.is_valid():
+        return JsonResponse(serializer.errors, status=400)
+
+    try:
+        user = await sync_to_async(user_update)(
+            user=request.user, data=serializer.validated_data
+        )
+    except ValidationError as exc:
+        return JsonResponse({"detail": exc.detail}, status=400)
+    except DjangoValidationError as exc:
+        return JsonResponse(exc.message_dict, status=400)
+
+    return JsonResponse(UserUpdateApi.OutputSerializer(user).data)
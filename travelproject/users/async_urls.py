@@ -0,0 +1,16 @@
+from django.urls import path
+from travelproject.users.async_apis import (
+    user_detail_async,
+    user_list_async,
+    user_me_async,
+    user_update_async,
+)
+
+app_name = "users_async"
+
+urlpatterns = [
+    path("me/", user_me_async, name="user_me"),
+    path("<int:user_id>/", user_detail_async, name="user_detail"),
+    path("list/", user_list_async, name="user_list"),
+    path("update/", user_update_async, name="user_update"),
+]
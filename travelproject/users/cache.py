@@ -0,0 +1,82 @@
+from datetime import datetime
+from typing import Callable, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from django.shortcuts import get_object_or_404
+
+from travelproject.common.db.routers import replica_pinned, replica_reads
+from travelproject.users.models import User
+
+UserPayload = Tuple[bytes, datetime]
+
+
+def user_version_key(user_id: int) -> str:
+    return f"users:version:{user_id}"
+
+
+def user_payload_key(user_id: int, version: datetime) -> str:
+    return f"users:payload:{user_id}:{int(version.timestamp() * 1_000_000)}"
+
+
+def user_payload_etag(user_id: int, version: datetime) -> str:
+    return f'"{user_id}-{int(version.timestamp() * 1_000_000)}"'
+
+
+def user_payload_invalidate(*, user_id: int) -> None:
+    cache.delete(user_version_key(user_id))
+
+
+def user_payload_cached(*, user_id: int) -> Optional[UserPayload]:
+    version = cache.get(user_version_key(user_id))
+    if version is None:
+        return None
+
+    payload = cache.get(user_payload_key(user_id, version))
+    if payload is None:
+        return None
+
+    return payload, version
+
+
+def user_payload_from_user(
+    *, user: User, render: Callable[[User], bytes]
+) -> UserPayload:
+    version = user.updated_at
+    payload_key = user_payload_key(user.id, version)
+
+    payload = cache.get(payload_key)
+
+    if payload is None:
+        payload = render(user)
+
+        # Payloads are keyed by version and safe to share from any database,
+        # but the version key tells every reader which one is current, and a
+        # replica may not have the latest write yet.
+        if user._state.db == DEFAULT_DB_ALIAS:
+            cache.set_many(
+                {user_version_key(user.id): version, payload_key: payload},
+                settings.USER_PAYLOAD_CACHE_TIMEOUT,
+            )
+        else:
+            cache.set(payload_key, payload, settings.USER_PAYLOAD_CACHE_TIMEOUT)
+
+    return payload, version
+
+
+def user_payload_get(*, user_id: int, render: Callable[[User], bytes]) -> UserPayload:
+    # Right after the user's own write the primary is the only fresh source.
+    if replica_pinned(user_id=user_id):
+        with replica_reads(False):
+            user = get_object_or_404(User.objects.public(), id=user_id)
+
+        return user_payload_from_user(user=user, render=render)
+
+    cached = user_payload_cached(user_id=user_id)
+    if cached is not None:
+        return cached
+
+    user = get_object_or_404(User.objects.public(), id=user_id)
+
+    return user_payload_from_user(user=user, render=render)
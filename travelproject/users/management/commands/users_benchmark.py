@@ -0,0 +1,448 @@
+import itertools
+import json
+import os
+import random
+import socket
+import statistics
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.client import HTTPConnection
+from socket import IPPROTO_TCP, TCP_NODELAY
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.core.servers.basehttp import ThreadedWSGIServer
+from django.db import connection
+from django.test.testcases import LiveServerThread
+from django.test.utils import (
+    modify_settings,
+    override_settings,
+    setup_databases,
+    teardown_databases,
+)
+from rest_framework.authtoken.models import Token
+
+from travelproject.common.hashing import password_hash
+from travelproject.users.models import User
+from travelproject.users.seeding import user_build_batch
+
+BENCH_PASSWORDS = ("Benchmark-password-1", "Benchmark-password-2")
+
+# URL prefix of the users API per server; under ASGI the async views are
+# measured, which only exist for the read endpoints (and update).
+SERVER_PREFIXES = {"wsgi": "/api/users/", "asgi": "/api/async/users/"}
+ASGI_SCENARIOS = ("list", "detail", "me")
+
+
+class BenchWSGIServer(ThreadedWSGIServer):
+    def get_request(self):
+        request, client_address = super().get_request()
+
+        # Headers and body are written separately; without this Nagle's
+        # algorithm and delayed ACKs add ~40ms to every keep-alive response.
+        request.setsockopt(IPPROTO_TCP, TCP_NODELAY, 1)
+
+        return request, client_address
+
+
+class BenchServerThread(LiveServerThread):
+    server_class = BenchWSGIServer
+
+
+class BenchASGIServerThread(threading.Thread):
+    """
+    Serves config.asgi with uvicorn on an ephemeral port, with the parts of
+    LiveServerThread's interface the benchmark uses.
+    """
+
+    def __init__(self, host: str):
+        super().__init__(name="bench-asgi-server", daemon=True)
+        self.host = host
+        self.port = None
+        self.error = None
+        self.is_ready = threading.Event()
+        self.server = None
+
+    def run(self):
+        try:
+            import uvicorn
+
+            from config.asgi import application
+
+            # asyncio only sets TCP_NODELAY on accepted sockets (see
+            # BenchWSGIServer) when the listener's protocol is explicitly TCP.
+            listener = socket.socket(
+                socket.AF_INET, socket.SOCK_STREAM, socket.IPPROTO_TCP
+            )
+            listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            listener.bind((self.host, 0))
+            listener.listen(128)
+            self.port = listener.getsockname()[1]
+
+            # log_config=None leaves the project's logging configuration alone.
+            self.server = uvicorn.Server(
+                uvicorn.Config(
+                    application,
+                    lifespan="off",
+                    log_config=None,
+                    access_log=False,
+                )
+            )
+        except Exception as error:
+            self.error = error
+            self.is_ready.set()
+            return
+
+        # Requests queue on the listening socket until the loop accepts them.
+        self.is_ready.set()
+        self.server.run(sockets=[listener])
+
+    def terminate(self):
+        if self.server is not None:
+            self.server.should_exit = True
+
+        self.join()
+
+
+class BenchClient:
+    """
+    One keep-alive HTTP connection authenticated as its own user, so
+    password changes of concurrent workers do not race each other.
+    """
+
+    def __init__(self, *, host: str, port: int, prefix: str, user: User, token: str):
+        self.host = host
+        self.port = port
+        self.prefix = prefix
+        self.user_id = user.id
+        self.token = token
+        self.password = BENCH_PASSWORDS[0]
+        self.sequence = itertools.count()
+        self.connection = HTTPConnection(host, port)
+
+    def request(self, method: str, path: str, data=None) -> int:
+        headers = {"Authorization": f"Token {self.token}"}
+        body = None
+
+        if data is not None:
+            headers["Content-Type"] = "application/json"
+            body = json.dumps(data)
+
+        try:
+            self.connection.request(method, path, body=body, headers=headers)
+            response = self.connection.getresponse()
+        except (ConnectionError, OSError):
+            # The server closed the keep-alive connection; retry once.
+            self.connection.close()
+            self.connection = HTTPConnection(self.host, self.port)
+            self.connection.request(method, path, body=body, headers=headers)
+            response = self.connection.getresponse()
+
+        response.read()
+
+        return response.status
+
+
+def bench_list(client: BenchClient, user_ids) -> int:
+    offset = random.randrange(max(len(user_ids) - 20, 1))
+    return client.request("GET", f"{client.prefix}list/?limit=20&offset={offset}")
+
+
+def bench_detail(client: BenchClient, user_ids) -> int:
+    return client.request("GET", f"{client.prefix}{random.choice(user_ids)}/")
+
+
+def bench_me(client: BenchClient, user_ids) -> int:
+    return client.request("GET", f"{client.prefix}me/")
+
+
+def bench_create(client: BenchClient, user_ids) -> int:
+    password = BENCH_PASSWORDS[0]
+    return client.request(
+        "POST",
+        f"{client.prefix}create/",
+        {
+            "email": f"bench-{client.user_id}-{next(client.sequence)}@example.com",
+            "first_name": "Bench",
+            "last_name": "Mark",
+            "password": password,
+            "re_password": password,
+        },
+    )
+
+
+def bench_change_password(client: BenchClient, user_ids) -> int:
+    old_password = client.password
+    new_password = BENCH_PASSWORDS[old_password == BENCH_PASSWORDS[0]]
+
+    status = client.request(
+        "POST",
+        f"{client.prefix}password/",
+        {
+            "old_password": old_password,
+            "new_password": new_password,
+            "re_password": new_password,
+        },
+    )
+
+    if status < 400:
+        client.password = new_password
+
+    return status
+
+
+SCENARIOS = {
+    "list": bench_list,
+    "detail": bench_detail,
+    "me": bench_me,
+    "create": bench_create,
+    "change_password": bench_change_password,
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Load-test the users API over HTTP against a throwaway test database "
+        "and report throughput and latency percentiles as JSON."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=1000)
+        parser.add_argument(
+            "--requests", type=int, default=500, help="Requests per endpoint."
+        )
+        parser.add_argument("--concurrency", type=int, default=8)
+        parser.add_argument(
+            "--server",
+            choices=list(SERVER_PREFIXES),
+            default="wsgi",
+            help=(
+                "Drive the sync views on a threaded WSGI server, or the async "
+                "views on uvicorn (%s only)." % ", ".join(ASGI_SCENARIOS)
+            ),
+        )
+        parser.add_argument(
+            "--endpoints", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS)
+        )
+        parser.add_argument("--output", help="Write the JSON report to this path.")
+        parser.add_argument("--baseline", help="Compare against this JSON report.")
+        parser.add_argument(
+            "--tolerance",
+            type=float,
+            default=0.2,
+            help="Allowed relative p95/throughput regression against the baseline.",
+        )
+
+    def handle(self, *args, **options):
+        if settings.SETTINGS_MODULE != "config.django.test":
+            raise CommandError(
+                "Run the benchmark with DJANGO_SETTINGS_MODULE=config.django.test."
+            )
+
+        if options["requests"] < 1 or options["concurrency"] < 1:
+            raise CommandError("--requests and --concurrency must be at least 1.")
+
+        if connection.vendor == "sqlite" and options["concurrency"] > 1:
+            self.stderr.write(
+                "SQLite locks the whole database on writes; concurrent create and "
+                "change_password requests will fail. Point DATABASE_URL at "
+                "PostgreSQL for meaningful numbers."
+            )
+
+        if options["server"] == "asgi":
+            unsupported = set(options["endpoints"]) - set(ASGI_SCENARIOS)
+
+            if unsupported == set(options["endpoints"]):
+                raise CommandError("None of the endpoints has an async view.")
+
+            if unsupported:
+                self.stderr.write(
+                    "No async views for %s; skipped." % ", ".join(sorted(unsupported))
+                )
+                options["endpoints"] = [
+                    name for name in options["endpoints"] if name in ASGI_SCENARIOS
+                ]
+
+            if connection.vendor == "sqlite":
+                # uvicorn's sync_to_async threads can't share an in-memory
+                # database with this one, so the test database goes to a file.
+                connection.settings_dict["TEST"]["NAME"] = os.path.join(
+                    tempfile.gettempdir(), f"users_benchmark.{os.getpid()}.sqlite3"
+                )
+
+        old_config = setup_databases(verbosity=0, interactive=False)
+
+        try:
+            with modify_settings(
+                ALLOWED_HOSTS={"append": "127.0.0.1"}
+            ), override_settings(REST_FRAMEWORK=self.unthrottled()):
+                report = self.benchmark(**options)
+        finally:
+            teardown_databases(old_config, verbosity=0)
+
+        rendered = json.dumps(report, indent=2)
+
+        if options["output"]:
+            with open(options["output"], "w") as output:
+                output.write(rendered + "\n")
+
+        self.stdout.write(rendered)
+
+        if options["baseline"]:
+            self.compare(report, baseline_path=options["baseline"], **options)
+
+    def unthrottled(self):
+        # The benchmark measures the endpoints, not the rate limiter.
+        rates = settings.REST_FRAMEWORK.get("DEFAULT_THROTTLE_RATES", {})
+
+        return {
+            **settings.REST_FRAMEWORK,
+            "DEFAULT_THROTTLE_RATES": {scope: None for scope in rates},
+        }
+
+    def seed(self, *, users: int, concurrency: int):
+        password = password_hash(BENCH_PASSWORDS[0])
+
+        User.objects.bulk_create(
+            user_build_batch(users + concurrency, password=password),
+            batch_size=settings.USER_BULK_CREATE_BATCH_SIZE,
+        )
+
+        user_ids = list(User.objects.order_by("id").values_list("id", flat=True))
+        bench_users = list(User.objects.filter(id__in=user_ids[-concurrency:]))
+
+        tokens = Token.objects.bulk_create(
+            [Token(user=user, key=Token.generate_key()) for user in bench_users]
+        )
+
+        return user_ids[:users], list(zip(bench_users, tokens))
+
+    def benchmark(self, *, users, requests, concurrency, endpoints, server, **options):
+        user_ids, bench_users = self.seed(users=users, concurrency=concurrency)
+
+        if server == "asgi":
+            server_thread = BenchASGIServerThread("127.0.0.1")
+        else:
+            server_thread = BenchServerThread(
+                "127.0.0.1", static_handler=lambda app: app
+            )
+            server_thread.daemon = True
+
+        server_thread.start()
+        server_thread.is_ready.wait()
+
+        if server_thread.error:
+            raise server_thread.error
+
+        clients = [
+            BenchClient(
+                host=server_thread.host,
+                port=server_thread.port,
+                prefix=SERVER_PREFIXES[server],
+                user=user,
+                token=token.key,
+            )
+            for user, token in bench_users
+        ]
+
+        try:
+            results = {
+                name: self.run_scenario(
+                    scenario=SCENARIOS[name],
+                    clients=clients,
+                    user_ids=user_ids,
+                    requests=requests,
+                )
+                for name in endpoints
+            }
+        finally:
+            for client in clients:
+                client.connection.close()
+
+            server_thread.terminate()
+
+        return {
+            "settings": {
+                "server": server,
+                "database": connection.vendor,
+                "users": users,
+                "requests": requests,
+                "concurrency": concurrency,
+            },
+            "endpoints": results,
+        }
+
+    def run_scenario(self, *, scenario, clients, user_ids, requests):
+        counter = itertools.count()
+
+        def worker(client):
+            latencies = []
+            errors = 0
+
+            while next(counter) < requests:
+                started = time.perf_counter()
+                status = scenario(client, user_ids)
+                latencies.append(time.perf_counter() - started)
+
+                errors += status >= 400
+
+            return latencies, errors
+
+        started = time.perf_counter()
+
+        with ThreadPoolExecutor(max_workers=len(clients)) as executor:
+            results = list(executor.map(worker, clients))
+
+        elapsed = time.perf_counter() - started
+
+        latencies = sorted(latency for result, _ in results for latency in result)
+
+        # statistics.quantiles needs at least two samples.
+        if len(latencies) < 2:
+            percentiles = latencies * 99
+        else:
+            percentiles = statistics.quantiles(latencies, n=100, method="inclusive")
+
+        return {
+            "requests": len(latencies),
+            "errors": sum(errors for _, errors in results),
+            "throughput": round(len(latencies) / elapsed, 2),
+            "p50_ms": round(percentiles[49] * 1000, 2),
+            "p95_ms": round(percentiles[94] * 1000, 2),
+            "p99_ms": round(percentiles[98] * 1000, 2),
+        }
+
+    def compare(self, report, *, baseline_path, tolerance, **options):
+        with open(baseline_path) as baseline_file:
+            baseline = json.load(baseline_file)
+
+        regressions = []
+
+        for name, current in report["endpoints"].items():
+            previous = baseline["endpoints"].get(name)
+            if previous is None:
+                continue
+
+            if current["p95_ms"] > previous["p95_ms"] * (1 + tolerance):
+                regressions.append(
+                    f"{name}: p95 {current['p95_ms']}ms vs {previous['p95_ms']}ms"
+                )
+
+            if current["throughput"] < previous["throughput"] * (1 - tolerance):
+                regressions.append(
+                    f"{name}: {current['throughput']} req/s vs {previous['throughput']} req/s"
+                )
+
+            if current["errors"] > previous["errors"]:
+                regressions.append(
+                    f"{name}: {current['errors']} errors vs {previous['errors']}"
+                )
+
+        if regressions:
+            raise CommandError(
+                "Regressions against the baseline:\n" + "\n".join(regressions)
+            )
+
+        self.stdout.write(self.style.SUCCESS("No regressions against the baseline."))
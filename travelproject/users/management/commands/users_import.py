@@ -0,0 +1,50 @@
+import csv
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from travelproject.users.services import user_bulk_create
+
+
+class Command(BaseCommand):
+    help = "Import users from a CSV file with email, first_name, last_name and password columns."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path")
+        parser.add_argument(
+            "--batch-size", type=int, default=settings.USER_BULK_CREATE_BATCH_SIZE
+        )
+        parser.add_argument(
+            "--workers", type=int, default=settings.USER_BULK_CREATE_WORKERS
+        )
+
+    def handle(self, *args, **options):
+        with open(options["path"], newline="") as csv_file:
+            rows = list(csv.DictReader(csv_file))
+
+        started = time.perf_counter()
+
+        # Password hashing dominates the import, so it is spread across
+        # processes of its own rather than the shared hashing pool.
+        with ProcessPoolExecutor(
+            max_workers=options["workers"], initializer=django.setup
+        ) as pool:
+            result = user_bulk_create(
+                rows=rows, batch_size=options["batch_size"], executor=pool
+            )
+
+        elapsed = time.perf_counter() - started
+
+        for error in result["errors"]:
+            # +2 accounts for the header line and 1-based line numbers.
+            self.stderr.write(f"line {error['row'] + 2}: {error['error']}")
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Created {result['created']} of {len(rows)} users "
+                f"in {elapsed:.2f}s ({len(rows) / max(elapsed, 1e-9):.0f} rows/s)."
+            )
+        )
@@ -0,0 +1,37 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from travelproject.users.services import refresh_token_purge_expired, user_purge
+
+
+class Command(BaseCommand):
+    help = "Hard-delete soft-deleted users in batches and expired refresh tokens."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument(
+            "--older-than",
+            type=int,
+            default=0,
+            help="Only purge users deleted at least this many seconds ago.",
+        )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+
+        purged = user_purge(
+            batch_size=options["batch_size"],
+            older_than=timedelta(seconds=options["older_than"]),
+        )
+
+        expired = refresh_token_purge_expired()
+
+        elapsed = time.perf_counter() - started
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Purged {purged} users and {expired} refresh tokens in {elapsed:.2f}s."
+            )
+        )
@@ -0,0 +1,108 @@
+import json
+import timeit
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import setup_databases, teardown_databases
+from rest_framework import serializers
+from rest_framework.renderers import JSONRenderer
+
+from travelproject.common import renderers
+from travelproject.common.renderers import FastJSONRenderer
+from travelproject.users.apis import UserOutputSerializer
+from travelproject.users.models import User
+from travelproject.users.seeding import user_build_batch
+
+
+class DRFUserOutputSerializer(serializers.Serializer):
+    # What the users APIs rendered with before UserOutputSerializer.
+    id = serializers.IntegerField()
+    email = serializers.CharField()
+    first_name = serializers.CharField()
+    last_name = serializers.CharField()
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure querying, serializing and rendering a page of users per "
+        "output path, against a throwaway test database: DRF serializer over "
+        "model instances with the stdlib renderer, UserOutputSerializer over "
+        ".values() rows with the stdlib renderer, and the same with orjson."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=20000)
+        parser.add_argument("--number", type=int, default=5)
+        parser.add_argument("--output", help="Write the JSON report to this path.")
+
+    def handle(self, *args, **options):
+        if settings.SETTINGS_MODULE != "config.django.test":
+            raise CommandError(
+                "Run the benchmark with DJANGO_SETTINGS_MODULE=config.django.test."
+            )
+
+        old_config = setup_databases(verbosity=0, interactive=False)
+
+        try:
+            report = self.benchmark(rows=options["rows"], number=options["number"])
+        finally:
+            teardown_databases(old_config, verbosity=0)
+
+        rendered = json.dumps(report, indent=2)
+
+        if options["output"]:
+            with open(options["output"], "w") as output:
+                output.write(rendered + "\n")
+
+        self.stdout.write(rendered)
+
+    def measure(self, render, *, rows: int, number: int):
+        # Also warms up the database connection and the page cache.
+        body = render()
+
+        elapsed = min(timeit.repeat(render, number=1, repeat=number))
+
+        return {
+            "ms": round(elapsed * 1000, 2),
+            "rows_per_s": round(rows / elapsed),
+            "bytes": len(body),
+        }
+
+    def benchmark(self, *, rows: int, number: int):
+        User.objects.bulk_create(
+            user_build_batch(rows),
+            batch_size=settings.USER_BULK_CREATE_BATCH_SIZE,
+        )
+
+        def drf():
+            users = User.objects.public().order_by("id")
+            data = DRFUserOutputSerializer(users, many=True).data
+
+            return JSONRenderer().render(data)
+
+        def values_stdlib():
+            users = User.objects.order_by("id").public_values()
+            data = UserOutputSerializer(users, many=True).data
+
+            return JSONRenderer().render(data)
+
+        def values_orjson():
+            users = User.objects.order_by("id").public_values()
+            data = UserOutputSerializer(users, many=True).data
+
+            return FastJSONRenderer().render(data)
+
+        report = {
+            "database": connection.vendor,
+            "rows": rows,
+            "drf": self.measure(drf, rows=rows, number=number),
+            "values": self.measure(values_stdlib, rows=rows, number=number),
+        }
+
+        if renderers.orjson is not None:
+            report["values_orjson"] = self.measure(
+                values_orjson, rows=rows, number=number
+            )
+
+        return report
@@ -1,3 +1,9 @@
 USER_ALREADY_EXISTS = "User with the email already in the system."
 USER_PASSWORDS_NOT_MATCH = "Passwords are not identical."
 OLD_PASSWORD_IS_NOT_VALID = "Old password is not valid."
+USER_IMPORT_MISSING_FIELDS = "Missing required fields: {fields}."
+USER_IMPORT_INVALID_FIELD = "Invalid {field}: {message}"
+USER_IMPORT_DUPLICATED_EMAIL = "Email is duplicated in the import."
+USER_INVALID_CREDENTIALS = "Invalid email or password."
+REFRESH_TOKEN_INVALID = "Refresh token is invalid or expired."
+USER_ACTIVATION_TOKEN_INVALID = "Activation link is invalid or expired."
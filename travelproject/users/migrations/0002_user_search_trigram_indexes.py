@@ -0,0 +1,37 @@
+from django.db import migrations
+
+SEARCH_FIELDS = ("email", "first_name", "last_name")
+
+
+def create_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    for field in SEARCH_FIELDS:
+        schema_editor.execute(
+            f"CREATE INDEX CONCURRENTLY IF NOT EXISTS users_{field}_trgm "
+            f"ON users USING gin ({field} gin_trgm_ops)"
+        )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    for field in SEARCH_FIELDS:
+        schema_editor.execute(f"DROP INDEX CONCURRENTLY IF EXISTS users_{field}_trgm")
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY can't run inside a transaction.
+    atomic = False
+
+    dependencies = [
+        ("users", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
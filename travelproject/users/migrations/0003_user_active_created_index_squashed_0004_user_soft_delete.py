@@ -0,0 +1,60 @@
+# Generated by Django 4.0.4 on 2026-10-18 10:36
+
+from django.db import migrations, models
+import django.db.models.manager
+
+from travelproject.common.db.operations import AddIndexConcurrently
+
+
+class Migration(migrations.Migration):
+    # 0004 replaced the index 0003 added with a partial one; squashed, the
+    # index is built once. CREATE INDEX CONCURRENTLY can't run inside a
+    # transaction.
+    atomic = False
+
+    replaces = [
+        ("users", "0003_user_active_created_index"),
+        ("users", "0004_user_soft_delete"),
+    ]
+
+    dependencies = [
+        ("users", "0002_user_search_trigram_indexes"),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name="user",
+            options={
+                "default_manager_name": "all_objects",
+                "verbose_name_plural": "Users",
+            },
+        ),
+        migrations.AlterModelManagers(
+            name="user",
+            managers=[
+                ("all_objects", django.db.models.manager.Manager()),
+            ],
+        ),
+        migrations.AddField(
+            model_name="user",
+            name="deleted_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        AddIndexConcurrently(
+            model_name="user",
+            index=models.Index(
+                condition=models.Q(("deleted_at__isnull", True)),
+                fields=["is_active", "created_at", "id"],
+                include=("email", "first_name", "last_name"),
+                name="users_active_created_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="user",
+            index=models.Index(
+                condition=models.Q(("deleted_at__isnull", False)),
+                fields=["deleted_at"],
+                name="users_deleted_idx",
+            ),
+        ),
+    ]
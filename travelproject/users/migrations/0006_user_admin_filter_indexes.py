@@ -0,0 +1,27 @@
+# Generated by Django 4.0.4 on 2026-10-18 10:45
+
+from django.db import migrations, models
+
+from travelproject.common.db.operations import AddIndexConcurrently
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY can't run inside a transaction.
+    atomic = False
+
+    dependencies = [
+        ("users", "0005_user_tokens"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="user",
+            index=models.Index(fields=["is_active", "id"], name="users_active_id_idx"),
+        ),
+        AddIndexConcurrently(
+            model_name="user",
+            index=models.Index(
+                fields=["is_superuser", "id"], name="users_superuser_id_idx"
+            ),
+        ),
+    ]
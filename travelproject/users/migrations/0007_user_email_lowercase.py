@@ -0,0 +1,34 @@
+from django.db import migrations
+from django.db.models import F
+from django.db.models.functions import Lower
+
+
+def lowercase_emails(apps, schema_editor):
+    User = apps.get_model("users", "User")
+    users = User._base_manager.using(schema_editor.connection.alias)
+
+    mixed_case = (
+        users.annotate(email_lower=Lower("email"))
+        .exclude(email=F("email_lower"))
+        .order_by("id")
+        .values_list("id", "email_lower")
+    )
+
+    for user_id, email in mixed_case.iterator():
+        # Accounts only differing in case are left for an admin to merge; the
+        # lowercased one keeps the address.
+        if users.filter(email=email).exists():
+            continue
+
+        users.filter(id=user_id).update(email=email)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0006_user_admin_filter_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(lowercase_emails, migrations.RunPython.noop),
+    ]
@@ -1,20 +1,42 @@
 from django.db import models
+from django.db.models import Q
 from django.contrib.auth.models import (
     BaseUserManager as BUM,
     PermissionsMixin,
     AbstractBaseUser,
 )
 
-from travelproject.common.models import BaseModel
+from travelproject.common.models import (
+    BaseModel,
+    SoftDeleteManagerMixin,
+    SoftDeleteModel,
+)
+
+
+class UserQuerySet(models.QuerySet):
+    PUBLIC_FIELDS = ("id", "email", "first_name", "last_name")
+
+    def public(self):
+        # Leaves out password, last_login and the PermissionsMixin columns.
+        return self.only(*self.PUBLIC_FIELDS, "created_at", "updated_at")
+
+    def public_values(self, *extra: str):
+        return self.values(*self.PUBLIC_FIELDS, *extra)
+
 
+class BaseUserManager(BUM.from_queryset(UserQuerySet)):  # type: ignore[misc]
+    @classmethod
+    def normalize_email(cls, email):
+        # The whole address, not only its domain, so case variants collide on
+        # the unique index and logins look emails up with an exact match.
+        return super().normalize_email(email).lower()
 
-class BaseUserManager(BUM):
     def create_user(self, email, is_active=True, password=None):
         if not email:
             raise ValueError("Users must have an email address.")
 
         user = self.model(
-            email=self.normalize_email(email.lower()),
+            email=self.normalize_email(email),
             is_active=is_active,
         )
 
@@ -41,21 +63,67 @@ class BaseUserManager(BUM):
         return user
 
 
-class User(BaseModel, AbstractBaseUser, PermissionsMixin):
+class UserManager(SoftDeleteManagerMixin, BaseUserManager):
+    pass
+
+
+class User(BaseModel, SoftDeleteModel, AbstractBaseUser, PermissionsMixin):
 
     email = models.EmailField(max_length=255, unique=True)
     first_name = models.CharField(max_length=128)
     last_name = models.CharField(max_length=128)
 
     is_active = models.BooleanField(default=False)
+    # Signed access tokens carry the version they were issued with; bumping it
+    # revokes them all along with the user's refresh tokens.
+    token_version = models.PositiveIntegerField(default=0)
 
-    objects = BaseUserManager()
+    objects = UserManager()
+    all_objects = BaseUserManager()
 
     USERNAME_FIELD = "email"
 
+    def clean(self):
+        super().clean()
+        self.email = User.objects.normalize_email(self.email)
+
     def is_staff(self):
         return self.is_superuser
 
     class Meta:
         verbose_name_plural = "Users"
         db_table = "users"
+        default_manager_name = "all_objects"
+        indexes = [
+            # Covers user_list() pages: on PostgreSQL the public columns are
+            # included, so they can be served by an index-only scan.
+            models.Index(
+                fields=["is_active", "created_at", "id"],
+                include=["email", "first_name", "last_name"],
+                condition=Q(deleted_at__isnull=True),
+                name="users_active_created_idx",
+            ),
+            # Back UserAdmin's list_filter with its "-id" ordering, so a
+            # filtered changelist page reads the first rows of an index.
+            models.Index(fields=["is_active", "id"], name="users_active_id_idx"),
+            models.Index(fields=["is_superuser", "id"], name="users_superuser_id_idx"),
+            # Only soft-deleted rows, for users_purge.
+            models.Index(
+                fields=["deleted_at"],
+                condition=Q(deleted_at__isnull=False),
+                name="users_deleted_idx",
+            ),
+        ]
+
+
+class RefreshToken(BaseModel):
+    user = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="refresh_tokens"
+    )
+    # Only a SHA-256 of the token is stored.
+    token_hash = models.CharField(max_length=64, unique=True)
+    token_version = models.PositiveIntegerField()
+    expires_at = models.DateTimeField(db_index=True)
+
+    class Meta:
+        db_table = "users_refresh_tokens"
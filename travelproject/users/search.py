@@ -0,0 +1,96 @@
+import bisect
+import re
+import threading
+from typing import List, Optional, Tuple
+
+from django.contrib.postgres.search import TrigramWordSimilarity
+from django.db import connections
+from django.db.models import Case, IntegerField, Q, When
+from django.db.models.functions import Greatest
+from django.db.models.query import QuerySet
+
+from travelproject.users.models import User
+
+SEARCH_FIELDS = ("email", "first_name", "last_name")
+SEARCH_PREFIX_LIMIT = 500
+
+_token_re = re.compile(r"[^\W_]+")
+
+
+def _tokenize(value: str) -> List[str]:
+    return _token_re.findall(value.lower())
+
+
+class UserPrefixIndex:
+    """
+    In-memory sorted token index used when the database has no trigram
+    support (SQLite in local and test environments). Every word of the
+    searchable fields is indexed, so lookups are a bisect per query token.
+    """
+
+    def __init__(self):
+        self._entries: Optional[List[Tuple[str, int]]] = None
+        self._lock = threading.Lock()
+
+    def invalidate(self) -> None:
+        self._entries = None
+
+    def _build(self) -> List[Tuple[str, int]]:
+        entries = []
+        rows = User.objects.values_list("id", *SEARCH_FIELDS).iterator()
+
+        for user_id, *values in rows:
+            for value in values:
+                entries.extend((token, user_id) for token in _tokenize(value))
+
+        entries.sort()
+
+        return entries
+
+    def search(self, query: str) -> List[int]:
+        entries = self._entries
+        if entries is None:
+            with self._lock:
+                if self._entries is None:
+                    self._entries = self._build()
+                entries = self._entries
+
+        scores = {}
+
+        for token in _tokenize(query):
+            start = bisect.bisect_left(entries, (token, 0))
+
+            for index in range(start, len(entries)):
+                word, user_id = entries[index]
+                if not word.startswith(token):
+                    break
+
+                # An exact word match ranks above a prefix match.
+                scores[user_id] = scores.get(user_id, 0) + (2 if word == token else 1)
+
+        return sorted(scores, key=lambda user_id: (-scores[user_id], user_id))
+
+
+user_prefix_index = UserPrefixIndex()
+
+
+def user_search_queryset(*, query: str, queryset: QuerySet[User]) -> QuerySet[User]:
+    if connections[queryset.db].vendor == "postgresql":
+        # Served by the gin_trgm_ops indexes from migration 0002.
+        condition = Q()
+        for field in SEARCH_FIELDS:
+            condition |= Q(**{f"{field}__trigram_word_similar": query})
+
+        rank = Greatest(
+            *(TrigramWordSimilarity(query, field) for field in SEARCH_FIELDS)
+        )
+
+        return queryset.filter(condition).annotate(rank=rank).order_by("-rank", "id")
+
+    user_ids = user_prefix_index.search(query)[:SEARCH_PREFIX_LIMIT]
+    ordering = Case(
+        *(When(id=user_id, then=position) for position, user_id in enumerate(user_ids)),
+        output_field=IntegerField(),
+    )
+
+    return queryset.filter(id__in=user_ids).order_by(ordering)
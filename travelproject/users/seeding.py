@@ -0,0 +1,62 @@
+import random
+from typing import List
+
+from travelproject.users.models import User
+
+FIRST_NAMES = (
+    "Ada",
+    "Boris",
+    "Chloe",
+    "Dmitri",
+    "Elena",
+    "Farid",
+    "Greta",
+    "Hugo",
+    "Ines",
+    "Johanna",
+    "Kenji",
+    "Lucia",
+    "Mateo",
+    "Nadia",
+    "Oskar",
+    "Priya",
+)
+
+LAST_NAMES = (
+    "Andersen",
+    "Bianchi",
+    "Costa",
+    "Dubois",
+    "Eriksen",
+    "Fischer",
+    "Garcia",
+    "Horvat",
+    "Ivanova",
+    "Jensen",
+    "Kowalski",
+    "Larsen",
+    "Moreau",
+    "Novak",
+    "Okafor",
+    "Petrov",
+)
+
+
+def user_build_batch(count: int, *, password: str = "", seed: int = 0) -> List[User]:
+    """
+    ``count`` unsaved active users with unique emails, for the benchmarks'
+    throwaway databases. The names are drawn from a seeded generator, so
+    every run measures the same data.
+    """
+    rng = random.Random(seed)
+
+    return [
+        User(
+            email=f"user-{n}@example.com",
+            first_name=rng.choice(FIRST_NAMES),
+            last_name=rng.choice(LAST_NAMES),
+            password=password,
+            is_active=True,
+        )
+        for n in range(count)
+    ]
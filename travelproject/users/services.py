@@ -1,61 +1,551 @@
-from typing import Any, Dict
+import hashlib
+import logging
+import secrets
+from concurrent.futures import Executor
+from datetime import timedelta
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlencode
 
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core import signing
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import DEFAULT_DB_ALIAS, IntegrityError, transaction
+from django.db.models import F
 from django.db.models.query import QuerySet
+from django.utils import timezone
+from rest_framework.exceptions import AuthenticationFailed
 from rest_framework.serializers import ValidationError
 
+from travelproject.common.authentication import (
+    access_token_issue,
+    token_cache_invalidate,
+)
+from travelproject.common.db.routers import replica_pin
+from travelproject.common.hashing import (
+    get_hashing_executor,
+    password_hash,
+    password_hash_async,
+    password_verify,
+    password_verify_async,
+)
 from travelproject.common.services import model_update
+from travelproject.emails.services import email_queue, email_queue_many
 from travelproject.users.messages import (
     OLD_PASSWORD_IS_NOT_VALID,
+    REFRESH_TOKEN_INVALID,
+    USER_ACTIVATION_TOKEN_INVALID,
     USER_ALREADY_EXISTS,
+    USER_IMPORT_DUPLICATED_EMAIL,
+    USER_IMPORT_INVALID_FIELD,
+    USER_IMPORT_MISSING_FIELDS,
+    USER_INVALID_CREDENTIALS,
     USER_PASSWORDS_NOT_MATCH,
 )
-from travelproject.users.models import User
+from travelproject.users.models import RefreshToken, User, UserQuerySet
+from travelproject.users.search import user_prefix_index, user_search_queryset
+
+logger = logging.getLogger(__name__)
+
+USER_ACTIVATION_SALT = "travelproject.users.activation"
+
+
+def user_activation_token_issue(*, user: User) -> str:
+    # Bound to the email, so the link stops working if the address changes.
+    return signing.dumps({"u": user.pk, "e": user.email}, salt=USER_ACTIVATION_SALT)
+
+
+def user_activate(*, token: str) -> User:
+    """
+    Activates the user a signup email's token was issued for. Using a link
+    again is harmless; soft-deleted users can't be reactivated.
+    """
+    try:
+        payload = signing.loads(
+            token,
+            salt=USER_ACTIVATION_SALT,
+            max_age=settings.USER_ACTIVATION_TOKEN_LIFETIME,
+        )
+    except signing.BadSignature:
+        raise ValidationError(USER_ACTIVATION_TOKEN_INVALID)
+
+    user = (
+        User.objects.select_for_update()
+        .filter(pk=payload["u"], email=payload["e"])
+        .first()
+    )
+
+    if user is None:
+        raise ValidationError(USER_ACTIVATION_TOKEN_INVALID)
+
+    if not user.is_active:
+        user.is_active = True
+        user.save(update_fields=["is_active", "updated_at"])
+        logger.info("Activated user %s.", user.pk, extra={"user_id": user.pk})
+
+    return user
+
+
+def _user_confirmation_email(*, user: User) -> Dict[str, str]:
+    query = urlencode({"token": user_activation_token_issue(user=user)})
+
+    return {
+        "to": user.email,
+        "subject": "Confirm your Travel Project account",
+        "plain_text": (
+            f"Hi {user.first_name},\n\n"
+            "Thanks for signing up for Travel Project. Please confirm "
+            "your email address to activate your account:\n\n"
+            f"{settings.USER_ACTIVATION_URL}?{query}"
+        ),
+    }
+
+
+def _user_save_with_confirmation(*, user: User) -> None:
+    """
+    Inserts the user and queues the confirmation email, whose link activates
+    the account through ``user_activate``. A taken email is
+    detected by the unique index on INSERT rather than a separate lookup, so
+    concurrent signups with the same email can't both pass the check.
+    """
+    # The email row commits or rolls back together with the user.
+    try:
+        with transaction.atomic():
+            user.save(force_insert=True)
+            email_queue(**_user_confirmation_email(user=user))
+    except IntegrityError:
+        # users.email is the only unique constraint a new user can violate.
+        raise ValidationError(USER_ALREADY_EXISTS)
 
 
 def user_create(
     *, email: str, first_name: str, last_name: str, password: str, re_password: str
 ) -> User:
-    user_exists = User.objects.filter(email=email).exists()
-    if user_exists:
-        raise ValidationError(USER_ALREADY_EXISTS)
+    if password != re_password:
+        raise ValidationError(USER_PASSWORDS_NOT_MATCH)
+
+    user = User(
+        first_name=first_name,
+        last_name=last_name,
+        email=User.objects.normalize_email(email),
+    )
+    user.password = password_hash(password)
+
+    _user_save_with_confirmation(user=user)
+    logger.info("Created user %s.", user.pk, extra={"user_id": user.pk})
 
+    return user
+
+
+async def user_create_async(
+    *, email: str, first_name: str, last_name: str, password: str, re_password: str
+) -> User:
     if password != re_password:
         raise ValidationError(USER_PASSWORDS_NOT_MATCH)
 
-    user = User(first_name=first_name, last_name=last_name, email=email)
-    user.set_password(password)
+    user = User(
+        first_name=first_name,
+        last_name=last_name,
+        email=User.objects.normalize_email(email),
+    )
+    user.password = await password_hash_async(password)
 
-    # TODO: send confirmation email
+    await sync_to_async(_user_save_with_confirmation)(user=user)
+    logger.info("Created user %s.", user.pk, extra={"user_id": user.pk})
 
     return user
 
 
+USER_IMPORT_FIELDS = ("email", "first_name", "last_name", "password")
+
+
+def _user_import_errors(error: DjangoValidationError) -> str:
+    return " ".join(
+        USER_IMPORT_INVALID_FIELD.format(field=field, message=message)
+        for field, messages in error.message_dict.items()
+        for message in messages
+    )
+
+
+def _user_bulk_insert(users: List[User]) -> List[User]:
+    """
+    Inserts the users with their confirmation emails in one transaction and
+    returns the ones whose email was registered concurrently instead.
+    """
+    taken: List[User] = []
+
+    while users:
+        try:
+            with transaction.atomic():
+                User.objects.bulk_create(users)
+                email_queue_many(
+                    emails=[_user_confirmation_email(user=user) for user in users]
+                )
+        except IntegrityError:
+            # Someone registered some of the emails after our duplicate check.
+            existing = set(
+                User.all_objects.filter(
+                    email__in=[user.email for user in users]
+                ).values_list("email", flat=True)
+            )
+
+            if not existing:
+                raise
+
+            taken.extend(user for user in users if user.email in existing)
+            users = [user for user in users if user.email not in existing]
+
+            # bulk_create may have set the ids of the rolled back rows.
+            for user in users:
+                user.pk = None
+        else:
+            break
+
+    return taken
+
+
+def _user_bulk_create_batch(
+    *, rows: List[Dict[str, Any]], offset: int, executor: Executor
+) -> Tuple[int, List[Dict[str, Any]]]:
+    errors: List[Dict[str, Any]] = []
+    valid: List[Tuple[int, User, str]] = []
+    seen = set()
+
+    for index, row in enumerate(rows, start=offset):
+        missing = [field for field in USER_IMPORT_FIELDS if not row.get(field)]
+        if missing:
+            message = USER_IMPORT_MISSING_FIELDS.format(fields=", ".join(missing))
+            errors.append({"row": index, "error": message})
+            continue
+
+        user = User(
+            email=str(row["email"]).strip(),
+            first_name=row["first_name"],
+            last_name=row["last_name"],
+        )
+
+        # Normalizes the email and checks the field validators, e.g. their
+        # max_length; uniqueness is checked for the whole batch below.
+        try:
+            user.full_clean(exclude=["password"], validate_unique=False)
+        except DjangoValidationError as error:
+            errors.append({"row": index, "error": _user_import_errors(error)})
+            continue
+
+        if user.email in seen:
+            errors.append({"row": index, "error": USER_IMPORT_DUPLICATED_EMAIL})
+            continue
+
+        seen.add(user.email)
+        valid.append((index, user, str(row["password"])))
+
+    existing = set(
+        User.all_objects.filter(email__in=seen).values_list("email", flat=True)
+    )
+
+    rows_by_email = {}
+    to_create = []
+    for index, user, password in valid:
+        if user.email in existing:
+            errors.append({"row": index, "error": USER_ALREADY_EXISTS})
+            continue
+
+        rows_by_email[user.email] = index
+        to_create.append((user, password))
+
+    passwords = [password for _, password in to_create]
+    hashes = executor.map(make_password, passwords, chunksize=64)
+
+    users = []
+    for (user, _), hashed in zip(to_create, hashes):
+        user.password = hashed
+        users.append(user)
+
+    taken = _user_bulk_insert(users)
+    errors.extend(
+        {"row": rows_by_email[user.email], "error": USER_ALREADY_EXISTS}
+        for user in taken
+    )
+
+    return len(users) - len(taken), errors
+
+
+def user_bulk_create(
+    *,
+    rows: List[Dict[str, Any]],
+    batch_size: int = 1000,
+    executor: Optional[Executor] = None,
+) -> Dict[str, Any]:
+    """
+    Imports ``rows`` ``batch_size`` at a time. Passwords are hashed on
+    ``executor``, by default the shared password hashing pool, before each
+    batch's short insert transaction, so no transaction is held open while
+    hashing. Like signups, imported users are inactive until they follow the
+    link of the confirmation email queued with them.
+    """
+    if executor is None:
+        executor = get_hashing_executor()
+
+    created = 0
+    errors: List[Dict[str, Any]] = []
+
+    for offset in range(0, len(rows), batch_size):
+        batch_created, batch_errors = _user_bulk_create_batch(
+            rows=rows[offset : offset + batch_size], offset=offset, executor=executor
+        )
+
+        created += batch_created
+        errors.extend(batch_errors)
+
+    errors.sort(key=lambda error: error["row"])
+    logger.info("Imported %s users, %s rows rejected.", created, len(errors))
+
+    # bulk_create doesn't send post_save, which normally resets the index.
+    user_prefix_index.invalidate()
+
+    return {"created": created, "errors": errors}
+
+
 def user_list() -> QuerySet[User]:
-    return User.objects.filter(is_active=True)
+    return User.objects.public().filter(is_active=True).order_by("created_at", "id")
+
+
+def user_search(
+    *, query: str, queryset: Optional[QuerySet[User]] = None
+) -> QuerySet[User]:
+    if queryset is None:
+        queryset = user_list()
+
+    return user_search_queryset(query=query, queryset=queryset)
+
+
+def user_export(*, chunk_size: int = 2000) -> Iterator[Tuple[int, str, str, str]]:
+    return (
+        User.objects.filter(is_active=True)
+        .order_by("created_at", "id")
+        .values_list(*UserQuerySet.PUBLIC_FIELDS)
+        .iterator(chunk_size=chunk_size)
+    )
 
 
 def user_update(*, user: User, data: Dict[str, Any]) -> User:
     fields = ["first_name", "last_name", "email"]
 
-    user, _ = model_update(
+    if "email" in data:
+        data = {**data, "email": User.objects.normalize_email(data["email"])}
+
+    user, has_updated = model_update(
         instance=user, fields=fields, data=data, exclude=["password"]
     )
 
+    if has_updated:
+        token_cache_invalidate(user=user)
+        replica_pin(user_id=user.pk)
+
     return user
 
 
 def user_delete(*, user: User):
-    user.delete()
+    """
+    Soft-deletes the user with a single UPDATE. The row and its tokens, log
+    entries and permission links are removed later by ``user_purge``.
+    """
+    token_cache_invalidate(user=user)
+    replica_pin(user_id=user.pk)
+
+    # Deactivating also locks the user out of token and session auth, and the
+    # new token version revokes their signed access and refresh tokens.
+    user.is_active = False
+    user.deleted_at = timezone.now()
+    user.token_version += 1
+    user.save(update_fields=["is_active", "deleted_at", "token_version", "updated_at"])
+    logger.info("Deleted user %s.", user.pk, extra={"user_id": user.pk})
+
+
+def user_purge(*, batch_size: int = 500, older_than: timedelta = timedelta()) -> int:
+    """
+    Hard-deletes users soft-deleted before ``older_than`` ago, ``batch_size``
+    rows per transaction so locks stay short. Returns the number of users
+    deleted.
+    """
+    cutoff = timezone.now() - older_than
+    purged = 0
+
+    while True:
+        with transaction.atomic():
+            ids = list(
+                User.all_objects.filter(deleted_at__lte=cutoff)
+                .order_by("deleted_at")
+                .values_list("id", flat=True)[:batch_size]
+            )
+
+            if not ids:
+                logger.info("Purged %s soft-deleted users.", purged)
+                return purged
+
+            # The related tables (admin log, groups, permissions and refresh
+            # tokens) have no dependents of their own, so the collector
+            # removes each with a single DELETE ... WHERE user_id IN (...).
+            # Tokens are selected first, for their post_delete receiver.
+            User.all_objects.filter(id__in=ids).only("id").delete()
+
+        purged += len(ids)
+
+
+def user_check_password(*, user: User, password: str) -> bool:
+    is_valid, must_update = password_verify(password, user.password)
+
+    # Transparently upgrade hashes made with outdated hasher parameters.
+    if is_valid and must_update:
+        user.password = password_hash(password)
+        user.save(update_fields=["password"])
+
+    return is_valid
+
+
+async def user_check_password_async(*, user: User, password: str) -> bool:
+    is_valid, must_update = await password_verify_async(password, user.password)
+
+    if is_valid and must_update:
+        user.password = await password_hash_async(password)
+        await sync_to_async(user.save)(update_fields=["password"])
+
+    return is_valid
+
+
+def _user_password_save(*, user: User, password: str) -> None:
+    # The version is bumped in the database, so a concurrent revocation of
+    # the same user isn't lost, and read back from the primary.
+    user.password = password
+    user.token_version = F("token_version") + 1
+    user.save(update_fields=["password", "token_version", "updated_at"])
+    user.refresh_from_db(using=DEFAULT_DB_ALIAS, fields=["token_version"])
 
 
 def user_change_password(
     *, user: User, old_password: str, new_password: str, re_password: str
 ):
-    if not user.check_password(old_password):
+    if not user_check_password(user=user, password=old_password):
+        raise ValidationError(OLD_PASSWORD_IS_NOT_VALID)
+
+    if new_password != re_password:
+        raise ValidationError(USER_PASSWORDS_NOT_MATCH)
+
+    _user_password_save(user=user, password=password_hash(new_password))
+    logger.info("Changed password of user %s.", user.pk, extra={"user_id": user.pk})
+
+    token_cache_invalidate(user=user)
+    replica_pin(user_id=user.pk)
+
+
+async def user_change_password_async(
+    *, user: User, old_password: str, new_password: str, re_password: str
+):
+    if not await user_check_password_async(user=user, password=old_password):
         raise ValidationError(OLD_PASSWORD_IS_NOT_VALID)
 
     if new_password != re_password:
         raise ValidationError(USER_PASSWORDS_NOT_MATCH)
 
-    user.set_password(new_password)
-    user.save()
+    await sync_to_async(_user_password_save)(
+        user=user, password=await password_hash_async(new_password)
+    )
+    logger.info("Changed password of user %s.", user.pk, extra={"user_id": user.pk})
+
+    await sync_to_async(token_cache_invalidate)(user=user)
+    await sync_to_async(replica_pin)(user_id=user.pk)
+
+
+def _refresh_token_hash(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def user_tokens_issue(*, user: User) -> Dict[str, Any]:
+    """
+    A signed access token plus a refresh token, both bound to the user's
+    current ``token_version``.
+    """
+    refresh = secrets.token_urlsafe(32)
+
+    RefreshToken.objects.create(
+        user=user,
+        token_hash=_refresh_token_hash(refresh),
+        token_version=user.token_version,
+        expires_at=timezone.now() + timedelta(seconds=settings.REFRESH_TOKEN_LIFETIME),
+    )
+
+    return {
+        "access": access_token_issue(user=user),
+        "refresh": refresh,
+        "expires_in": settings.ACCESS_TOKEN_LIFETIME,
+    }
+
+
+# Checked against when the email is unknown, so a missing user takes as long
+# to reject as a wrong password.
+_DUMMY_PASSWORD_HASH: Optional[str] = None
+
+
+def user_login(*, email: str, password: str) -> Dict[str, Any]:
+    global _DUMMY_PASSWORD_HASH
+
+    user = User.objects.filter(email=User.objects.normalize_email(email)).first()
+
+    if user is None:
+        if _DUMMY_PASSWORD_HASH is None:
+            _DUMMY_PASSWORD_HASH = password_hash(secrets.token_urlsafe())
+
+        password_verify(password, _DUMMY_PASSWORD_HASH)
+        logger.info("Login failed: unknown email.")
+        raise AuthenticationFailed(USER_INVALID_CREDENTIALS)
+
+    if not user_check_password(user=user, password=password) or not user.is_active:
+        logger.info("Login failed for user %s.", user.pk, extra={"user_id": user.pk})
+        raise AuthenticationFailed(USER_INVALID_CREDENTIALS)
+
+    logger.info("User %s logged in.", user.pk, extra={"user_id": user.pk})
+
+    return user_tokens_issue(user=user)
+
+
+def user_token_refresh(*, refresh: str) -> Dict[str, Any]:
+    """
+    Exchanges a refresh token for a new token pair. Refresh tokens are single
+    use: the presented one is deleted, so a replayed token is rejected.
+    """
+    token = (
+        RefreshToken.objects.select_for_update()
+        .select_related("user")
+        .filter(token_hash=_refresh_token_hash(refresh))
+        .first()
+    )
+
+    if token is None:
+        logger.info("Refresh rejected: unknown or reused token.")
+        raise AuthenticationFailed(REFRESH_TOKEN_INVALID)
+
+    user = token.user
+
+    if (
+        token.expires_at <= timezone.now()
+        or token.token_version != user.token_version
+        or not user.is_active
+        or user.deleted_at is not None
+    ):
+        logger.info(
+            "Refresh rejected for user %s: expired or revoked.",
+            user.pk,
+            extra={"user_id": user.pk},
+        )
+        raise AuthenticationFailed(REFRESH_TOKEN_INVALID)
+
+    token.delete()
+
+    return user_tokens_issue(user=user)
+
+
+def refresh_token_purge_expired() -> int:
+    deleted, _ = RefreshToken.objects.filter(expires_at__lte=timezone.now()).delete()
+
+    return deleted
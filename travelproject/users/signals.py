@@ -0,0 +1,25 @@
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from travelproject.common.authentication import access_user_cache_key
+from travelproject.users.cache import user_payload_invalidate
+from travelproject.users.models import User
+from travelproject.users.search import user_prefix_index
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def user_changed(sender, instance: User, **kwargs):
+    user_id = instance.pk
+
+    transaction.on_commit(lambda: user_payload_invalidate(user_id=user_id))
+    # Users cached by SignedTokenAuthentication, including their token_version.
+    transaction.on_commit(
+        lambda: caches[settings.AUTH_TOKEN_CACHE_ALIAS].delete(
+            access_user_cache_key(user_id)
+        )
+    )
+    transaction.on_commit(user_prefix_index.invalidate)
@@ -0,0 +1,104 @@
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+from travelproject.emails.models import Email
+from travelproject.users.models import User
+from travelproject.users.services import user_delete
+
+pytestmark = pytest.mark.django_db
+
+PASSWORD = "Activation-password-1"
+
+
+def signup(api_client, email="traveller@example.com"):
+    response = api_client.post(
+        "/api/users/create/",
+        {
+            "email": email,
+            "first_name": "Tra",
+            "last_name": "Veller",
+            "password": PASSWORD,
+            "re_password": PASSWORD,
+        },
+    )
+    assert response.status_code == 200
+
+    return User.objects.get(email=email)
+
+
+def activation_token(user):
+    email = Email.objects.get(to=user.email)
+    link = email.plain_text.split()[-1]
+
+    return parse_qs(urlsplit(link).query)["token"][0]
+
+
+def test_signup_link_activates_the_account(api_client, query_budgets):
+    user = signup(api_client)
+    assert not user.is_active
+
+    response = api_client.post(
+        "/api/users/activate/", {"token": activation_token(user)}
+    )
+
+    assert response.status_code == 200
+    assert response.data["id"] == user.id
+    assert User.objects.get(pk=user.pk).is_active
+
+    response = api_client.post(
+        "/api/users/login/", {"email": user.email, "password": PASSWORD}
+    )
+    assert response.status_code == 200
+
+
+def test_activation_link_can_be_used_again(api_client):
+    user = signup(api_client)
+    token = activation_token(user)
+
+    for _ in range(2):
+        response = api_client.post("/api/users/activate/", {"token": token})
+        assert response.status_code == 200
+
+
+def test_tampered_token_is_rejected(api_client):
+    user = signup(api_client)
+
+    response = api_client.post(
+        "/api/users/activate/", {"token": activation_token(user) + "x"}
+    )
+
+    assert response.status_code == 400
+    assert not User.objects.get(pk=user.pk).is_active
+
+
+def test_token_dies_with_an_email_change(api_client):
+    user = signup(api_client)
+    token = activation_token(user)
+    User.objects.filter(pk=user.pk).update(email="elsewhere@example.com")
+
+    response = api_client.post("/api/users/activate/", {"token": token})
+
+    assert response.status_code == 400
+
+
+def test_deleted_user_is_not_reactivated(api_client):
+    user = signup(api_client)
+    token = activation_token(user)
+    user_delete(user=user)
+
+    response = api_client.post("/api/users/activate/", {"token": token})
+
+    assert response.status_code == 400
+    assert not User.all_objects.get(pk=user.pk).is_active
+
+
+def test_expired_token_is_rejected(api_client, settings):
+    user = signup(api_client)
+    settings.USER_ACTIVATION_TOKEN_LIFETIME = -1
+
+    response = api_client.post(
+        "/api/users/activate/", {"token": activation_token(user)}
+    )
+
+    assert response.status_code == 400
@@ -0,0 +1,83 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from travelproject.emails.models import Email
+from travelproject.users.models import User
+from travelproject.users.services import user_bulk_create
+from travelproject.users.tests.factories import UserFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def row(email: str, **fields):
+    return {
+        "email": email,
+        "first_name": "Im",
+        "last_name": "Ported",
+        "password": "Import-password-1",
+        **fields,
+    }
+
+
+@pytest.fixture
+def executor():
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        yield executor
+
+
+def test_rows_are_checked_against_the_field_validators(executor):
+    result = user_bulk_create(
+        rows=[
+            row("ok@example.com"),
+            row("long@example.com", first_name="x" * 129),
+            row("not-an-email"),
+            row("x" * 250 + "@example.com"),
+        ],
+        executor=executor,
+    )
+
+    assert result["created"] == 1
+    assert [error["row"] for error in result["errors"]] == [1, 2, 3]
+    assert result["errors"][0]["error"].startswith("Invalid first_name: ")
+    assert list(User.all_objects.values_list("email", flat=True)) == ["ok@example.com"]
+
+
+def test_imported_users_get_a_confirmation_email(executor):
+    user_bulk_create(
+        rows=[row("One@Example.com"), row("two@example.com")], executor=executor
+    )
+
+    assert not User.all_objects.filter(is_active=True).exists()
+    assert sorted(Email.objects.values_list("to", flat=True)) == [
+        "one@example.com",
+        "two@example.com",
+    ]
+    assert "/activate/?token=" in Email.objects.first().plain_text
+
+
+class RegisteringExecutor(ThreadPoolExecutor):
+    """Registers an email while the batch's passwords are hashed."""
+
+    def __init__(self, email: str):
+        super().__init__(max_workers=1)
+        self.email = email
+
+    def map(self, *args, **kwargs):
+        UserFactory(email=self.email)
+
+        return super().map(*args, **kwargs)
+
+
+def test_concurrently_registered_emails_only_reject_their_rows():
+    with RegisteringExecutor("taken@example.com") as executor:
+        result = user_bulk_create(
+            rows=[row("first@example.com"), row("taken@example.com"), row("last@x.io")],
+            executor=executor,
+        )
+
+    assert result == {
+        "created": 2,
+        "errors": [{"row": 1, "error": "User with the email already in the system."}],
+    }
+    assert Email.objects.count() == 2
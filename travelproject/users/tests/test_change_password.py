@@ -0,0 +1,37 @@
+import pytest
+from asgiref.sync import async_to_sync
+from django.contrib.auth.hashers import make_password
+
+from travelproject.users.models import User
+from travelproject.users.services import (
+    user_change_password,
+    user_change_password_async,
+)
+from travelproject.users.tests.factories import UserFactory
+
+pytestmark = pytest.mark.django_db
+
+OLD_PASSWORD = "Old-password-1"
+NEW_PASSWORD = "New-password-1"
+
+
+@pytest.mark.parametrize(
+    "change", [user_change_password, async_to_sync(user_change_password_async)]
+)
+def test_change_bumps_the_stored_version(change):
+    user = UserFactory(password=make_password(OLD_PASSWORD))
+    stale = User.objects.get(pk=user.pk)
+
+    # A revocation this instance hasn't seen.
+    User.objects.filter(pk=user.pk).update(token_version=5)
+
+    change(
+        user=stale,
+        old_password=OLD_PASSWORD,
+        new_password=NEW_PASSWORD,
+        re_password=NEW_PASSWORD,
+    )
+
+    stored = User.objects.get(pk=user.pk)
+    assert stale.token_version == stored.token_version == 6
+    assert stored.check_password(NEW_PASSWORD)
@@ -0,0 +1,94 @@
+import re
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.utils import timezone
+
+from travelproject.users.models import User
+from travelproject.users.search import user_prefix_index
+from travelproject.users.services import user_list, user_search
+from travelproject.users.tests.factories import UserFactory
+
+pytestmark = pytest.mark.django_db
+
+postgresql_only = pytest.mark.skipif(
+    connection.vendor != "postgresql", reason="Checks PostgreSQL query plans."
+)
+
+
+def assert_index_scan(queryset, index_name: str) -> None:
+    plan = queryset.explain()
+
+    assert re.search(
+        rf"(Index (Only )?Scan( Backward)? using|Bitmap Index Scan on) {index_name}\b",
+        plan,
+    ), plan
+
+
+@pytest.fixture
+def index_scans():
+    # On a table this small a sequential scan is always cheapest, so the
+    # planner is told to take an index whenever one is usable.
+    UserFactory.create_batch(20, first_name="Johanna", last_name="Smith")
+
+    with connection.cursor() as cursor:
+        cursor.execute("SET LOCAL enable_seqscan = off")
+
+
+@postgresql_only
+def test_list_page_uses_covering_index(index_scans):
+    assert_index_scan(
+        user_list().public_values("created_at")[:20], "users_active_created_idx"
+    )
+
+
+@postgresql_only
+@pytest.mark.parametrize("field", ["email", "first_name", "last_name"])
+def test_search_uses_trigram_indexes(index_scans, field):
+    assert_index_scan(user_search(query="johan"), f"users_{field}_trgm")
+
+
+@postgresql_only
+@pytest.mark.parametrize(
+    "filters, index_name",
+    [
+        ({"is_active": True}, "users_active_id_idx"),
+        ({"is_superuser": False}, "users_superuser_id_idx"),
+    ],
+)
+def test_admin_changelist_filters_use_indexes(index_scans, filters, index_name):
+    assert_index_scan(
+        User.all_objects.filter(**filters).order_by("-id")[:100], index_name
+    )
+
+
+@postgresql_only
+def test_purge_uses_deleted_index(index_scans):
+    cutoff = timezone.now() - timedelta(days=30)
+
+    assert_index_scan(
+        User.all_objects.filter(deleted_at__lte=cutoff).order_by("deleted_at"),
+        "users_deleted_idx",
+    )
+
+
+@pytest.mark.skipif(
+    connection.vendor == "postgresql", reason="PostgreSQL searches by trigrams."
+)
+def test_search_without_trigrams_uses_prefix_index():
+    john = UserFactory(first_name="John", last_name="Johnson")
+    johanna = UserFactory(first_name="Johanna", last_name="Smith")
+    UserFactory(first_name="Mary", last_name="Jones")
+
+    # Rows of earlier tests were rolled back without invalidating it.
+    user_prefix_index.invalidate()
+
+    # Users matching more query words as prefixes rank first.
+    assert list(user_search(query="joh").values_list("id", flat=True)) == [
+        john.id,
+        johanna.id,
+    ]
+
+    # The matches are then looked up by primary key.
+    assert "PRIMARY KEY" in user_search(query="joh").explain()
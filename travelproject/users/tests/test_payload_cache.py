@@ -0,0 +1,43 @@
+import pytest
+
+from travelproject.users.models import User
+from travelproject.users.tests.factories import UserFactory
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def user():
+    return UserFactory(first_name="Before")
+
+
+def test_update_moves_the_payload_version(
+    user_client, user, django_capture_on_commit_callbacks
+):
+    before = user_client.get(f"/api/users/{user.id}/")
+    assert before.json()["first_name"] == "Before"
+
+    # The cached version is dropped once the update commits.
+    with django_capture_on_commit_callbacks(execute=True):
+        response = user_client.put(
+            "/api/users/update/",
+            {"email": user.email, "first_name": "After", "last_name": user.last_name},
+        )
+    assert response.status_code == 200
+
+    # Payloads are keyed by updated_at, which the update must have written.
+    assert User.objects.get(pk=user.pk).updated_at > user.updated_at
+
+    for path in (f"/api/users/{user.id}/", "/api/users/me/"):
+        response = user_client.get(path)
+
+        assert response.json()["first_name"] == "After"
+        assert response["ETag"] != before["ETag"]
+
+
+def test_unchanged_payload_is_not_modified(user_client, user):
+    etag = user_client.get(f"/api/users/{user.id}/")["ETag"]
+
+    response = user_client.get(f"/api/users/{user.id}/", HTTP_IF_NONE_MATCH=etag)
+
+    assert response.status_code == 304
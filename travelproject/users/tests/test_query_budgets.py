@@ -0,0 +1,70 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from travelproject.common.testing import query_budget
+from travelproject.users.apis import UserExportApi
+from travelproject.users.tests.factories import UserFactory
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def users():
+    return UserFactory.create_batch(30)
+
+
+@pytest.fixture
+def user(users):
+    return users[0]
+
+
+def view_names(samples):
+    return [sample.view_name for sample in samples]
+
+
+@pytest.mark.parametrize(
+    "view_name, path",
+    [
+        ("users:user_me", "/api/users/me/"),
+        ("users:user_list", "/api/users/list/?limit=10"),
+        ("users:user_list", "/api/users/list/?pagination=keyset&limit=10"),
+        ("users:user_search", "/api/users/search/?q=user-1"),
+    ],
+)
+def test_read_endpoints_stay_within_budget(user_client, query_budgets, view_name, path):
+    # Cold caches first, then warm.
+    for _ in range(2):
+        response = user_client.get(path)
+        assert response.status_code == 200
+
+    assert view_names(query_budgets) == [view_name, view_name]
+
+
+def test_detail_stays_within_budget(user_client, users, query_budgets):
+    for user in users[:3] + users[:3]:
+        response = user_client.get(f"/api/users/{user.id}/")
+        assert response.status_code == 200
+
+    assert view_names(query_budgets) == ["users:user_detail"] * 6
+
+
+def test_export_streams_with_one_query(user_client, users, query_budgets, monkeypatch):
+    # More rows than one chunk, so a per-chunk query would show up.
+    monkeypatch.setattr(UserExportApi, "chunk_size", 7)
+
+    response = user_client.get("/api/users/list/export/")
+    assert response.status_code == 200
+
+    with CaptureQueriesContext(connection) as queries:
+        lines = list(response.streaming_content)
+
+    assert len(lines) == len(users)
+    assert len(queries) == 1
+    assert view_names(query_budgets) == ["users:user_export"]
+
+
+def test_budget_overrun_fails(user_client):
+    with pytest.raises(AssertionError, match="users:user_list"):
+        with query_budget({"users:user_list": 0}):
+            user_client.get("/api/users/list/")
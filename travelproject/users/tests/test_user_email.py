@@ -0,0 +1,54 @@
+import pytest
+from rest_framework.serializers import ValidationError
+
+from travelproject.users.models import User
+from travelproject.users.services import user_create, user_login, user_update
+from travelproject.users.tests.factories import UserFactory
+
+pytestmark = pytest.mark.django_db
+
+PASSWORD = "Email-password-1"
+
+
+def create(email: str) -> User:
+    return user_create(
+        email=email,
+        first_name="Case",
+        last_name="Sensitive",
+        password=PASSWORD,
+        re_password=PASSWORD,
+    )
+
+
+def test_create_stores_the_email_lowercased():
+    assert create("Traveller@Example.COM").email == "traveller@example.com"
+
+
+def test_case_variants_are_duplicates():
+    create("traveller@example.com")
+
+    with pytest.raises(ValidationError):
+        create("TRAVELLER@example.com")
+
+
+def test_login_ignores_case():
+    user = create("Traveller@Example.com")
+    User.objects.filter(pk=user.pk).update(is_active=True)
+
+    assert "access" in user_login(email="TRAVELLER@example.COM", password=PASSWORD)
+
+
+def test_update_stores_the_email_lowercased():
+    user = UserFactory()
+
+    user = user_update(user=user, data={"email": "New.Address@Example.com"})
+
+    assert User.objects.get(pk=user.pk).email == "new.address@example.com"
+
+
+def test_clean_lowercases_the_email():
+    user = UserFactory.build(email="Admin.Typed@Example.com")
+
+    user.clean()
+
+    assert user.email == "admin.typed@example.com"
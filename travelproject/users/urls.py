@@ -1,11 +1,17 @@
 from django.urls import path
 from travelproject.users.apis import (
+    UserActivateApi,
     UserAddApi,
+    UserBulkAddApi,
     UserChangePasswordApi,
     UserDeleteApi,
     UserDetailApi,
+    UserExportApi,
     UserListApi,
+    UserLoginApi,
     UserMeApi,
+    UserSearchApi,
+    UserTokenRefreshApi,
     UserUpdateApi,
 )
 
@@ -13,10 +19,16 @@ app_name = "users"
 
 urlpatterns = [
     path("create/", UserAddApi.as_view(), name="user_create"),
+    path("create/bulk/", UserBulkAddApi.as_view(), name="user_bulk_create"),
+    path("activate/", UserActivateApi.as_view(), name="user_activate"),
     path("me/", UserMeApi.as_view(), name="user_me"),
     path("<int:user_id>/", UserDetailApi.as_view(), name="user_detail"),
     path("list/", UserListApi.as_view(), name="user_list"),
+    path("list/export/", UserExportApi.as_view(), name="user_export"),
+    path("search/", UserSearchApi.as_view(), name="user_search"),
     path("delete/", UserDeleteApi.as_view(), name="user_delete"),
     path("update/", UserUpdateApi.as_view(), name="user_update"),
+    path("login/", UserLoginApi.as_view(), name="user_login"),
+    path("token/refresh/", UserTokenRefreshApi.as_view(), name="user_token_refresh"),
     path("password/", UserChangePasswordApi.as_view(), name="user_change_passord"),
 ]